@@ -2,6 +2,7 @@ import React, { useState, useEffect, useRef } from "react";
 import axios from "axios";
 
 const API = "/api/v1";
+const PAGE_SIZE = 100;
 
 const SECTIONS = {
   overview: "Overview",
@@ -17,6 +18,10 @@ function App() {
   const [prospects, setProspects] = useState([]);
   const [leads, setLeads] = useState([]);
   const [calledLeads, setCalledLeads] = useState([]);
+  const [cursors, setCursors] = useState({ prospects: null, leads: null, called: null });
+  const [stats, setStats] = useState(null);
+  const [searchText, setSearchText] = useState("");
+  const [activeSearch, setActiveSearch] = useState("");
   const [loading, setLoading] = useState({ prospects: false, leads: false, called: false });
   const [message, setMessage] = useState(null);
   const [query, setQuery] = useState("");
@@ -33,15 +38,33 @@ function App() {
   const [isPolling, setIsPolling] = useState(false);
   const pollingRef = useRef(null);
 
+  // List rows carry a short `about` preview only; full text and call summary load on expand.
+  const [details, setDetails] = useState({});
+  const loadDetails = async (prospectId) => {
+    if (details[prospectId]) return;
+    try {
+      const res = await axios.get(`${API}/prospects/${prospectId}`);
+      setDetails((d) => ({ ...d, [prospectId]: res.data.prospect }));
+    } catch (err) {
+      console.error(err);
+    }
+  };
+  const detailOf = (p) => details[p.prospect_id] || p;
+
   const toggleCallDetails = (prospectId) => {
     setExpandedCallId((prev) => (prev === prospectId ? null : prospectId));
+    loadDetails(prospectId);
   };
 
   const [expandedDetailsId, setExpandedDetailsId] = useState(null);
   const toggleLeadDetails = (prospectId) => {
     setExpandedDetailsId((prev) => (prev === prospectId ? null : prospectId));
+    loadDetails(prospectId);
   };
 
+  // Contact fields are lists, primary contact first
+  const joinList = (values) => (values && values.length ? [].concat(values).join(", ") : "—");
+
   const truncate = (str, maxLen = 50) => {
     if (!str || typeof str !== "string") return "—";
     return str.length <= maxLen ? str : `${str.slice(0, maxLen)}…`;
@@ -52,49 +75,71 @@ function App() {
     setTimeout(() => setMessage(null), 5000);
   };
 
-  const fetchProspects = async () => {
-    setLoading((l) => ({ ...l, prospects: true }));
+  // Lists are keyset-paginated: the first call loads page one, "Load more" appends the next page.
+  const fetchPage = async (key, url, field, setItems, errorText, cursor = null, params = {}) => {
+    setLoading((l) => ({ ...l, [key]: true }));
     try {
-      const res = await axios.get(`${API}/prospects`);
-      setProspects(res.data.prospects || []);
+      const res = await axios.get(url, { params: { limit: PAGE_SIZE, ...params, ...(cursor ? { cursor } : {}) } });
+      const items = res.data[field] || [];
+      setItems((prev) => (cursor ? [...prev, ...items] : items));
+      if (!cursor) setDetails({});
+      setCursors((c) => ({ ...c, [key]: res.data.next_cursor || null }));
     } catch (err) {
       console.error(err);
-      showMessage("Failed to load prospects", "error");
-      setProspects([]);
+      showMessage(errorText, "error");
+      if (!cursor) setItems([]);
     } finally {
-      setLoading((l) => ({ ...l, prospects: false }));
+      setLoading((l) => ({ ...l, [key]: false }));
     }
   };
 
-  const fetchLeads = async () => {
-    setLoading((l) => ({ ...l, leads: true }));
-    try {
-      const res = await axios.get(`${API}/leads`);
-      setLeads(res.data.leads || []);
-    } catch (err) {
-      console.error(err);
-      showMessage("Failed to load leads", "error");
-      setLeads([]);
-    } finally {
-      setLoading((l) => ({ ...l, leads: false }));
-    }
+  // With an active search the prospects table shows ranked matches across all prospects
+  const prospectsSource = (search) =>
+    search ? [`${API}/prospects/search`, { q: search }] : [`${API}/prospects`, {}];
+
+  const fetchProspects = (search = activeSearch) => {
+    const [url, params] = prospectsSource(typeof search === "string" ? search : activeSearch);
+    return fetchPage("prospects", url, "prospects", setProspects, "Failed to load prospects", null, params);
   };
+  const fetchLeads = () =>
+    fetchPage("leads", `${API}/leads`, "leads", setLeads, "Failed to load leads");
+  const fetchCalledLeads = () =>
+    fetchPage("called", `${API}/leads/called`, "leads", setCalledLeads, "Failed to load called leads");
 
-  const fetchCalledLeads = async () => {
-    setLoading((l) => ({ ...l, called: true }));
+  // Counters come from /stats; list lengths only cover the pages loaded so far.
+  const fetchStats = async () => {
     try {
-      const res = await axios.get(`${API}/leads/called`);
-      setCalledLeads(res.data.leads || []);
-    } catch (err) {
-      console.error(err);
-      showMessage("Failed to load called leads", "error");
-      setCalledLeads([]);
-    } finally {
-      setLoading((l) => ({ ...l, called: false }));
+      const res = await axios.get(`${API}/stats`);
+      setStats(res.data);
+    } catch {
+      setStats(null);
     }
   };
 
+  const loadMoreProspects = () => {
+    const [url, params] = prospectsSource(activeSearch);
+    return fetchPage("prospects", url, "prospects", setProspects, "Failed to load prospects", cursors.prospects, params);
+  };
+
+  const runSearch = (e) => {
+    e.preventDefault();
+    const search = searchText.trim();
+    setActiveSearch(search);
+    fetchProspects(search);
+  };
+
+  const clearSearch = () => {
+    setSearchText("");
+    setActiveSearch("");
+    fetchProspects("");
+  };
+  const loadMoreLeads = () =>
+    fetchPage("leads", `${API}/leads`, "leads", setLeads, "Failed to load leads", cursors.leads);
+  const loadMoreCalledLeads = () =>
+    fetchPage("called", `${API}/leads/called`, "leads", setCalledLeads, "Failed to load called leads", cursors.called);
+
   useEffect(() => {
+    if (section === "overview") fetchStats();
     if (section === "prospects") fetchProspects();
     if (section === "leads") fetchLeads();
     if (section === "called") fetchCalledLeads();
@@ -106,6 +151,23 @@ function App() {
     fetchCalledLeads();
   }, []);
 
+  // Poll a background job until it succeeds or fails, then hand it to onDone
+  const watchJob = (jobId, onDone) => {
+    const poll = async () => {
+      try {
+        const { job } = (await axios.get(`${API}/jobs/${jobId}`)).data;
+        if (job.status === "succeeded" || job.status === "failed") {
+          onDone(job);
+          return;
+        }
+      } catch (err) {
+        if (err.response?.status === 404) return;
+      }
+      setTimeout(poll, 3000);
+    };
+    setTimeout(poll, 1000);
+  };
+
   const startPipeline = async (e) => {
     e.preventDefault();
     if (!query.trim()) {
@@ -115,12 +177,18 @@ function App() {
     setPipelineRunning(true);
     setMessage(null);
     try {
-      await axios.post(`${API}/leads/pipeline`, { query: query.trim() });
-      showMessage("Pipeline started. New leads will appear as they are processed.", "success");
+      const res = await axios.post(`${API}/leads/pipeline`, { query: query.trim() });
+      showMessage("Pipeline queued. New leads will appear as a worker processes it.", "success");
+      watchJob(res.data.job_id, (job) =>
+        job.status === "succeeded"
+          ? showMessage(`Pipeline finished: ${job.result?.prospects_inserted ?? 0} new prospect(s).`, "success")
+          : showMessage(`Pipeline failed: ${job.last_error || "unknown error"}`, "error")
+      );
       if (pollingRef.current) clearInterval(pollingRef.current);
       pollingRef.current = setInterval(() => {
         fetchLeads();
         fetchProspects();
+        fetchStats();
       }, 5000);
       setIsPolling(true);
     } catch (err) {
@@ -210,10 +278,21 @@ function App() {
     }
     setBulkActionRunning(true);
     try {
-      for (const id of ids) {
-        await axios.post(`${API}/call`, { prospect_id: id });
+      // One request for the whole selection; prospects already being dialed (campaign or another call) are skipped.
+      const { data } = await axios.post(`${API}/calls/bulk`, { prospect_ids: ids });
+      const skipped = data.skipped?.length || 0;
+      let progress = null;
+      while (data.claimed) {
+        progress = (await axios.get(`${API}/calls/bulk/${data.batch_id}`)).data;
+        if (progress.status === "finished") break;
+        await new Promise((resolve) => setTimeout(resolve, 1000));
       }
-      showMessage(`Call triggered for ${ids.length} prospect(s).`, "success");
+      const triggered = progress ? progress.initiated : 0;
+      const failed = progress ? progress.failed : 0;
+      showMessage(
+        `Call triggered for ${triggered} prospect(s)${failed ? `; ${failed} failed` : ""}${skipped ? `; ${skipped} already being dialed` : ""}.`,
+        failed && !triggered ? "error" : "success"
+      );
       setSelectedProspectIds([]);
       setSelectedLeadIds([]);
       setSelectedCalledIds([]);
@@ -258,9 +337,19 @@ function App() {
     setMessage(null);
     try {
       const body = campaignLimit.trim() ? { limit: parseInt(campaignLimit, 10) } : {};
-      await axios.post(`${API}/cold_call/campaign`, body);
-      showMessage("Cold call campaign started. Calls will be placed in the background.", "success");
-      setTimeout(fetchProspects, 2000);
+      const res = await axios.post(`${API}/cold_call/campaign`, body);
+      showMessage("Campaign queued.", "success");
+      watchJob(res.data.job_id, (job) => {
+        if (job.status !== "succeeded") {
+          showMessage(`Campaign failed: ${job.last_error || "unknown error"}`, "error");
+          return;
+        }
+        showMessage(
+          `Queued ${job.result?.queued ?? 0} prospect(s). Calls go out during business hours in each prospect's country.`,
+          "success"
+        );
+        fetchProspects();
+      });
     } catch (err) {
       showMessage(err.response?.data?.message || "Failed to start campaign", "error");
     } finally {
@@ -307,18 +396,51 @@ function App() {
             </div>
             <div className="stats-row">
               <div className="stat-card">
-                <div className="value">{prospects.length}</div>
+                <div className="value">{stats ? stats.total : "—"}</div>
+                <div className="label">Prospects (all)</div>
+              </div>
+              <div className="stat-card">
+                <div className="value">{stats ? stats.callable : "—"}</div>
                 <div className="label">Prospects (callable, not yet called)</div>
               </div>
               <div className="stat-card">
-                <div className="value">{leads.length}</div>
+                <div className="value">{stats ? stats.qualified : "—"}</div>
                 <div className="label">Qualified leads</div>
               </div>
               <div className="stat-card">
-                <div className="value">{calledLeads.length}</div>
+                <div className="value">{stats ? stats.called : "—"}</div>
                 <div className="label">Called leads (all calls)</div>
               </div>
             </div>
+            {stats && stats.by_country.length > 0 && (
+              <div className="card">
+                <div className="card-title">By country</div>
+                <div className="table-wrap">
+                  <table>
+                    <thead>
+                      <tr>
+                        <th>Country</th>
+                        <th>Prospects</th>
+                        <th>Callable</th>
+                        <th>Called</th>
+                        <th>Qualified</th>
+                      </tr>
+                    </thead>
+                    <tbody>
+                      {stats.by_country.slice(0, 10).map((row) => (
+                        <tr key={row.key}>
+                          <td>{row.key === "unknown" ? "—" : row.key}</td>
+                          <td>{row.total}</td>
+                          <td>{row.callable}</td>
+                          <td>{row.called}</td>
+                          <td>{row.qualified}</td>
+                        </tr>
+                      ))}
+                    </tbody>
+                  </table>
+                </div>
+              </div>
+            )}
             <div className="card">
               <div className="card-title">Quick actions</div>
               <div className="form-row" style={{ gap: "1rem", flexWrap: "wrap" }}>
@@ -377,8 +499,24 @@ function App() {
               <p>Leads with phone numbers that have not been called yet.</p>
             </div>
             <div className="card">
+              <form className="form-row" onSubmit={runSearch} style={{ marginBottom: "1rem", gap: "0.5rem" }}>
+                <input
+                  type="text"
+                  placeholder="Search all prospects by name, industry or about…"
+                  value={searchText}
+                  onChange={(e) => setSearchText(e.target.value)}
+                />
+                <button type="submit" className="btn btn-primary btn-sm" disabled={loading.prospects}>
+                  Search
+                </button>
+                {activeSearch && (
+                  <button type="button" className="btn btn-secondary btn-sm" onClick={clearSearch}>
+                    Clear
+                  </button>
+                )}
+              </form>
               <div className="form-row" style={{ marginBottom: "1rem", flexWrap: "wrap", gap: "0.5rem" }}>
-                <button type="button" className="btn btn-secondary btn-sm" onClick={fetchProspects} disabled={loading.prospects}>
+                <button type="button" className="btn btn-secondary btn-sm" onClick={() => fetchProspects()} disabled={loading.prospects}>
                   {loading.prospects ? "Loading…" : "Refresh"}
                 </button>
                 <button
@@ -402,7 +540,11 @@ function App() {
                 {loading.prospects && prospects.length === 0 ? (
                   <div className="empty-state">Loading prospects…</div>
                 ) : prospects.length === 0 ? (
-                  <div className="empty-state">No callable prospects. Run the pipeline or check the database.</div>
+                  <div className="empty-state">
+                    {activeSearch
+                      ? `No prospects match "${activeSearch}".`
+                      : "No callable prospects. Run the pipeline or check the database."}
+                  </div>
                 ) : (
                   <table className="data-table">
                     <thead>
@@ -437,8 +579,8 @@ function App() {
                           </td>
                           <td>{p.name || "—"}</td>
                           <td title={p.about || ""}>{truncate(p.about, 45)}</td>
-                          <td>{p.phones || "—"}</td>
-                          <td>{p.emails || "—"}</td>
+                          <td>{joinList(p.phones)}</td>
+                          <td>{joinList(p.emails)}</td>
                           <td>{p.country_acronym || p.country || "—"}</td>
                           <td>{truncate(p.business_context, 30)}</td>
                           <td style={{ display: "flex", gap: "0.5rem", flexWrap: "wrap" }}>
@@ -486,12 +628,12 @@ function App() {
                                 <div className="call-detail-body">
                                   <div className="call-detail-section">
                                     <label className="call-detail-label">About</label>
-                                    <p className="call-detail-summary">{p.about || "—"}</p>
+                                    <p className="call-detail-summary">{detailOf(p).about || "—"}</p>
                                   </div>
                                   <div className="call-detail-section">
                                     <label className="call-detail-label">Contact</label>
                                     <p className="call-detail-summary" style={{ margin: 0 }}>
-                                      Phone: {p.phones || "—"} · Email: {p.emails || "—"} · Website: {p.websites || "—"}
+                                      Phone: {joinList(p.phones)} · Email: {joinList(p.emails)} · Website: {joinList(p.websites)}
                                     </p>
                                   </div>
                                   <div className="call-detail-section">
@@ -504,10 +646,10 @@ function App() {
                                     <label className="call-detail-label">Business context</label>
                                     <p className="call-detail-summary" style={{ margin: 0 }}>{p.business_context || "—"}</p>
                                   </div>
-                                  {p.platforms && (
+                                  {p.platforms?.length > 0 && (
                                     <div className="call-detail-section">
                                       <label className="call-detail-label">Platforms</label>
-                                      <p className="call-detail-summary" style={{ margin: 0 }}>{p.platforms}</p>
+                                      <p className="call-detail-summary" style={{ margin: 0 }}>{joinList(p.platforms)}</p>
                                     </div>
                                   )}
                                 </div>
@@ -520,6 +662,11 @@ function App() {
                     </tbody>
                   </table>
                 )}
+                {cursors.prospects && (
+                  <button type="button" className="btn btn-secondary btn-sm" onClick={loadMoreProspects} disabled={loading.prospects}>
+                    {loading.prospects ? "Loading…" : "Load more"}
+                  </button>
+                )}
               </div>
             </div>
           </>
@@ -594,8 +741,8 @@ function App() {
                           </td>
                           <td>{p.name || "—"}</td>
                           <td title={p.about || ""}>{truncate(p.about, 45)}</td>
-                          <td>{p.phones || "—"}</td>
-                          <td>{p.emails || "—"}</td>
+                          <td>{joinList(p.phones)}</td>
+                          <td>{joinList(p.emails)}</td>
                           <td>{p.country_acronym || p.country || "—"}</td>
                           <td>
                             <span className={`badge ${p.is_qualified ? "badge-success" : "badge-muted"}`}>
@@ -651,16 +798,16 @@ function App() {
                                   </button>
                                 </div>
                                 <div className="call-detail-body">
-                                  {p.about && (
+                                  {detailOf(p).about && (
                                     <div className="call-detail-section">
                                       <label className="call-detail-label">About</label>
-                                      <p className="call-detail-summary">{p.about}</p>
+                                      <p className="call-detail-summary">{detailOf(p).about}</p>
                                     </div>
                                   )}
                                   <div className="call-detail-section">
                                     <label className="call-detail-label">Summary</label>
                                     <p className="call-detail-summary">
-                                      {p.verification_call_summary || "No summary available."}
+                                      {detailOf(p).verification_call_summary || "No summary available."}
                                     </p>
                                   </div>
                                   <div className="call-detail-section">
@@ -693,6 +840,11 @@ function App() {
                     </tbody>
                   </table>
                 )}
+                {cursors.leads && (
+                  <button type="button" className="btn btn-secondary btn-sm" onClick={loadMoreLeads} disabled={loading.leads}>
+                    {loading.leads ? "Loading…" : "Load more"}
+                  </button>
+                )}
               </div>
             </div>
           </>
@@ -767,8 +919,8 @@ function App() {
                           </td>
                           <td>{p.name || "—"}</td>
                           <td title={p.about || ""}>{truncate(p.about, 45)}</td>
-                          <td>{p.phones || "—"}</td>
-                          <td>{p.emails || "—"}</td>
+                          <td>{joinList(p.phones)}</td>
+                          <td>{joinList(p.emails)}</td>
                           <td>{p.country_acronym || p.country || "—"}</td>
                           <td>
                             <span className={`badge ${p.is_qualified ? "badge-success" : "badge-muted"}`}>
@@ -824,16 +976,16 @@ function App() {
                                   </button>
                                 </div>
                                 <div className="call-detail-body">
-                                  {p.about && (
+                                  {detailOf(p).about && (
                                     <div className="call-detail-section">
                                       <label className="call-detail-label">About</label>
-                                      <p className="call-detail-summary">{p.about}</p>
+                                      <p className="call-detail-summary">{detailOf(p).about}</p>
                                     </div>
                                   )}
                                   <div className="call-detail-section">
                                     <label className="call-detail-label">Summary</label>
                                     <p className="call-detail-summary">
-                                      {p.verification_call_summary || "No summary available."}
+                                      {detailOf(p).verification_call_summary || "No summary available."}
                                     </p>
                                   </div>
                                   <div className="call-detail-section">
@@ -866,6 +1018,11 @@ function App() {
                     </tbody>
                   </table>
                 )}
+                {cursors.called && (
+                  <button type="button" className="btn btn-secondary btn-sm" onClick={loadMoreCalledLeads} disabled={loading.called}>
+                    {loading.called ? "Loading…" : "Load more"}
+                  </button>
+                )}
               </div>
             </div>
           </>
@@ -875,7 +1032,7 @@ function App() {
           <>
             <div className="page-header">
               <h1>Cold call campaign</h1>
-              <p>Trigger Retell calls for all prospects that have a phone and have not been called yet.</p>
+              <p>Queue Retell calls for all prospects that have a phone and have not been called yet. Each call is placed during business hours in the prospect's country.</p>
             </div>
             <div className="card">
               <form onSubmit={startCampaign} className="form-row">
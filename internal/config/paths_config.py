@@ -22,5 +22,7 @@ DB_MODELS_TEMP_DIR = ARTIFACTS_DIR / "db_models_temp"
 FUNNEL_CONFIG_PATH = APP_BASE_DIR / "internal/config/funnel_config.yaml"
 LEADS_SOURCED_PATH = ARTIFACTS_DIR / "leads_sourced.json"
 LEADS_AUGMENTED_PATH = ARTIFACTS_DIR / "leads_augmented.json"
+# Per-run pipeline workspaces (artifacts/runs/<run_id>)
+PIPELINE_RUNS_DIR = ARTIFACTS_DIR / "runs"
 
 CLIENT_DIR = APP_BASE_DIR / "client" / "dist"
\ No newline at end of file
@@ -57,3 +57,32 @@ class SecretManager:
     RETELL_API_KEY = os.environ.get("RETELL_API_KEY", "")
     RETELL_FROM_NUMBER = os.environ.get("RETELL_FROM_NUMBER", "")
     RETELL_AGENT_ID = os.environ.get("RETELL_AGENT_ID", "")
+    # Retell webhook inbox consumer: wait this many ms after an event arrives so a burst
+    # is applied as one batched UPDATE; poll for pending events every N seconds
+    WEBHOOK_INBOX_BATCH_MS = int(os.environ.get("WEBHOOK_INBOX_BATCH_MS", "200"))
+    WEBHOOK_INBOX_BATCH_SIZE = int(os.environ.get("WEBHOOK_INBOX_BATCH_SIZE", "100"))
+    WEBHOOK_INBOX_POLL_SECONDS = float(os.environ.get("WEBHOOK_INBOX_POLL_SECONDS", "5"))
+    # Processed webhook events are kept (and retries of them ignored) for this many days
+    WEBHOOK_INBOX_RETENTION_DAYS = int(os.environ.get("WEBHOOK_INBOX_RETENTION_DAYS", "7"))
+    # Cold call campaign dialer
+    CAMPAIGN_MAX_CONCURRENT_CALLS = int(os.environ.get("CAMPAIGN_MAX_CONCURRENT_CALLS", "5"))
+    CAMPAIGN_CALLS_PER_SECOND = float(os.environ.get("CAMPAIGN_CALLS_PER_SECOND", "1"))
+    CAMPAIGN_MAX_CALLS = int(os.environ.get("CAMPAIGN_MAX_CALLS", "5000"))
+    # A dialing claim older than this (placed call, no outcome yet) may be taken over
+    CALL_CLAIM_LEASE_SECONDS = int(os.environ.get("CALL_CLAIM_LEASE_SECONDS", "900"))
+    # A call_queue entry still `dialing` this long after its claim (dialer crashed before
+    # recording the batch) is queued again; results are recorded within seconds otherwise
+    CALL_DIALING_STALE_SECONDS = int(os.environ.get("CALL_DIALING_STALE_SECONDS", "300"))
+    # Seconds between call scheduler passes over the call queue (0 = no scheduler loop)
+    CALL_SCHEDULER_INTERVAL_SECONDS = float(os.environ.get("CALL_SCHEDULER_INTERVAL_SECONDS", "60"))
+    # Seconds between call priority refreshes (run by the call scheduler; 0 = every pass)
+    CALL_PRIORITY_REFRESH_SECONDS = float(os.environ.get("CALL_PRIORITY_REFRESH_SECONDS", "3600"))
+    # Background job workers (worker.py): attempts per job, first retry delay (doubles
+    # per attempt), lease a running job holds between heartbeats, idle poll interval
+    JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_DELAY_SECONDS = int(os.environ.get("JOB_RETRY_DELAY_SECONDS", "60"))
+    JOB_LEASE_SECONDS = int(os.environ.get("JOB_LEASE_SECONDS", "300"))
+    JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", "2"))
+    # Pipeline runs executing at once across all workers; finished run workspaces kept on disk
+    PIPELINE_MAX_CONCURRENT_RUNS = int(os.environ.get("PIPELINE_MAX_CONCURRENT_RUNS", "2"))
+    PIPELINE_KEEP_RUNS = int(os.environ.get("PIPELINE_KEEP_RUNS", "50"))
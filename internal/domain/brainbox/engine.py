@@ -1,8 +1,15 @@
 from internal.config.secret import SecretManager
+from internal.config.paths_config import FUNNEL_CONFIG_PATH
 
-from typing import List, Dict
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator, List, Dict, Tuple, Optional
+from pydantic import ValidationError
 from langchain_openai import ChatOpenAI
 from langchain_core.runnables import RunnableSequence
+from langchain_core.exceptions import OutputParserException
 from openai import LengthFinishReasonError
 
 from .prompt import (
@@ -18,21 +25,120 @@ from internal.domain.common.dto import(
     WebsiteScrapingOutput,
     ArticleExtractionOutput
 )
+from internal.domain.brainbox.usage import usage_collector, current_run_id
 from internal.utils.logger import AppLogger
+from internal.utils.loader import load_yaml
+from internal.utils.normalizer import normalize_url, EMAIL_REGEX
 
 logger = AppLogger("internal.domain.brainbox.engine")()
 
-llm = ChatOpenAI(
-    model="gpt-4.1-mini",
-    temperature=0.5,
-    api_key=SecretManager.OPENAI_KEY,
-    max_tokens=16384,
-)
+DEFAULT_MODEL = "gpt-4.1-mini"
+DEFAULT_SMALL_MODEL = "gpt-4.1-nano"
+
+# brainbox section of FUNNEL_CONFIG_PATH at import; used outside pipeline runs
+_default_brainbox_config: Dict = (load_yaml(FUNNEL_CONFIG_PATH) or {}).get("brainbox", {}) or {}
+# brainbox section of the running pipeline's config snapshot (see use_brainbox_config)
+_run_brainbox_config: ContextVar[Optional[Dict]] = ContextVar("brainbox_config", default=None)
+
+@contextmanager
+def use_brainbox_config(config: Optional[Dict]) -> Iterator[None]:
+    """
+    Use `config` (a funnel config's brainbox section, e.g. from a run's snapshot)
+    for the model choice and cascade setting of LLM calls made in this context,
+    including tasks and threads started from it.
+    """
+    token = _run_brainbox_config.set(config or {})
+    try:
+        yield
+    finally:
+        _run_brainbox_config.reset(token)
+
+
+def _brainbox_config() -> Dict:
+    config = _run_brainbox_config.get()
+    return _default_brainbox_config if config is None else config
+
+
+def _cascade_config() -> Dict:
+    return _brainbox_config().get("cascade") or {}
+
+
+def cascade_enabled() -> bool:
+    return bool(_cascade_config().get("enabled", False))
+
+
+@lru_cache(maxsize=8)
+def _chat_model(model: str) -> ChatOpenAI:
+    """One client per model name, shared by every run that uses it"""
+    return ChatOpenAI(
+        model=model,
+        temperature=0.5,
+        api_key=SecretManager.OPENAI_KEY,
+        max_tokens=16384,
+    )
+
+
+def _llm() -> ChatOpenAI:
+    return _chat_model(_brainbox_config().get("model") or DEFAULT_MODEL)
+
+
+# Cheaper/faster model tried first in cascade mode; anything it cannot handle
+# confidently is escalated to `_llm()`.
+def _small_llm() -> ChatOpenAI:
+    return _chat_model(_cascade_config().get("small_model") or DEFAULT_SMALL_MODEL)
+
+
+# Values the models emit when they could not find a field; treated as low confidence.
+LOW_CONFIDENCE_MARKERS = {
+    "unknown", "n/a", "na", "none", "null", "not found", "not available",
+    "not provided", "not specified", "unavailable", "-",
+}
+
+SCHEMA_ERRORS = (ValidationError, OutputParserException)
+
+def _record_escalation(stage: str, items: int, escalated: int) -> None:
+    usage_collector.record_escalation(stage, items, escalated)
+
+
+def get_escalation_stats(run_id: Optional[str] = None) -> Dict[str, Dict]:
+    """Per-stage cascade counters of one pipeline run (the current one by default)."""
+    run = usage_collector.get_run(run_id or current_run_id())
+    return run["cascade"] if run else {}
+
+
+def _log_escalation(stage: str) -> None:
+    stats = get_escalation_stats().get(stage)
+    if stats:
+        logger.info(
+            "Cascade %s: %d/%d items escalated (%.2f%%)",
+            stage,
+            stats["escalated"],
+            stats["items"],
+            stats["escalation_rate_percent"],
+        )
+
+
+def _is_low_confidence_value(value) -> bool:
+    return isinstance(value, str) and value.strip().lower() in LOW_CONFIDENCE_MARKERS
+
+
+def _build_chain(prompt, model: ChatOpenAI, schema, stage: str) -> RunnableSequence:
+    """
+    Structured-output chain labelled with its stage so usage is attributed per chain and per run.
+    Calls of the same stage share a prompt_cache_key so they are routed to the same provider cache.
+    """
+    model = model.model_copy(
+        update={"model_kwargs": {**model.model_kwargs, "prompt_cache_key": f"akwaya:{stage}"}}
+    )
+    return (prompt | model.with_structured_output(schema)).with_config(
+        callbacks=[usage_collector],
+        metadata={"llm_stage": stage, "pipeline_run_id": current_run_id()},
+    )
 
 
-def generate_keywords(query: str) -> List[str]:
-    chain = keyword_generation_prompt | llm.with_structured_output(KeywordGenerationOutput)
-    response = chain.invoke({"query": query})
+async def generate_keywords(query: str) -> List[str]:
+    chain = _build_chain(keyword_generation_prompt, _llm(), KeywordGenerationOutput, "keyword_generation")
+    response = await chain.ainvoke({"query": query})
     return response.model_dump()["keywords"]
 
 
@@ -41,6 +147,33 @@ def chunk_list(items, size):
     return [items[i:i + size] for i in range(0, len(items), size)]
 
 
+def serialize_payload(items: List[Dict]) -> str:
+    """Deterministic JSON for a batch so identical items always render to identical prompt bytes."""
+    return json.dumps(items, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def lead_sort_key(lead: Prospect) -> Tuple[str, str]:
+    # Grouping by platform keeps same-shaped leads together; sorting by name puts
+    # likely duplicates in the same batch.
+    return (lead.get("source_platform") or "", (lead.get("name") or "").strip().lower())
+
+
+def _iter_leads(leads) -> Iterator[Prospect]:
+    """
+    Leads from a possibly nested list (search results come grouped per source and
+    per keyword); anything that is not a lead, such as a failed source, is skipped.
+    """
+    for lead in leads or []:
+        if isinstance(lead, dict):
+            yield lead
+        elif isinstance(lead, (list, tuple)):
+            yield from _iter_leads(lead)
+
+
+def _url_sort_key(item: Dict) -> str:
+    return normalize_url(item.get("url") or "")
+
+
 def _merge_preprocessing_outputs(a: LeadsPreprocessingOutput, b: LeadsPreprocessingOutput) -> LeadsPreprocessingOutput:
     return LeadsPreprocessingOutput(
         individuals=a.individuals + b.individuals,
@@ -58,7 +191,7 @@ async def _preprocess_batch_with_retry(
     if not batch:
         return empty
     try:
-        out = await chain.ainvoke({"leads": batch})
+        out = await chain.ainvoke({"leads": serialize_payload(batch)})
         return out
     except LengthFinishReasonError as e:
         logger.warning(
@@ -75,19 +208,66 @@ async def _preprocess_batch_with_retry(
         return _merge_preprocessing_outputs(left, right)
 
 
-async def preprocess_leads(leads: List[Prospect], batch_size: int = 10) -> LeadsPreprocessingOutput:
+def _is_low_confidence_preprocessing(batch: List[Prospect], out: LeadsPreprocessingOutput) -> bool:
+    """
+    A preprocessing result is untrusted if it grew the batch or has blank/placeholder names.
+    An empty result is trusted: the model drops leads it cannot classify.
+    """
+    classified = out.individuals + out.businesses + out.articles
+    if len(classified) > len(batch):
+        return True
+    for lead in classified:
+        name = lead.get("name")
+        if not name or _is_low_confidence_value(name):
+            return True
+    return False
+
+
+async def _preprocess_batch_cascade(
+    small_chain: RunnableSequence,
+    chain: RunnableSequence,
+    batch: List[Prospect],
+) -> LeadsPreprocessingOutput:
+    """Run the batch on the small model; escalate the whole batch on schema failure or low confidence."""
+    try:
+        out = await _preprocess_batch_with_retry(small_chain, batch)
+        if not _is_low_confidence_preprocessing(batch, out):
+            _record_escalation("lead_preprocessing", len(batch), 0)
+            return out
+        logger.debug("Low-confidence preprocessing output for batch of %d leads. Escalating.", len(batch))
+    except SCHEMA_ERRORS as e:
+        logger.debug("Small model failed schema validation for batch of %d leads (%s). Escalating.", len(batch), e)
+    _record_escalation("lead_preprocessing", len(batch), len(batch))
+    return await _preprocess_batch_with_retry(chain, batch)
+
+
+async def preprocess_leads(
+    leads: List[Prospect],
+    batch_size: int = 10,
+    cascade: Optional[bool] = None,
+) -> LeadsPreprocessingOutput:
+    leads = list(_iter_leads(leads))
     if not leads:
         return LeadsPreprocessingOutput(individuals=[], businesses=[], articles=[])
-    batches = chunk_list(leads, batch_size)
-    chain = sourced_leads_preprocessing_prompt | llm.with_structured_output(LeadsPreprocessingOutput)
+    cascade = cascade_enabled() if cascade is None else cascade
+    batches = chunk_list(sorted(leads, key=lead_sort_key), batch_size)
+    chain = _build_chain(sourced_leads_preprocessing_prompt, _llm(), LeadsPreprocessingOutput, "lead_preprocessing")
+    small_chain = _build_chain(
+        sourced_leads_preprocessing_prompt, _small_llm(), LeadsPreprocessingOutput, "lead_preprocessing.small"
+    )
 
     processed_leads = LeadsPreprocessingOutput(individuals=[], businesses=[], articles=[])
     for batch in batches:
-        out = await _preprocess_batch_with_retry(chain, batch)
+        if cascade:
+            out = await _preprocess_batch_cascade(small_chain, chain, batch)
+        else:
+            out = await _preprocess_batch_with_retry(chain, batch)
         processed_leads.individuals.extend(out.individuals)
         processed_leads.businesses.extend(out.businesses)
         processed_leads.articles.extend(out.articles)
 
+    if cascade:
+        _log_escalation("lead_preprocessing")
     return processed_leads
 
 
@@ -96,7 +276,7 @@ async def _eval_batch_with_retry(chain: RunnableSequence, batch: List[Dict]) ->
     if not batch:
         return empty
     try:
-        return await chain.ainvoke({"website_data": batch})
+        return await chain.ainvoke({"website_data": serialize_payload(batch)})
     except LengthFinishReasonError as e:
         logger.warning("LLM length limit in website evaluation (batch size %d). Splitting.", len(batch))
         if len(batch) == 1:
@@ -108,15 +288,78 @@ async def _eval_batch_with_retry(chain: RunnableSequence, batch: List[Dict]) ->
         return WebsiteScrapingOutput(information=left.information + right.information)
 
 
-async def evaluate_scraped_website(website_data: List[Dict], batch_size: int = 6) -> WebsiteScrapingOutput:
+def _is_low_confidence_website_info(info: Dict) -> bool:
+    email = info.get("email")
+    if email and (_is_low_confidence_value(email) or not EMAIL_REGEX.match(email.strip())):
+        return True
+    return any(_is_low_confidence_value(info.get(key)) for key in ("phone", "about"))
+
+
+def _split_website_evaluations(batch: List[Dict], information: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Match evaluated items back to the scraped input by URL.
+
+    Returns (confident evaluations, inputs to escalate). Inputs with no evaluation or
+    with placeholder/invalid fields are escalated; evaluations for URLs that were not
+    in the batch are dropped.
+    """
+    evaluated = {
+        normalize_url(info.get("url", "")): info
+        for info in information
+        if info.get("url")
+    }
+    confident: List[Dict] = []
+    uncertain: List[Dict] = []
+    for item in batch:
+        info = evaluated.get(normalize_url(item.get("url", "")))
+        if info is None or _is_low_confidence_website_info(info):
+            uncertain.append(item)
+        else:
+            confident.append(info)
+    return confident, uncertain
+
+
+async def _eval_batch_cascade(
+    small_chain: RunnableSequence,
+    chain: RunnableSequence,
+    batch: List[Dict],
+) -> WebsiteScrapingOutput:
+    """Evaluate on the small model; only websites it could not handle confidently go to the larger model."""
+    try:
+        out = await _eval_batch_with_retry(small_chain, batch)
+        confident, uncertain = _split_website_evaluations(batch, out.information)
+    except SCHEMA_ERRORS as e:
+        logger.debug("Small model failed schema validation for %d websites (%s). Escalating.", len(batch), e)
+        confident, uncertain = [], batch
+    _record_escalation("website_evaluation", len(batch), len(uncertain))
+    if uncertain:
+        escalated = await _eval_batch_with_retry(chain, uncertain)
+        confident.extend(escalated.information)
+    return WebsiteScrapingOutput(information=confident)
+
+
+async def evaluate_scraped_website(
+    website_data: List[Dict],
+    batch_size: int = 6,
+    cascade: Optional[bool] = None,
+) -> WebsiteScrapingOutput:
     if not website_data:
         return WebsiteScrapingOutput(information=[])
-    batches = chunk_list(website_data, batch_size)
-    chain = scraped_website_evaluation_prompt | llm.with_structured_output(WebsiteScrapingOutput)
+    cascade = cascade_enabled() if cascade is None else cascade
+    batches = chunk_list(sorted(website_data, key=_url_sort_key), batch_size)
+    chain = _build_chain(scraped_website_evaluation_prompt, _llm(), WebsiteScrapingOutput, "website_evaluation")
+    small_chain = _build_chain(
+        scraped_website_evaluation_prompt, _small_llm(), WebsiteScrapingOutput, "website_evaluation.small"
+    )
     processed_websites = WebsiteScrapingOutput(information=[])
     for batch in batches:
-        out = await _eval_batch_with_retry(chain, batch)
+        if cascade:
+            out = await _eval_batch_cascade(small_chain, chain, batch)
+        else:
+            out = await _eval_batch_with_retry(chain, batch)
         processed_websites.information.extend(out.information)
+    if cascade:
+        _log_escalation("website_evaluation")
     return processed_websites
 
 
@@ -125,7 +368,7 @@ async def _extract_batch_with_retry(chain: RunnableSequence, batch: List[Dict])
     if not batch:
         return empty
     try:
-        return await chain.ainvoke({"scraped_data": batch})
+        return await chain.ainvoke({"scraped_data": serialize_payload(batch)})
     except LengthFinishReasonError as e:
         logger.warning("LLM length limit in article extraction (batch size %d). Splitting.", len(batch))
         if len(batch) == 1:
@@ -143,8 +386,8 @@ async def _extract_batch_with_retry(chain: RunnableSequence, batch: List[Dict])
 async def extract_leads_from_articles(articles: List[Dict], batch_size: int = 6) -> ArticleExtractionOutput:
     if not articles:
         return ArticleExtractionOutput(individuals=[], businesses=[])
-    batches = chunk_list(articles, batch_size)
-    chain = leads_extraction_from_articles_prompt | llm.with_structured_output(ArticleExtractionOutput)
+    batches = chunk_list(sorted(articles, key=_url_sort_key), batch_size)
+    chain = _build_chain(leads_extraction_from_articles_prompt, _llm(), ArticleExtractionOutput, "article_extraction")
     processed_articles = ArticleExtractionOutput(individuals=[], businesses=[])
     for batch in batches:
         out = await _extract_batch_with_retry(chain, batch)
@@ -1,46 +1,104 @@
 from langchain_core.prompts import ChatPromptTemplate
 
+# System messages hold everything that is stable for a stage (instructions, output
+# schema, examples) and must stay byte-identical across calls so the provider can
+# serve them from its prompt cache. Only the user message carries the batch payload.
+# Literal braces are doubled because these strings are prompt templates.
+
+KEYWORD_GENERATION_INSTRUCTIONS = (
+    "You are a keyword generation engine for a leads generation and acquisition system.\n"
+    "You will be given a query and you will return a list of keywords that can be used "
+    "to find relevant information on the web.\n"
+    "\n"
+    "Example:\n"
+    "query: 'Find me forex brokers in Cyprus'\n"
+    "output: ['forex brokers Cyprus', 'Cyprus forex brokers', 'Cyprus forex companies', "
+    "'Cyprus forex firms', 'Cyprus forex providers', 'Cyprus forex online trading companies']"
+)
+
+LEADS_PREPROCESSING_INSTRUCTIONS = (
+    "You are an expert at analysing and preprocessing leads sourced from the internet.\n"
+    "Your task is to prevent duplicates, ensure that highly relevant leads alone are returned, "
+    "and to classify the valid leads into 3 major categories:\n"
+    "1. Individuals\n"
+    "2. Businesses\n"
+    "3. Blogs/Articles\n"
+    "\n"
+    "Rules:\n"
+    "- The leads are given as a JSON array. Return each kept lead with its fields unchanged "
+    "(source_platform, name, about, contact, location, business_context).\n"
+    "- When several leads describe the same entity, keep a single one and prefer the lead "
+    "with the most contact details.\n"
+    "- Never invent names, phone numbers, emails or websites.\n"
+    "\n"
+    "Example input:\n"
+    '[{{"source_platform": "google_places", "name": "RespectedFX Bureau de Change", '
+    '"contact": {{"phone": "0803 000 0000", "website": "https://respectedfx.ng"}}, '
+    '"location": {{"country": "Nigeria", "country_acronym": "NG"}}, "business_context": "currency_exchange_service"}}, '
+    '{{"source_platform": "google_search", "name": "RespectedFX BDC - Home", '
+    '"contact": {{"website": "https://respectedfx.ng/"}}, "about": "Licensed bureau de change in Lagos."}}, '
+    '{{"source_platform": "google_search", "name": "Top 10 bureaus de change in Lagos (2024)", '
+    '"contact": {{"website": "https://example-news.ng/top-bdc-lagos"}}}}]\n'
+    "Example output: businesses = [the RespectedFX google_places lead], individuals = [], "
+    "articles = [the 'Top 10 bureaus de change' lead]."
+)
+
+WEBSITE_EVALUATION_INSTRUCTIONS = (
+    "You are an expert at analysing and evaluating scraped website data.\n"
+    "Your task is to extract relevant information from the scraped website data, summarize where "
+    "necessary and return it in a structured format.\n"
+    "The structured format should include the following fields for every website:\n"
+    "1. url: str - the exact url that came with the website data\n"
+    "2. email: Optional[str]\n"
+    "3. phone: Optional[str]\n"
+    "4. about: Optional[str]\n"
+    "\n"
+    "Rules:\n"
+    "- The websites are given as a JSON array; return exactly one item per website.\n"
+    "- Leave a field null when it is not present in the data. Do not write placeholders "
+    "such as 'N/A' or 'unknown' and never invent contact details.\n"
+    "\n"
+    "Example input:\n"
+    '[{{"url": "https://acmefx.com", "homepage_text": "AcmeFX helps SMEs pay suppliers abroad.", '
+    '"contact": "Reach us at hello@acmefx.com or +44 20 7946 0000", "about": "", "mission": ""}}]\n'
+    "Example output:\n"
+    '[{{"url": "https://acmefx.com", "email": "hello@acmefx.com", "phone": "+44 20 7946 0000", '
+    '"about": "AcmeFX helps SMEs pay suppliers abroad."}}]'
+)
+
+ARTICLE_EXTRACTION_INSTRUCTIONS = (
+    "You are an expert at extracting businesses and individuals from data scraped from articles.\n"
+    "Your task is to extract relevant information (keywords e.g. names + locations + context) about "
+    "businesses or individuals that can be used to search for them on the internet.\n"
+    "What you extract will be used as a query to source for more information about the leads on the internet.\n"
+    "BEWARE THAT THE KEYWORDS ARE EXPECTED TO MATCH TO UNIQUE ENTITIES SO TWO KEYWORDS SHOULD NOT "
+    "DESCRIBE THE SAME ENTITY DIFFERENTLY. AVOID DUPLICATES.\n"
+    "\n"
+    "Example input:\n"
+    '[{{"url": "https://example-news.ng/top-bdc-lagos", "homepage_text": "Top bureaus de change in Lagos: '
+    'RespectedFX on Allen Avenue, Ikeja and Zenith Exchange in Victoria Island."}}]\n'
+    "Example output:\n"
+    "businesses = ['RespectedFX bureau de change Ikeja Lagos', 'Zenith Exchange bureau de change Victoria Island Lagos'], "
+    "individuals = []"
+)
+
 
 keyword_generation_prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are a keyword generation engine for a leads generation and acquisition system. \
-     You will be given a query and you will return a list of keywords that can be used to find relevant information on the web.\
-        Below is an example query and the expected output:  \n \
-            query: 'Find me forex brokers in Cyprus',\
-            output: ['forex brokers Cyprus', 'Cyprus forex brokers', 'Cyprus forex companies', \
-                'Cyprus forex firms', 'Cyprus forex providers', \
-                    'Cyprus forex online trading companies']"),
+    ("system", KEYWORD_GENERATION_INSTRUCTIONS),
     ("user", "{query}"),
 ])
 
 sourced_leads_preprocessing_prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are an expert at analysing and preprocessing leads sourced from the internet.\
-        Your task is to prevent duplicates, ensure that highly relevant leads alone are returned, \
-            and also to classify the valid leads into 3 major categories:\n \
-                1. Individuals, 2. Businesses, 3. Blogs/Articles \n\
-            "),
+    ("system", LEADS_PREPROCESSING_INSTRUCTIONS),
     ("user", "{leads}"),
 ])
 
 scraped_website_evaluation_prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are an expert at analysing and evaluating scraped website data. \n\
-        Your task is to extract relevant information from the scraped website data, summarize where necessary and return it in a structured format. \n\
-        The structured format should include the following fields: \n\
-            1. email: Optional[str] \n\
-            2. phone: Optional[str] \n\
-            3. about: Optional[str] \n\
-        return the exact url that came with the website data\
-    "),
+    ("system", WEBSITE_EVALUATION_INSTRUCTIONS),
     ("user", "{website_data}"),
 ])
 
 leads_extraction_from_articles_prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are an expert at extracting businesses and individuals from data scraped from articles. \
-        Your task is to extract relevant information (keywords e.g names + locations + context) about businesses or individuals that can be \
-           used to search for them on the internet.\
-            What you extract will be used as a query to source for more information about the leads\
-                on the internet.\
-                    BEWARE THAT THE KEYWORDS ARE EXPECTED TO MATCH TO UNIQUE ENTITIES SO TWO KEYWORDS \
-                        SHOULD NOT DESCRIBE THE SAME ENTITY DIFFERENTLY. AVOID DUPLICATES."),    
+    ("system", ARTICLE_EXTRACTION_INSTRUCTIONS),
     ("user", "{scraped_data}"),
 ])
-    
\ No newline at end of file
@@ -0,0 +1,315 @@
+"""
+LLM usage, latency and cost instrumentation for the brainbox engine.
+
+A single LangChain callback handler (`usage_collector`) is attached to every
+brainbox chain. It aggregates calls, errors, retries, length-limit splits,
+token counts and latency per chain stage and per pipeline run. The cascade
+counts how many items each stage escalated to the larger model in the same
+per-run records (`record_escalation`).
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from openai import LengthFinishReasonError
+
+from internal.utils.logger import AppLogger
+
+logger = AppLogger("internal.domain.brainbox.usage")()
+
+ADHOC_RUN_ID = "adhoc"
+MAX_TRACKED_RUNS = 50
+
+# USD per 1M tokens: (prompt, cached prompt, completion)
+MODEL_PRICING: Dict[str, tuple] = {
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+}
+
+_current_run_id: ContextVar[Optional[str]] = ContextVar("llm_usage_run_id", default=None)
+
+
+def current_run_id() -> str:
+    return _current_run_id.get() or ADHOC_RUN_ID
+
+
+def _empty_stage_stats() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "errors": 0,
+        "retries": 0,
+        "length_splits": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cached_prompt_tokens": 0,
+        "latency_seconds": 0.0,
+        "estimated_cost_usd": 0.0,
+    }
+
+
+def _estimate_cost(model: Optional[str], prompt: int, cached: int, completion: int) -> float:
+    pricing = MODEL_PRICING.get(model or "")
+    if pricing is None:
+        # Dated snapshots (e.g. gpt-4.1-mini-2025-04-14) share the base model price
+        pricing = next(
+            (p for name, p in sorted(MODEL_PRICING.items(), key=lambda kv: -len(kv[0])) if (model or "").startswith(name)),
+            None,
+        )
+    if pricing is None:
+        return 0.0
+    prompt_price, cached_price, completion_price = pricing
+    return ((prompt - cached) * prompt_price + cached * cached_price + completion * completion_price) / 1_000_000
+
+
+def _extract_usage(response: LLMResult) -> Dict[str, int]:
+    """Read token usage from the message usage metadata, falling back to the provider payload."""
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "cached_prompt_tokens": 0}
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if not metadata:
+                continue
+            found = True
+            usage["prompt_tokens"] += metadata.get("input_tokens", 0) or 0
+            usage["completion_tokens"] += metadata.get("output_tokens", 0) or 0
+            usage["cached_prompt_tokens"] += (metadata.get("input_token_details") or {}).get("cache_read", 0) or 0
+    if found:
+        return usage
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    usage["prompt_tokens"] = token_usage.get("prompt_tokens", 0) or 0
+    usage["completion_tokens"] = token_usage.get("completion_tokens", 0) or 0
+    usage["cached_prompt_tokens"] = (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0
+    return usage
+
+
+def _escalation_summary(stats: Dict[str, int]) -> Dict[str, Any]:
+    """Cascade counters with escalation rate (percent of items sent to the larger model)."""
+    return {
+        **stats,
+        "escalation_rate_percent": round(100.0 * stats["escalated"] / stats["items"], 2) if stats["items"] else 0.0,
+    }
+
+
+def _cache_hit_ratio(stats: Dict[str, Any]) -> float:
+    """Share of prompt tokens served from the provider prompt cache."""
+    if not stats["prompt_tokens"]:
+        return 0.0
+    return round(100.0 * stats["cached_prompt_tokens"] / stats["prompt_tokens"], 2)
+
+
+class LLMUsageCollector(BaseCallbackHandler):
+    """Thread-safe callback handler aggregating LLM usage per stage and per run."""
+
+    run_inline = True
+
+    def __init__(self, max_runs: int = MAX_TRACKED_RUNS):
+        self._lock = threading.Lock()
+        self._max_runs = max_runs
+        self._runs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._in_flight: Dict[UUID, Dict[str, Any]] = {}
+
+    # ---------- Run tracking ----------
+    @contextmanager
+    def track_run(self, run_id: Optional[str] = None) -> Iterator[str]:
+        """Attribute all LLM calls made inside the block to `run_id` and log the totals when it exits."""
+        run_id = run_id or str(uuid.uuid4())
+        token = _current_run_id.set(run_id)
+        self._get_run(run_id)
+        try:
+            yield run_id
+        finally:
+            _current_run_id.reset(token)
+            with self._lock:
+                if run_id in self._runs:
+                    self._runs[run_id]["finished_at"] = time.time()
+            self.log_run(run_id)
+
+    def _get_run(self, run_id: str) -> Dict[str, Any]:
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                run = {"started_at": time.time(), "finished_at": None, "stages": {}, "cascade": {}}
+                self._runs[run_id] = run
+                while len(self._runs) > self._max_runs:
+                    self._runs.popitem(last=False)
+            return run
+
+    def _stage_stats(self, run_id: str, stage: str) -> Dict[str, Any]:
+        run = self._get_run(run_id)
+        with self._lock:
+            return run["stages"].setdefault(stage, _empty_stage_stats())
+
+    def record_escalation(self, stage: str, items: int, escalated: int, run_id: Optional[str] = None) -> None:
+        """Count `items` handled by the cascade of `stage`, `escalated` of them by the larger model."""
+        run = self._get_run(run_id or current_run_id())
+        with self._lock:
+            stats = run["cascade"].setdefault(stage, {"items": 0, "escalated": 0})
+            stats["items"] += items
+            stats["escalated"] += escalated
+
+    # ---------- Callbacks ----------
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        metadata = metadata or {}
+        invocation_params = kwargs.get("invocation_params") or {}
+        with self._lock:
+            self._in_flight[run_id] = {
+                "started": time.perf_counter(),
+                "stage": metadata.get("llm_stage", "unlabelled"),
+                "run_id": metadata.get("pipeline_run_id") or current_run_id(),
+                "model": invocation_params.get("model") or invocation_params.get("model_name") or metadata.get("ls_model_name"),
+            }
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        self.on_chat_model_start(serialized, [], run_id=run_id, metadata=metadata, **kwargs)
+
+    def _finish(self, run_id: UUID, usage: Dict[str, int], error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            call = self._in_flight.pop(run_id, None)
+        if call is None:
+            return
+        latency = time.perf_counter() - call["started"]
+        stats = self._stage_stats(call["run_id"], call["stage"])
+        with self._lock:
+            stats["calls"] += 1
+            stats["latency_seconds"] += latency
+            for key, value in usage.items():
+                stats[key] += value
+            stats["estimated_cost_usd"] += _estimate_cost(
+                call["model"], usage["prompt_tokens"], usage["cached_prompt_tokens"], usage["completion_tokens"]
+            )
+            if error is not None:
+                stats["errors"] += 1
+                if isinstance(error, LengthFinishReasonError):
+                    stats["length_splits"] += 1
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, _extract_usage(response))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "cached_prompt_tokens": 0}
+        # Length-limited completions are still billed; the error carries the usage
+        completion_usage = getattr(getattr(error, "completion", None), "usage", None)
+        if completion_usage is not None:
+            usage["prompt_tokens"] = getattr(completion_usage, "prompt_tokens", 0) or 0
+            usage["completion_tokens"] = getattr(completion_usage, "completion_tokens", 0) or 0
+            details = getattr(completion_usage, "prompt_tokens_details", None)
+            usage["cached_prompt_tokens"] = getattr(details, "cached_tokens", 0) or 0
+        self._finish(run_id, usage, error)
+
+    def on_retry(self, retry_state, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            call = self._in_flight.get(run_id)
+        stage = call["stage"] if call else "unlabelled"
+        stats = self._stage_stats(call["run_id"] if call else current_run_id(), stage)
+        with self._lock:
+            stats["retries"] += 1
+
+    # ---------- Reporting ----------
+    @staticmethod
+    def _summarize(stages: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        totals = _empty_stage_stats()
+        for stats in stages.values():
+            for key in _empty_stage_stats():
+                totals[key] += stats[key]
+        totals["cache_hit_ratio_percent"] = _cache_hit_ratio(totals)
+        totals["avg_latency_seconds"] = round(totals["latency_seconds"] / totals["calls"], 3) if totals["calls"] else 0.0
+        totals["latency_seconds"] = round(totals["latency_seconds"], 3)
+        totals["estimated_cost_usd"] = round(totals["estimated_cost_usd"], 6)
+        return totals
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                return None
+            stages = {
+                stage: {**stats, "cache_hit_ratio_percent": _cache_hit_ratio(stats)}
+                for stage, stats in run["stages"].items()
+            }
+            return {
+                "run_id": run_id,
+                "started_at": run["started_at"],
+                "finished_at": run["finished_at"],
+                "stages": stages,
+                "totals": self._summarize(stages),
+                "cascade": {stage: _escalation_summary(stats) for stage, stats in run["cascade"].items()},
+            }
+
+    def get_usage(self) -> Dict[str, Any]:
+        """Per-run breakdown of the most recent runs of this process plus totals across all of them."""
+        with self._lock:
+            run_ids = list(self._runs.keys())
+        return summarize_runs([run for run in (self.get_run(run_id) for run_id in run_ids) if run])
+
+    def log_run(self, run_id: str) -> None:
+        run = self.get_run(run_id)
+        if not run:
+            return
+        for stage, stats in run["stages"].items():
+            logger.info(
+                "LLM usage [%s] %s: %d calls, %d errors, %d length splits, %d prompt tokens (%d cached, %.2f%%), "
+                "%d completion tokens, %.2fs, ~$%.4f",
+                run_id,
+                stage,
+                stats["calls"],
+                stats["errors"],
+                stats["length_splits"],
+                stats["prompt_tokens"],
+                stats["cached_prompt_tokens"],
+                stats["cache_hit_ratio_percent"],
+                stats["completion_tokens"],
+                stats["latency_seconds"],
+                stats["estimated_cost_usd"],
+            )
+        totals = run["totals"]
+        logger.info(
+            "LLM usage [%s] total: %d calls, %d prompt tokens (%d cached, %.2f%%), %d completion tokens, %.2fs, ~$%.4f",
+            run_id,
+            totals["calls"],
+            totals["prompt_tokens"],
+            totals["cached_prompt_tokens"],
+            totals["cache_hit_ratio_percent"],
+            totals["completion_tokens"],
+            totals["latency_seconds"],
+            totals["estimated_cost_usd"],
+        )
+
+
+def summarize_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge run reports (as returned by LLMUsageCollector.get_run, e.g. read back
+    from pipeline job results) into per-stage and cascade totals.
+    """
+    all_stages: Dict[str, Dict[str, Any]] = {}
+    cascade: Dict[str, Dict[str, int]] = {}
+    for run in runs:
+        for stage, stats in run["stages"].items():
+            merged = all_stages.setdefault(stage, _empty_stage_stats())
+            for key in merged:
+                merged[key] += stats.get(key, 0)
+        for stage, stats in (run.get("cascade") or {}).items():
+            merged = cascade.setdefault(stage, {"items": 0, "escalated": 0})
+            merged["items"] += stats["items"]
+            merged["escalated"] += stats["escalated"]
+    for stats in all_stages.values():
+        stats["cache_hit_ratio_percent"] = _cache_hit_ratio(stats)
+    return {
+        "runs": runs,
+        "stages": all_stages,
+        "totals": LLMUsageCollector._summarize(all_stages),
+        "cascade": {stage: _escalation_summary(stats) for stage, stats in cascade.items()},
+    }
+
+
+usage_collector = LLMUsageCollector()
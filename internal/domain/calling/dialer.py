@@ -0,0 +1,273 @@
+"""
+Concurrent, rate-limited campaign dialer
+
+A campaign feeds batches of prospects to a fixed pool of dialing workers
+sharing one AsyncRetell client (one HTTP connection pool). Two knobs bound the
+load placed on Retell and the telephony side:
+
+- max_concurrent: create_phone_call requests in flight at once
+- calls_per_second: call starts per second across all workers
+
+Each call's latency and outcome is recorded in `dialer_metrics`, per campaign.
+Rate limit (429) and transient errors are retried by the Retell client itself
+(max_retries with backoff) before a call counts as failed.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from retell import AsyncRetell
+
+from internal.config.secret import SecretManager
+from internal.domain.calling.retell_service import make_retell_call_async
+from internal.utils.logger import AppLogger
+
+logger = AppLogger("domain.calling.dialer")()
+
+MAX_TRACKED_CAMPAIGNS = 100
+
+
+class RateLimiter:
+    """Spaces acquisitions at least 1 / rate seconds apart (no bursts)."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 3)
+
+
+class DialerMetrics:
+    """Thread-safe per-campaign call latency and failure metrics."""
+
+    def __init__(self, max_campaigns: int = MAX_TRACKED_CAMPAIGNS):
+        self._lock = threading.Lock()
+        self._max_campaigns = max_campaigns
+        self._campaigns: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def start(
+        self,
+        campaign_id: str,
+        max_concurrent: int,
+        calls_per_second: float,
+        total: Optional[int] = None,
+    ) -> None:
+        """(Re)initialise a campaign's metrics; `total` is the number of calls planned, if known."""
+        with self._lock:
+            self._campaigns[campaign_id] = {
+                "started_at": time.time(),
+                "total": total,
+                "finished_at": None,
+                "max_concurrent": max_concurrent,
+                "calls_per_second": calls_per_second,
+                "latencies": [],
+                "initiated": 0,
+                "failed": 0,
+                "errors": Counter(),
+            }
+            while len(self._campaigns) > self._max_campaigns:
+                self._campaigns.popitem(last=False)
+
+    def record(self, campaign_id: str, latency: float, result: Dict[str, Any]) -> None:
+        with self._lock:
+            campaign = self._campaigns.get(campaign_id)
+            if campaign is None:
+                return
+            campaign["latencies"].append(latency)
+            if result.get("success"):
+                campaign["initiated"] += 1
+            else:
+                campaign["failed"] += 1
+                campaign["errors"][result.get("error_type") or "unknown"] += 1
+
+    def finish(self, campaign_id: str) -> None:
+        with self._lock:
+            if campaign_id in self._campaigns:
+                self._campaigns[campaign_id]["finished_at"] = time.time()
+
+    def _summary(self, campaign: Dict[str, Any]) -> Dict[str, Any]:
+        latencies = sorted(campaign["latencies"])
+        dialed = len(latencies)
+        elapsed = (campaign["finished_at"] or time.time()) - campaign["started_at"]
+        return {
+            "status": "finished" if campaign["finished_at"] else "running",
+            "started_at": campaign["started_at"],
+            "finished_at": campaign["finished_at"],
+            "max_concurrent": campaign["max_concurrent"],
+            "calls_per_second": campaign["calls_per_second"],
+            "total": campaign["total"],
+            "dialed": dialed,
+            "initiated": campaign["initiated"],
+            "failed": campaign["failed"],
+            "failure_rate": round(100.0 * campaign["failed"] / dialed, 2) if dialed else 0.0,
+            "errors": dict(campaign["errors"]),
+            "throughput_per_second": round(dialed / elapsed, 3) if elapsed > 0 else 0.0,
+            "latency_seconds": {
+                "avg": round(sum(latencies) / dialed, 3) if dialed else 0.0,
+                "p50": _percentile(latencies, 50),
+                "p95": _percentile(latencies, 95),
+                "max": round(latencies[-1], 3) if latencies else 0.0,
+            },
+        }
+
+    def get_campaign(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            campaign = self._campaigns.get(campaign_id)
+            return self._summary(campaign) if campaign else None
+
+    def get_campaigns(self) -> Dict[str, Dict[str, Any]]:
+        """Recent campaigns, newest first."""
+        with self._lock:
+            return {
+                campaign_id: self._summary(campaign)
+                for campaign_id, campaign in reversed(self._campaigns.items())
+            }
+
+
+dialer_metrics = DialerMetrics()
+
+
+class CampaignDialer:
+    """Dials prospects with bounded concurrency and a calls-per-second limit."""
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        calls_per_second: Optional[float] = None,
+        from_number: Optional[str] = None,
+    ):
+        """
+        Args:
+            max_concurrent: Calls being placed at once (default CAMPAIGN_MAX_CONCURRENT_CALLS)
+            calls_per_second: Call starts per second (default CAMPAIGN_CALLS_PER_SECOND; 0 = unlimited)
+            from_number: Caller number (defaults to RETELL_FROM_NUMBER)
+        """
+        self.max_concurrent = max(1, max_concurrent or SecretManager.CAMPAIGN_MAX_CONCURRENT_CALLS)
+        self.calls_per_second = (
+            calls_per_second if calls_per_second is not None else SecretManager.CAMPAIGN_CALLS_PER_SECOND
+        )
+        self.from_number = from_number
+
+    async def run(
+        self,
+        batches: Iterator[List[Dict[str, Any]]],
+        campaign_id: Optional[str] = None,
+        total: Optional[int] = None,
+        on_batch: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Dial every prospect yielded by `batches` (`total` prospects, if known, for
+        progress reporting).
+
+        `batches` is a blocking iterator (e.g. DB pages); it is advanced in a worker
+        thread, one batch ahead of the dialers, so memory stays bounded by the batch
+        size and the event loop never waits on the database. `on_batch`, if given,
+        is awaited with the results of each batch as soon as all of its prospects
+        have been dialed (errors are logged, not raised).
+
+        Returns:
+            {"campaign_id", "total", "initiated", "failed", "results", "metrics"}
+        """
+        campaign_id = campaign_id or str(uuid.uuid4())
+        dialer_metrics.start(campaign_id, self.max_concurrent, self.calls_per_second, total)
+        limiter = RateLimiter(self.calls_per_second)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrent * 2)
+        results: List[Dict[str, Any]] = []
+        # batch number -> [prospects not dialed yet, results so far]
+        pending: Dict[int, List[Any]] = {}
+
+        async def produce() -> None:
+            for number in itertools.count():
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None:
+                    break
+                if not batch:
+                    continue
+                pending[number] = [len(batch), []]
+                for prospect in batch:
+                    await queue.put((number, prospect))
+
+        async def batch_done(number: int) -> None:
+            _, batch_results = pending.pop(number)
+            if on_batch is None:
+                return
+            try:
+                await on_batch(batch_results)
+            except Exception as e:
+                logger.error("Campaign %s: failed to handle results of batch %d: %s", campaign_id, number, e)
+
+        async def dial(client: AsyncRetell) -> None:
+            while True:
+                item = await queue.get()
+                try:
+                    if item is None:
+                        return
+                    number, prospect = item
+                    await limiter.acquire()
+                    started = time.perf_counter()
+                    result = await make_retell_call_async(client, prospect, self.from_number)
+                    dialer_metrics.record(campaign_id, time.perf_counter() - started, result)
+                    result.pop("response", None)
+                    results.append(result)
+                    pending[number][1].append(result)
+                    pending[number][0] -= 1
+                    if not pending[number][0]:
+                        await batch_done(number)
+                finally:
+                    queue.task_done()
+
+        logger.info(
+            "Campaign %s: dialing with %d concurrent calls at %s calls/s",
+            campaign_id,
+            self.max_concurrent,
+            self.calls_per_second or "unlimited",
+        )
+        try:
+            async with AsyncRetell(api_key=SecretManager.RETELL_API_KEY) as client:
+                workers = [asyncio.create_task(dial(client)) for _ in range(self.max_concurrent)]
+                try:
+                    await produce()
+                finally:
+                    for _ in workers:
+                        await queue.put(None)
+                    await asyncio.gather(*workers)
+        finally:
+            dialer_metrics.finish(campaign_id)
+
+        initiated = sum(1 for result in results if result.get("success"))
+        metrics = dialer_metrics.get_campaign(campaign_id)
+        logger.info(
+            "Campaign %s complete: %d initiated, %d failed",
+            campaign_id,
+            initiated,
+            len(results) - initiated,
+        )
+        return {
+            "campaign_id": campaign_id,
+            "total": len(results),
+            "initiated": initiated,
+            "failed": len(results) - initiated,
+            "results": results,
+            "metrics": metrics,
+        }
@@ -4,7 +4,7 @@ Retell phone calling service for prospects
 
 import sys
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 
 _current = Path(__file__).resolve()
@@ -20,7 +20,7 @@ if str(project_root) not in sys.path:
 
 import json
 
-from retell import Retell
+from retell import AsyncRetell, Retell
 from internal.utils.logger import AppLogger
 from internal.utils.database import get_session, DatabaseManager 
 from internal.config.secret import SecretManager
@@ -70,7 +70,7 @@ def get_prospects_with_phones_from_files(
                 prospect_data = json.load(f)
 
             # Check if prospect has phone number
-            phone = prospect_data.get("phones")
+            phone = primary_contact(prospect_data.get("phones"))
             has_phone = prospect_data.get("has_phone", False)
 
             # Only include prospects with valid phone numbers
@@ -106,6 +106,19 @@ def get_prospects_with_phones(limit: Optional[int] = None) -> List[Dict[str, Any
     return prospects
 
 
+def primary_contact(values: Union[str, List[str], None]) -> Optional[str]:
+    """First entry of a contact list (prospect contacts are stored primary-first)."""
+    if isinstance(values, str):
+        return values
+    return values[0] if values else None
+
+
+def format_contact_list(values: Union[str, List[str], None]) -> str:
+    if isinstance(values, str):
+        return values
+    return ", ".join(values or [])
+
+
 def format_phone_number(phone: str) -> str:
     """
     Format phone number for Retell API (E.164 format: +1234567890)
@@ -129,112 +142,161 @@ def format_phone_number(phone: str) -> str:
     return cleaned
 
 
-def make_retell_call(
+def _call_failure(
     prospect: Dict[str, Any],
-    from_number: Optional[str] = None,
+    error_msg: str,
+    to_number: Optional[str] = None,
+    error_type: str = "invalid_prospect",
 ) -> Dict[str, Any]:
-    """
-    Make a Retell phone call to a prospect
+    logger.error(error_msg)
+    failure = {
+        "success": False,
+        "error": error_msg,
+        "error_type": error_type,
+        "prospect_id": prospect.get("prospect_id"),
+    }
+    if to_number:
+        failure["to_number"] = to_number
+    return failure
 
-    Args:
-        prospect: Prospect dictionary with phone number and other data
-        from_number: Phone number to call from (defaults to RETELL_FROM_NUMBER)
-        agent_id: Retell agent ID (required for outbound calls, defaults to RETELL_AGENT_ID)
+
+def prepare_retell_call(
+    prospect: Dict[str, Any],
+    from_number: Optional[str] = None,
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Build the create_phone_call parameters for a prospect
 
     Returns:
-        Dictionary with call response or error information
+        (call_params, None), or (None, failure result) if the prospect cannot be dialed
     """
     if not from_number:
         from_number = SecretManager.RETELL_FROM_NUMBER
 
     if not from_number:
-        error_msg = "No from_number provided and RETELL_FROM_NUMBER not set"
-        logger.error(error_msg)
-        return {
-            "success": False,
-            "error": error_msg,
-            "prospect_id": prospect.get("prospect_id"),
-        }
+        return None, _call_failure(
+            prospect, "No from_number provided and RETELL_FROM_NUMBER not set", error_type="configuration"
+        )
 
-    phone = prospect.get("phones")
+    phone = primary_contact(prospect.get("phones"))
     if not phone:
-        error_msg = f"Prospect {prospect.get('prospect_id')} has no phone number"
-        logger.error(error_msg)
-        return {
-            "success": False,
-            "error": error_msg,
-            "prospect_id": prospect.get("prospect_id"),
-        }
+        return None, _call_failure(prospect, f"Prospect {prospect.get('prospect_id')} has no phone number")
 
     # Format phone number
     to_number = format_phone_number(phone)
 
     if not to_number:
-        error_msg = f"Invalid phone number format: {phone}"
-        logger.error(error_msg)
-        return {
-            "success": False,
-            "error": error_msg,
-            "prospect_id": prospect.get("prospect_id"),
-        }
+        return None, _call_failure(prospect, f"Invalid phone number format: {phone}")
+
+    call_params = {
+        "from_number": from_number,
+        "to_number": to_number,
+    }
+
+    call_params["retell_llm_dynamic_variables"] = {
+        "prospect_name": prospect.get("name"),
+        "business_context": prospect.get("business_context"),
+        "about": prospect.get("about"),
+        "country": prospect.get("country"),
+        "platforms": format_contact_list(prospect.get("platforms")),
+        "date_time": prospect.get("created_at"),
+    }
+
+    logger.info("Call parameters: %s", call_params)
+    call_params["metadata"] = {
+        "prospect_id": prospect.get("prospect_id"),
+        "prospect_name": prospect.get("name"),
+        "to_number": to_number,
+    }
+    return call_params, None
+
+
+def _call_success(prospect: Dict[str, Any], call_params: Dict[str, Any], phone_call_response) -> Dict[str, Any]:
+    logger.info(
+        "Call initiated successfully. Call ID: %s, Agent ID: %s",
+        getattr(phone_call_response, "call_id", "unknown"),
+        getattr(phone_call_response, "agent_id", "unknown"),
+    )
+
+    return {
+        "success": True,
+        "call_id": getattr(phone_call_response, "call_id", None),
+        "agent_id": getattr(phone_call_response, "agent_id", None),
+        "prospect_id": prospect.get("prospect_id"),
+        "prospect_name": prospect.get("name"),
+        "to_number": call_params["to_number"],
+        "from_number": call_params["from_number"],
+        "response": phone_call_response,
+    }
+
+
+def make_retell_call(
+    prospect: Dict[str, Any],
+    from_number: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Make a Retell phone call to a prospect
+
+    Args:
+        prospect: Prospect dictionary with phone number and other data
+        from_number: Phone number to call from (defaults to RETELL_FROM_NUMBER)
+
+    Returns:
+        Dictionary with call response or error information
+    """
+    call_params, failure = prepare_retell_call(prospect, from_number)
+    if failure:
+        return failure
 
     try:
         logger.info(
             "Initiating call to prospect %s (%s) from %s",
             prospect.get("name"),
-            to_number,
-            from_number,
+            call_params["to_number"],
+            call_params["from_number"],
         )
-        call_params = {
-            "from_number": from_number,
-            "to_number": to_number,
-        }
+        # Make the call
+        phone_call_response = retell_client.call.create_phone_call(**call_params)
+        return _call_success(prospect, call_params, phone_call_response)
 
-        call_params["retell_llm_dynamic_variables"] = {
-            "prospect_name": prospect.get("name"),
-            "business_context": prospect.get("business_context"),
-            "about": prospect.get("about"),
-            "country": prospect.get("country"),
-            "platforms": prospect.get("platforms"),
-            "date_time": prospect.get("created_at"),
-        }
+    except Exception as e:
+        return _call_failure(
+            prospect,
+            f"Error making Retell call to {call_params['to_number']}: {str(e)}",
+            call_params["to_number"],
+            type(e).__name__,
+        )
 
-        logger.info("Call parameters: %s", call_params)
-        call_params["metadata"] = {
-            "prospect_id": prospect.get("prospect_id"),
-            "prospect_name": prospect.get("name"),
-            "to_number": to_number,
-        }
 
-        # Make the call
-        phone_call_response = retell_client.call.create_phone_call(**call_params)
+async def make_retell_call_async(
+    client: AsyncRetell,
+    prospect: Dict[str, Any],
+    from_number: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of make_retell_call on a shared AsyncRetell client (used by the campaign dialer)
+    """
+    call_params, failure = prepare_retell_call(prospect, from_number)
+    if failure:
+        return failure
 
+    try:
         logger.info(
-            "Call initiated successfully. Call ID: %s, Agent ID: %s",
-            getattr(phone_call_response, "call_id", "unknown"),
-            getattr(phone_call_response, "agent_id", "unknown"),
+            "Initiating call to prospect %s (%s) from %s",
+            prospect.get("name"),
+            call_params["to_number"],
+            call_params["from_number"],
         )
-
-        return {
-            "success": True,
-            "call_id": getattr(phone_call_response, "call_id", None),
-            "agent_id": getattr(phone_call_response, "agent_id", None),
-            "prospect_id": prospect.get("prospect_id"),
-            "prospect_name": prospect.get("name"),
-            "to_number": to_number,
-            "from_number": from_number,
-            "response": phone_call_response,
-        }
+        phone_call_response = await client.call.create_phone_call(**call_params)
+        return _call_success(prospect, call_params, phone_call_response)
 
     except Exception as e:
-        error_msg = f"Error making Retell call to {to_number}: {str(e)}"
-        logger.error(error_msg)
-        return {
-            "success": False,
-            "error": error_msg,
-            "prospect_id": prospect.get("prospect_id"),
-            "to_number": to_number,
-        }
+        return _call_failure(
+            prospect,
+            f"Error making Retell call to {call_params['to_number']}: {str(e)}",
+            call_params["to_number"],
+            type(e).__name__,
+        )
 
 
 def call_prospects_with_phones(
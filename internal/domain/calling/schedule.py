@@ -0,0 +1,119 @@
+"""
+Business-hours dialing windows by prospect country
+
+A prospect's timezone comes from its country_acronym: the `calling.timezones`
+map in funnel_config.yaml first, then the system zone.tab (first zone listed
+for the country), then `calling.default_timezone`. Windows are
+[start_hour, end_hour) local time on the configured weekdays.
+"""
+
+import zoneinfo
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from internal.config.paths_config import FUNNEL_CONFIG_PATH
+from internal.utils.loader import load_yaml
+from internal.utils.logger import AppLogger
+
+logger = AppLogger("domain.calling.schedule")()
+
+Window = Tuple[datetime, datetime]
+
+
+@dataclass(frozen=True)
+class CallWindowConfig:
+    start_hour: int = 9
+    end_hour: int = 17
+    weekdays: Tuple[int, ...] = (0, 1, 2, 3, 4)
+    default_timezone: str = "UTC"
+    timezones: Dict[str, str] = field(default_factory=dict)
+    max_attempts: int = 3
+    retry_delay_minutes: int = 30
+
+
+def load_call_window_config(config_path=FUNNEL_CONFIG_PATH) -> CallWindowConfig:
+    calling = (load_yaml(config_path) or {}).get("calling", {}) or {}
+    window = calling.get("window", {}) or {}
+    return CallWindowConfig(
+        start_hour=int(window.get("start_hour", 9)),
+        end_hour=int(window.get("end_hour", 17)),
+        weekdays=tuple(window.get("weekdays", (0, 1, 2, 3, 4))),
+        default_timezone=calling.get("default_timezone", "UTC"),
+        timezones={str(k).upper(): v for k, v in (calling.get("timezones", {}) or {}).items()},
+        max_attempts=int(calling.get("max_attempts", 3)),
+        retry_delay_minutes=int(calling.get("retry_delay_minutes", 30)),
+    )
+
+
+@lru_cache(maxsize=1)
+def _zone_tab() -> Dict[str, str]:
+    """Country code -> first zone listed for it in the system zone.tab (if present)."""
+    for base in zoneinfo.TZPATH:
+        path = Path(base) / "zone.tab"
+        if not path.exists():
+            continue
+        zones: Dict[str, str] = {}
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if line.startswith("#") or not line.strip():
+                continue
+            parts = line.split("\t")
+            if len(parts) >= 3:
+                zones.setdefault(parts[0].upper(), parts[2])
+        return zones
+    return {}
+
+
+def timezone_for_country(country_acronym: Optional[str], config: CallWindowConfig) -> str:
+    code = (country_acronym or "").strip().upper()
+    if code:
+        tz_name = config.timezones.get(code) or _zone_tab().get(code)
+        if tz_name:
+            return tz_name
+    return config.default_timezone
+
+
+def next_call_window(tz_name: str, config: CallWindowConfig, now: Optional[datetime] = None) -> Window:
+    """
+    The current window if `now` is inside one, else the next one to open,
+    as timezone-aware UTC datetimes.
+    """
+    now = now or datetime.now(timezone.utc)
+    try:
+        tz = zoneinfo.ZoneInfo(tz_name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        logger.warning("Unknown timezone %s, using UTC for its call window", tz_name)
+        tz = timezone.utc
+    local_now = now.astimezone(tz)
+    for day_offset in range(8):
+        day = local_now.date() + timedelta(days=day_offset)
+        if day.weekday() not in config.weekdays:
+            continue
+        start = datetime.combine(day, time(config.start_hour), tzinfo=tz)
+        end = datetime.combine(day, time(config.end_hour), tzinfo=tz)
+        if end > local_now:
+            return max(start, local_now).astimezone(timezone.utc), end.astimezone(timezone.utc)
+    raise ValueError(f"No call window within a week (weekdays={config.weekdays})")
+
+
+def windows_by_timezone(
+    tz_names: Iterable[str],
+    config: CallWindowConfig,
+    now: Optional[datetime] = None,
+) -> Dict[str, Window]:
+    return {tz_name: next_call_window(tz_name, config, now) for tz_name in set(tz_names)}
+
+
+def windows_by_country(
+    country_keys: List[str],
+    config: CallWindowConfig,
+    now: Optional[datetime] = None,
+) -> Dict[str, Tuple[str, datetime, datetime]]:
+    """country key ('' for unknown) -> (timezone, window_start, window_end)"""
+    windows = {}
+    for key in country_keys:
+        tz_name = timezone_for_country(key, config)
+        windows[key] = (tz_name, *next_call_window(tz_name, config, now))
+    return windows
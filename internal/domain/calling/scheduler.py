@@ -0,0 +1,62 @@
+"""
+Call scheduler loop
+
+Runs a dispatch pass (sweep the call queue, move closed windows forward,
+dial whatever is due) every poll interval on an event loop of a worker process
+(worker.py), so queued calls are released to the dialer as their
+business-hours windows open. Each worker may run one: queue entries are
+claimed with SKIP LOCKED, so schedulers in several workers share the queue
+without double-dialing.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from internal.utils.logger import AppLogger
+
+logger = AppLogger("domain.calling.scheduler")()
+
+
+class CallScheduler:
+    """Periodically awaits `dispatch` until stopped"""
+
+    def __init__(self, dispatch: Callable[[], Awaitable[object]], poll_interval: float):
+        """
+        Args:
+            dispatch: One scheduler pass (e.g. service.dispatch_due_calls)
+            poll_interval: Seconds between passes
+        """
+        self._dispatch = dispatch
+        self._poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("Call scheduler started (every %ss)", self._poll_interval)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Call scheduler stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._dispatch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Call scheduler pass failed: %s", e)
+            await asyncio.sleep(self._poll_interval)
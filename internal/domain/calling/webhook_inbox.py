@@ -0,0 +1,134 @@
+"""
+Retell webhook inbox consumer
+
+The webhook handler appends each call_analyzed event to the webhook_inbox
+table and acks; nothing else happens in the request. This consumer applies
+pending events to prospects in batches: when an event arrives it waits
+batch_window seconds so a burst (a campaign finishing) lands in one UPDATE,
+then drains the inbox. It also polls every poll_interval, which picks up
+events left pending by a restart or stored by another app process. Several
+consumers may run at once: events are taken with SKIP LOCKED.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from internal.domain.common.dto import CustomCallAnalysisData
+from internal.utils.database.async_manager import AsyncDatabaseManager
+from internal.utils.database.session import get_async_session
+from internal.utils.logger import AppLogger
+
+logger = AppLogger("domain.calling.webhook_inbox")()
+
+# Seconds between deletions of old processed events
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+def call_outcome(call: Dict[str, Any]) -> CustomCallAnalysisData:
+    """Call outcome carried by the `call` object of a call_analyzed webhook"""
+    call_analysis = call.get("call_analysis") or {}
+    custom_analysis_data = call_analysis.get("custom_analysis_data") or {}
+    return {
+        "prospect_id": (call.get("metadata") or {}).get("prospect_id"),
+        "call_summary": call_analysis.get("call_summary", ""),
+        "call_recording_url": call.get("recording_url", ""),
+        "is_qualified_lead": custom_analysis_data.get("qualified_lead", False),
+        "is_relevant_industry": custom_analysis_data.get("relevant_industry", False),
+    }
+
+
+class WebhookInboxConsumer:
+    """Applies pending webhook_inbox events in batches on the app's event loop"""
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        batch_window: float = 0.2,
+        poll_interval: float = 5.0,
+        retention_days: int = 7,
+    ):
+        """
+        Args:
+            batch_size: Events applied per transaction
+            batch_window: Seconds to wait after an event arrives before draining
+            poll_interval: Seconds between drains when no event is signalled
+            retention_days: Processed events are kept this long (retries within it are ignored)
+        """
+        self._batch_size = max(1, batch_size)
+        self._batch_window = batch_window
+        self._poll_interval = poll_interval
+        self._retention_days = retention_days
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_prune: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def notify(self) -> None:
+        """Signal that an event was stored (the consumer drains after batch_window)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("Webhook inbox consumer started")
+
+    async def stop(self) -> None:
+        """Stop the loop and apply whatever is still pending (call on app shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.drain()
+        logger.info("Webhook inbox consumer stopped")
+
+    async def drain(self) -> int:
+        """Apply pending events batch by batch until none are left. Returns events processed."""
+        processed = 0
+        while True:
+            async with get_async_session() as session:
+                applied = await AsyncDatabaseManager(session).apply_webhook_events(
+                    call_outcome, self._batch_size
+                )
+            if not applied:
+                break
+            processed += applied
+            if applied < self._batch_size:
+                break
+        if processed:
+            logger.info("Applied %d webhook events", processed)
+        return processed
+
+    async def _prune(self) -> None:
+        if self._last_prune is not None and time.monotonic() - self._last_prune < PRUNE_INTERVAL_SECONDS:
+            return
+        async with get_async_session() as session:
+            pruned = await AsyncDatabaseManager(session).prune_webhook_inbox(self._retention_days)
+        if pruned:
+            logger.info("Pruned %d processed webhook events", pruned)
+        self._last_prune = time.monotonic()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+                await asyncio.sleep(self._batch_window)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.drain()
+                await self._prune()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Webhook inbox pass failed: %s", e)
@@ -1,35 +1,37 @@
 from typing import List
 from .dto import Prospect
 
+# Points per field present on a prospect; a prospect without any contact field
+# scores 0. Also used to score stored prospects in SQL (utils/database/priority.py).
+CONTACT_POINTS = {"email": 0.2, "phone": 0.2, "website": 0.3}
+PROFILE_POINTS = {"country": 0.10, "business_context": 0.10, "about": 0.10}
+
+
 def calculate_points(prospect: Prospect) -> float:
     contact = prospect.get("contact", {})
 
     has_contact = any(
         contact.get(field)
-        for field in ("email", "phone", "website")
+        for field in CONTACT_POINTS
     )
     if not has_contact:
         return 0.0
 
     score = 0.0
 
-    if contact.get("email"):
-        score += 0.2
-    if contact.get("phone"):
-        score += 0.2
-    if contact.get("website"):
-        score += 0.3
+    for field, points in CONTACT_POINTS.items():
+        if contact.get(field):
+            score += points
     if prospect.get("location", {}).get("country"):
-        score += 0.10
+        score += PROFILE_POINTS["country"]
     if prospect.get("business_context"):
-        score += 0.10
+        score += PROFILE_POINTS["business_context"]
     if prospect.get("about"):
-        score += 0.10
+        score += PROFILE_POINTS["about"]
 
     return score
 
 
-
 def filter_high_score_prospects(prospects: List[Prospect], threshold: float = 0.3) -> List[Prospect]:
     filtered = []
     for prospect in prospects:
@@ -4,9 +4,14 @@ Deduplication pipeline package
 Exports main classes and functions for prospect deduplication.
 """
 
+from internal.domain.deduplicator.engine import DeduplicationEngine
 from internal.domain.deduplicator.feature import entrypoint
+from internal.domain.deduplicator.fuzzy import FuzzyNameIndex, normalize_name
 
 __all__ = [
+    'DeduplicationEngine',
+    'FuzzyNameIndex',
+    'normalize_name',
     'entrypoint',
 ]
 
@@ -0,0 +1,385 @@
+"""
+Deduplication engine for raw prospects
+
+Builds blocking keys (normalized phone, email, registrable domain and name
+signature) for every raw prospect and merges records sharing a key with a
+union-find structure. Each record is touched a constant number of times, so the
+run is near-linear in the number of prospects; only records within one name
+block are compared, so same-name records whose phones or website domains
+differ are kept apart.
+"""
+
+import re
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from internal.domain.common.scoring import calculate_points
+from internal.domain.deduplicator.fuzzy import FuzzyNameIndex
+from internal.utils.logger import AppLogger
+from internal.utils.normalizer import normalize_email, normalize_phone, DIGITS_ONLY
+
+logger = AppLogger("domain.deduplicator.engine")()
+
+
+# Second-level labels under which registrations happen one level deeper (e.g. acme.co.uk)
+MULTI_PART_SUFFIXES = {
+    "co", "com", "net", "org", "gov", "edu", "ac", "or", "ne", "go", "ltd", "plc", "sch",
+}
+
+# Hosts shared by unrelated businesses; a website on these says nothing about identity
+SHARED_HOST_DOMAINS = {
+    "facebook.com", "instagram.com", "linkedin.com", "twitter.com", "x.com", "youtube.com",
+    "tiktok.com", "wa.me", "whatsapp.com", "google.com", "goo.gl", "linktr.ee", "bit.ly",
+    "wordpress.com", "blogspot.com", "wixsite.com", "medium.com", "yelp.com",
+}
+
+FREE_EMAIL_DOMAINS = {
+    "gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "live.com", "icloud.com",
+    "aol.com", "proton.me", "protonmail.com", "ymail.com", "mail.com",
+}
+
+NAME_STOPWORDS = {
+    "the", "and", "of", "in", "at", "for", "a", "an", "&",
+    "ltd", "limited", "llc", "inc", "plc", "co", "company", "corp", "corporation", "gmbh",
+    "home", "official", "website",
+}
+
+NAME_TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+
+# Minimum national-number digits used to compare phones when the country is unknown
+PHONE_SUFFIX_DIGITS = 9
+
+
+class UnionFind:
+    """Disjoint-set forest with path halving and union by size."""
+
+    def __init__(self, size: int):
+        self._parent = list(range(size))
+        self._size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self._parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> bool:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size[root_b]
+        return True
+
+    def groups(self) -> Dict[int, List[int]]:
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for item in range(len(self._parent)):
+            groups[self.find(item)].append(item)
+        return groups
+
+
+def registrable_domain(url: Optional[str]) -> Optional[str]:
+    """Reduce a URL to its registrable domain (e.g. https://www.shop.acme.co.uk/x -> acme.co.uk)."""
+    if not url:
+        return None
+    url = url.strip().lower()
+    if "://" not in url:
+        url = f"http://{url}"
+    host = (urlparse(url).hostname or "").strip(".")
+    if not host or "." not in host or host.replace(".", "").isdigit():
+        return None
+    labels = host.split(".")
+    if len(labels) >= 3 and labels[-2] in MULTI_PART_SUFFIXES and len(labels[-1]) == 2:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def name_signature(name: Optional[str]) -> Optional[str]:
+    """Order-insensitive signature of the significant tokens in a name."""
+    if not name:
+        return None
+    tokens = {
+        token
+        for token in NAME_TOKEN_REGEX.findall(name.lower())
+        if token not in NAME_STOPWORDS
+    }
+    if not tokens:
+        return None
+    return " ".join(sorted(tokens))
+
+
+def _country_of(prospect: Dict[str, Any]) -> Optional[str]:
+    location = prospect.get("location") or {}
+    return location.get("country_acronym") or location.get("country_code")
+
+
+def _country_key(prospect: Dict[str, Any]) -> str:
+    return (_country_of(prospect) or "").strip().upper()
+
+
+def phone_key(phone: Optional[str], country_acronym: Optional[str]) -> Optional[str]:
+    """
+    E.164 number (international numbers keep their own country code, so the same
+    number matches with or without a country on the record)
+    """
+    if not phone:
+        return None
+    normalized = normalize_phone(phone, country_acronym)
+    if normalized:
+        return normalized
+    # National number without a known country: compare on the trailing national-number digits
+    digits = DIGITS_ONLY.sub("", phone)
+    if len(digits) < PHONE_SUFFIX_DIGITS:
+        return None
+    return digits[-PHONE_SUFFIX_DIGITS:]
+
+
+class DeduplicationEngine:
+    """Merges raw prospects into canonical prospects using blocking keys and union-find."""
+
+    KEY_TYPES = ("phone", "email", "domain", "name")
+
+    def __init__(
+        self,
+        key_types: Iterable[str] = KEY_TYPES,
+        max_block_size: int = 50,
+        fuzzy_names: bool = True,
+    ):
+        """
+        Args:
+            key_types: Blocking keys that are allowed to merge records
+            max_block_size: Blocks larger than this are treated as shared/generic
+                (e.g. a directory's phone number) and are not merged; they are flagged instead
+            fuzzy_names: Also merge near-duplicate names found by the MinHash/LSH index
+                (configured under deduplication.fuzzy_name in the funnel config)
+        """
+        self.key_types = tuple(key_types)
+        self.max_block_size = max_block_size
+        self.fuzzy_names = fuzzy_names
+
+    # ---------- Input ----------
+    @staticmethod
+    def _flatten(raw_prospects: Any) -> List[Dict[str, Any]]:
+        """Accept a flat list or the categorised output of lead preprocessing."""
+        if isinstance(raw_prospects, dict):
+            return [
+                prospect
+                for category in ("individuals", "businesses", "articles")
+                for prospect in raw_prospects.get(category) or []
+            ]
+        return list(raw_prospects or [])
+
+    # ---------- Blocking ----------
+    def blocking_keys(self, prospect: Dict[str, Any]) -> List[Tuple[str, str]]:
+        contact = prospect.get("contact") or {}
+        keys: List[Tuple[str, str]] = []
+
+        if "phone" in self.key_types:
+            phone = phone_key(contact.get("phone"), _country_of(prospect))
+            if phone:
+                keys.append(("phone", phone))
+
+        email = normalize_email(contact.get("email"))
+        if "email" in self.key_types and email:
+            keys.append(("email", email))
+
+        if "domain" in self.key_types:
+            domain = registrable_domain(contact.get("website"))
+            if not domain and email:
+                email_domain = email.rsplit("@", 1)[-1]
+                if email_domain not in FREE_EMAIL_DOMAINS:
+                    domain = registrable_domain(email_domain)
+            if domain and domain not in SHARED_HOST_DOMAINS:
+                keys.append(("domain", domain))
+
+        if "name" in self.key_types:
+            signature = name_signature(prospect.get("name"))
+            if signature:
+                # Same name in different countries is a different business
+                keys.append(("name", f"{_country_key(prospect)}|{signature}"))
+
+        return keys
+
+    @staticmethod
+    def _has_conflicting_identity(a: List[Tuple[str, str]], b: List[Tuple[str, str]]) -> bool:
+        """True when both records carry a phone or domain and those values differ."""
+        a_keys, b_keys = dict(a), dict(b)
+        return any(
+            a_keys.get(key_type) and b_keys.get(key_type) and a_keys[key_type] != b_keys[key_type]
+            for key_type in ("phone", "domain")
+        )
+
+    def _merge_name_block(
+        self,
+        members: List[int],
+        keys: List[List[Tuple[str, str]]],
+        union_find: UnionFind,
+    ) -> int:
+        """Merge same-name records unless their phones or domains conflict (e.g. two branches)."""
+        merges = 0
+        for position, member in enumerate(members[1:], start=1):
+            for earlier in members[:position]:
+                if not self._has_conflicting_identity(keys[member], keys[earlier]):
+                    if union_find.union(member, earlier):
+                        merges += 1
+                    break
+        return merges
+
+    def _merge_fuzzy_names(
+        self,
+        prospects: List[Dict[str, Any]],
+        keys: List[List[Tuple[str, str]]],
+        union_find: UnionFind,
+    ) -> int:
+        index = FuzzyNameIndex.from_config()
+        if index is None:
+            return 0
+        merges = 0
+        for i, prospect in enumerate(prospects):
+            name = prospect.get("name")
+            country = _country_key(prospect)
+            for j, _ in index.query(name):
+                other_country = _country_key(prospects[j])
+                if country and other_country and country != other_country:
+                    continue
+                if not self._has_conflicting_identity(keys[i], keys[j]) and union_find.union(i, j):
+                    merges += 1
+                    break
+            index.add(i, name)
+        return merges
+
+    @staticmethod
+    def _build_blocks(keys: List[List[Tuple[str, str]]]) -> Dict[Tuple[str, str], List[int]]:
+        blocks: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for index, prospect_keys in enumerate(keys):
+            for key in prospect_keys:
+                blocks[key].append(index)
+        return blocks
+
+    # ---------- Merging ----------
+    @staticmethod
+    def _merge_group(members: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build one canonical prospect; the most complete record supplies the primary fields."""
+        primary = max(members, key=calculate_points)
+        emails: List[str] = []
+        phones: List[str] = []
+        websites: List[str] = []
+        platforms: List[str] = []
+        about = primary.get("about")
+        location = dict(primary.get("location") or {})
+        business_context = primary.get("business_context")
+
+        for member in members:
+            contact = member.get("contact") or {}
+            for value, bucket in (
+                (contact.get("email"), emails),
+                (contact.get("phone"), phones),
+                (contact.get("website"), websites),
+                (member.get("source_platform"), platforms),
+            ):
+                if value and value not in bucket:
+                    bucket.append(value)
+            about = about or member.get("about")
+            business_context = business_context or member.get("business_context")
+            for key, value in (member.get("location") or {}).items():
+                if value and not location.get(key):
+                    location[key] = value
+
+        primary_contact = primary.get("contact") or {}
+        return {
+            "prospect_id": str(uuid.uuid4()),
+            "source_platform": primary.get("source_platform"),
+            "name": (primary.get("name") or "").strip(),
+            "about": about,
+            "contact": {
+                "email": primary_contact.get("email") or (emails[0] if emails else None),
+                "phone": primary_contact.get("phone") or (phones[0] if phones else None),
+                "website": primary_contact.get("website") or (websites[0] if websites else None),
+            },
+            "contacts": {
+                "emails": emails,
+                "phones": phones,
+                "websites": websites,
+            },
+            "location": location,
+            "business_context": business_context,
+            "source_platforms": platforms,
+            "source_count": len(members),
+        }
+
+    def process(self, raw_prospects: Any) -> Dict[str, Any]:
+        """
+        Deduplicate raw prospects
+
+        Args:
+            raw_prospects: List of raw prospects, or a dict of categorised lists
+                (individuals/businesses/articles) as written by lead sourcing
+
+        Returns:
+            Dict with `summary` (merge statistics), `prospects` (canonical prospects)
+            and `flags` (blocks skipped as too generic to merge on)
+        """
+        started_at = datetime.utcnow()
+        prospects = self._flatten(raw_prospects)
+        total = len(prospects)
+        union_find = UnionFind(total)
+        merges_by_key: Dict[str, int] = {key_type: 0 for key_type in self.key_types}
+        flags: List[Dict[str, Any]] = []
+
+        keys = [self.blocking_keys(prospect) for prospect in prospects]
+        for (key_type, key_value), members in self._build_blocks(keys).items():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_block_size:
+                flags.append({
+                    "type": "oversized_block",
+                    "key_type": key_type,
+                    "key": key_value,
+                    "size": len(members),
+                })
+                continue
+            if key_type == "name":
+                merges_by_key[key_type] += self._merge_name_block(members, keys, union_find)
+                continue
+            first = members[0]
+            for other in members[1:]:
+                if union_find.union(first, other):
+                    merges_by_key[key_type] += 1
+
+        if self.fuzzy_names:
+            merges_by_key["fuzzy_name"] = self._merge_fuzzy_names(prospects, keys, union_find)
+
+        canonical = [
+            self._merge_group([prospects[i] for i in indices])
+            for indices in union_find.groups().values()
+        ] if total else []
+
+        duplicates_merged = total - len(canonical)
+        summary = {
+            "raw_prospects_processed": total,
+            "canonical_prospects_created": len(canonical),
+            "duplicates_merged": duplicates_merged,
+            "merge_rate_percent": round(100.0 * duplicates_merged / total, 2) if total else 0.0,
+            "merges_by_key": merges_by_key,
+            "flagged_blocks": len(flags),
+            "processing_seconds": round((datetime.utcnow() - started_at).total_seconds(), 3),
+        }
+        logger.info(
+            "Deduplicated %d raw prospects into %d canonical prospects (%d merged, %.2f%%)",
+            total,
+            len(canonical),
+            duplicates_merged,
+            summary["merge_rate_percent"],
+        )
+
+        return {
+            "summary": summary,
+            "prospects": canonical,
+            "flags": flags,
+        }
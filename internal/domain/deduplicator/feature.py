@@ -8,7 +8,7 @@ Main entry point for the deduplication pipeline.
 import sys
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 
 _current = Path(__file__).resolve()
 for parent in _current.parents:
@@ -40,7 +40,7 @@ def entrypoint() -> Dict:
     # Load raw prospects
     try:
         with open(LEADS_SOURCED_PATH, 'r', encoding='utf-8') as f:
-            raw_prospects: List[Dict[str, Any]] = json.load(f)
+            raw_prospects: Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]] = json.load(f)
     except FileNotFoundError:
         logger.error("Raw prospects file not found: %s", LEADS_SOURCED_PATH)
         raise
@@ -48,7 +48,10 @@ def entrypoint() -> Dict:
         logger.error("Invalid JSON in raw prospects file: %s", e)
         raise
     
-    logger.info("Loaded %d raw prospects", len(raw_prospects))
+    if isinstance(raw_prospects, dict):
+        logger.info("Loaded %d raw prospects", sum(len(v or []) for v in raw_prospects.values()))
+    else:
+        logger.info("Loaded %d raw prospects", len(raw_prospects))
     
     # Process deduplication
     engine = DeduplicationEngine()
@@ -0,0 +1,280 @@
+"""
+Fuzzy prospect name matching with MinHash and LSH banding
+
+Names are normalized (case, punctuation, legal suffixes, trailing page titles,
+common abbreviations) and shingled into character n-grams. Location words are
+kept, so "Acme BDC in Lagos" and "Acme BDC in Abuja" stay distinct. Each
+name gets a MinHash signature which is split into bands; names sharing any band
+bucket become candidates and are verified with the exact shingle Jaccard
+similarity. Lookups only touch the colliding buckets, so they stay sublinear in
+the size of the index.
+
+Usage (checks that known near-duplicate pairs match at the default config):
+    python -m internal.domain.deduplicator.fuzzy
+"""
+
+import hashlib
+import random
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from internal.config.paths_config import FUNNEL_CONFIG_PATH
+from internal.utils.loader import load_yaml
+from internal.utils.logger import AppLogger
+
+logger = AppLogger("domain.deduplicator.fuzzy")()
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Multi-word phrases collapsed to a single canonical token before shingling
+NAME_ABBREVIATIONS = (
+    (re.compile(r"\bbureaux? de change\b"), "bdc"),
+    (re.compile(r"\bbureaus? de change\b"), "bdc"),
+    (re.compile(r"\bforeign exchange\b"), "fx"),
+    (re.compile(r"\bmicro ?finance bank\b"), "mfb"),
+    (re.compile(r"\bpublic limited company\b"), ""),
+    (re.compile(r"\band\b"), " "),
+)
+
+NAME_NOISE_TOKENS = {
+    "the", "of", "a", "an",
+    "ltd", "limited", "llc", "inc", "incorporated", "plc", "co", "company",
+    "corp", "corporation", "gmbh", "sa", "cif",
+    "in", "at",
+    "home", "homepage", "official", "website", "welcome",
+}
+
+# Search result titles: "Acme BDC - Home", "Acme | Contact us"
+_TITLE_SEPARATOR = re.compile(r"\s+[-|–—:]\s+")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Canonical form of a prospect name used for fuzzy comparison."""
+    if not name:
+        return ""
+    name = _TITLE_SEPARATOR.split(name.strip())[0].lower()
+    name = name.replace("&", " and ")
+    for pattern, replacement in NAME_ABBREVIATIONS:
+        name = pattern.sub(replacement, name)
+    tokens = [t for t in _NON_ALNUM.split(name) if t and t not in NAME_NOISE_TOKENS]
+    return " ".join(tokens)
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Character n-grams of the normalized name (padded so short names still shingle)."""
+    if not text:
+        return set()
+    padded = f" {text} "
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _stable_hash(shingle: str) -> int:
+    # Builtin hash() is salted per process; signatures must be reproducible.
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+# Candidates are verified with the exact Jaccard similarity, so a false positive
+# costs one comparison while a false negative lets a duplicate prospect through.
+FALSE_NEGATIVE_WEIGHT = 0.98
+
+# Pairs at or just above the default threshold that must match (see main)
+KNOWN_NEAR_DUPLICATES = (
+    ("RespectedFX Bureau de Change in Lagos", "RespectedFX BDC"),
+)
+
+
+def _integrate(f, start: float, end: float, steps: int = 100) -> float:
+    width = (end - start) / steps
+    return sum(f(start + (i + 0.5) * width) for i in range(steps)) * width
+
+
+@lru_cache(maxsize=32)
+def optimal_bands(
+    threshold: float,
+    num_perm: int,
+    false_negative_weight: float = FALSE_NEGATIVE_WEIGHT,
+) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows <= num_perm minimizing the weighted
+    false positive and false negative areas of the S-curve
+    1 - (1 - s ** rows) ** bands below and above the threshold. Putting the
+    curve's midpoint at the threshold would miss about half of the pairs
+    just above it.
+    """
+    best = (num_perm, 1)
+    best_error = float("inf")
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positives = _integrate(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+            false_negatives = _integrate(lambda s: (1 - s ** rows) ** bands, threshold, 1.0)
+            error = (1 - false_negative_weight) * false_positives + false_negative_weight * false_negatives
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class FuzzyNameIndex:
+    """MinHash/LSH index mapping keys (e.g. prospect ids) to names for near-duplicate lookup."""
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        num_perm: int = 64,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        """
+        Args:
+            threshold: Minimum shingle Jaccard similarity for two names to match
+            num_perm: MinHash signature length; higher is more accurate and slower
+            shingle_size: Character n-gram size
+            seed: Seed for the hash permutations (signatures are reproducible across runs)
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+        # Normalized names only contain [a-z0-9 ], so the shingle vocabulary is small and
+        # caching each shingle's permuted hashes turns signing into an element-wise min.
+        self._shingle_hashes: Dict[str, Tuple[int, ...]] = {}
+        self._buckets: List[Dict[Tuple[int, ...], Set[Hashable]]] = [{} for _ in range(self.bands)]
+        self._shingles: Dict[Hashable, Set[str]] = {}
+        self._names: Dict[Hashable, str] = {}
+
+    @classmethod
+    def from_config(cls, config_path=FUNNEL_CONFIG_PATH) -> Optional["FuzzyNameIndex"]:
+        """Build an index from `deduplication.fuzzy_name` in the funnel config; None when disabled."""
+        config = ((load_yaml(config_path) or {}).get("deduplication") or {}).get("fuzzy_name") or {}
+        if not config.get("enabled", False):
+            return None
+        return cls(
+            threshold=float(config.get("threshold", 0.7)),
+            num_perm=int(config.get("num_perm", 64)),
+            shingle_size=int(config.get("shingle_size", 3)),
+        )
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._shingles
+
+    def _permuted_hashes(self, shingle: str) -> Tuple[int, ...]:
+        hashes = self._shingle_hashes.get(shingle)
+        if hashes is None:
+            h = _stable_hash(shingle)
+            hashes = tuple(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for a, b in self._permutations)
+            self._shingle_hashes[shingle] = hashes
+        return hashes
+
+    def _signature(self, shingle_set: Set[str]) -> List[int]:
+        return list(map(min, zip(*(self._permuted_hashes(s) for s in shingle_set))))
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, ...]]:
+        rows = self.rows
+        return [tuple(signature[i * rows:(i + 1) * rows]) for i in range(self.bands)]
+
+    def add(self, key: Hashable, name: Optional[str]) -> bool:
+        """Index a name under `key`. Returns False if the name is empty after normalization."""
+        shingle_set = shingles(normalize_name(name), self.shingle_size)
+        if not shingle_set:
+            return False
+        if key in self._shingles:
+            self.remove(key)
+        for band, band_key in enumerate(self._band_keys(self._signature(shingle_set))):
+            self._buckets[band].setdefault(band_key, set()).add(key)
+        self._shingles[key] = shingle_set
+        self._names[key] = name
+        return True
+
+    def remove(self, key: Hashable) -> None:
+        shingle_set = self._shingles.pop(key, None)
+        self._names.pop(key, None)
+        if shingle_set is None:
+            return
+        for band, band_key in enumerate(self._band_keys(self._signature(shingle_set))):
+            bucket = self._buckets[band].get(band_key)
+            if bucket and key in bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def query(self, name: Optional[str], threshold: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """Keys whose names are near-duplicates of `name`, most similar first."""
+        shingle_set = shingles(normalize_name(name), self.shingle_size)
+        if not shingle_set:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        candidates: Set[Hashable] = set()
+        for band, band_key in enumerate(self._band_keys(self._signature(shingle_set))):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        matches = [
+            (key, similarity)
+            for key in candidates
+            if (similarity := jaccard(shingle_set, self._shingles[key])) >= threshold
+        ]
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def find_match(self, name: Optional[str]) -> Optional[Tuple[Hashable, float]]:
+        """Best near-duplicate of `name`, or None."""
+        matches = self.query(name)
+        return matches[0] if matches else None
+
+    def name_of(self, key: Hashable) -> Optional[str]:
+        return self._names.get(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "indexed_names": len(self),
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "rows": self.rows,
+        }
+
+
+def verify_known_near_duplicates() -> Dict[Tuple[str, str], Optional[float]]:
+    """Similarity of each KNOWN_NEAR_DUPLICATES pair found by a default index, None when it is missed."""
+    results: Dict[Tuple[str, str], Optional[float]] = {}
+    for name, duplicate in KNOWN_NEAR_DUPLICATES:
+        index = FuzzyNameIndex()
+        index.add(name, name)
+        match = index.find_match(duplicate)
+        results[(name, duplicate)] = match[1] if match else None
+    return results
+
+
+def main() -> int:
+    index = FuzzyNameIndex()
+    results = verify_known_near_duplicates()
+    for (name, duplicate), similarity in results.items():
+        if similarity is None:
+            logger.error("%r ~ %r: missed (%d bands x %d rows)", name, duplicate, index.bands, index.rows)
+        else:
+            logger.info("%r ~ %r: matched, similarity %.3f", name, duplicate, similarity)
+    return 0 if all(similarity is not None for similarity in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
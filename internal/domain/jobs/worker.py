@@ -0,0 +1,123 @@
+"""
+Job worker
+
+Runs jobs from the `jobs` table outside the web process (see worker.py at the
+repo root). Each worker executes one job at a time; run more worker processes
+to scale (concurrency_limits caps how many jobs of a kind run at once across
+all workers). While a job runs, a heartbeat thread renews its lease every
+lease_seconds / 3, so a long pipeline run keeps its job, and a job whose
+worker died is queued again once its lease expires. A handler that raises is
+retried with backoff until the job's max_attempts.
+"""
+
+import asyncio
+import inspect
+import socket
+import threading
+import traceback
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from internal.utils.database import get_session, DatabaseManager
+from internal.utils.logger import AppLogger
+
+logger = AppLogger("domain.jobs.worker")()
+
+JobHandler = Callable[[Dict[str, Any]], Any]
+
+
+class JobWorker:
+    """Claims and executes queued jobs until stopped"""
+
+    def __init__(
+        self,
+        handlers: Dict[str, JobHandler],
+        poll_interval: float = 2.0,
+        lease_seconds: int = 300,
+        retry_delay_seconds: int = 60,
+        worker_id: Optional[str] = None,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            handlers: Job kind -> handler(payload) returning a JSON-serialisable result
+                (async handlers are run with asyncio.run)
+            poll_interval: Seconds to wait when no job is ready
+            lease_seconds: A job not heartbeated for this long is given to another worker
+            retry_delay_seconds: Delay before the first retry (doubles per attempt)
+            worker_id: Lease owner name (default host:pid-style unique id)
+            concurrency_limits: Job kind -> maximum jobs of that kind running at once
+                across all workers (kinds not listed are unlimited)
+        """
+        self.handlers = handlers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{uuid.uuid4().hex[:8]}"
+        self.concurrency_limits = concurrency_limits or {}
+        self._stopping = threading.Event()
+
+    def stop(self) -> None:
+        """Stop after the current job (e.g. from a SIGTERM handler)."""
+        self._stopping.set()
+
+    def run(self) -> None:
+        logger.info("Worker %s started for jobs: %s", self.worker_id, ", ".join(self.handlers))
+        while not self._stopping.is_set():
+            if not self.run_once():
+                self._stopping.wait(self.poll_interval)
+        logger.info("Worker %s stopped", self.worker_id)
+
+    def run_once(self) -> bool:
+        """Claim and execute one ready job. Returns False when none was ready."""
+        with get_session() as session:
+            db_manager = DatabaseManager(session)
+            db_manager.requeue_expired_jobs(self.lease_seconds)
+            job = db_manager.claim_job(
+                self.worker_id, list(self.handlers), self.concurrency_limits
+            )
+        if job is None:
+            return False
+
+        logger.info("Running %s job %s (attempt %d)", job["kind"], job["job_id"], job["attempts"])
+        heartbeat_done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job["job_id"], heartbeat_done), daemon=True
+        )
+        heartbeat.start()
+        result, error = None, None
+        try:
+            result = self._execute(job)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.error("Job %s failed: %s\n%s", job["job_id"], error, traceback.format_exc())
+        finally:
+            heartbeat_done.set()
+            heartbeat.join()
+
+        with get_session() as session:
+            status = DatabaseManager(session).finish_job(
+                job["job_id"],
+                self.worker_id,
+                result=result if isinstance(result, dict) else {"value": result},
+                error=error,
+                retry_delay_seconds=self.retry_delay_seconds,
+            )
+        if status is None:
+            logger.warning("Job %s was taken over before it finished; outcome discarded", job["job_id"])
+        else:
+            logger.info("Job %s %s", job["job_id"], status)
+        return True
+
+    def _execute(self, job: Dict[str, Any]) -> Any:
+        handler = self.handlers[job["kind"]]
+        if inspect.iscoroutinefunction(handler):
+            return asyncio.run(handler(job["payload"]))
+        return handler(job["payload"])
+
+    def _heartbeat(self, job_id: str, done: threading.Event) -> None:
+        while not done.wait(self.lease_seconds / 3):
+            with get_session() as session:
+                if not DatabaseManager(session).renew_job_lease(job_id, self.worker_id):
+                    logger.warning("Lost lease on job %s", job_id)
+                    return
@@ -14,15 +14,14 @@ from internal.domain.brainbox.engine import (
 )
 from internal.domain.pipeline.helper import merge_prospects_info
     
+# Thread-based and stateless, so one instance serves every run and event loop
 scraper = WebsiteScraper(
     max_workers=8,
     max_tokens=100,
     enable_semantic_extraction=True,
 )
 
-web_searcher = WebSearcher()
-
-def augment_businesses(businesses: List[Prospect]) -> List[Prospect]:
+async def augment_businesses(businesses: List[Prospect]) -> List[Prospect]:
     if not businesses:
         return []
 
@@ -38,13 +37,11 @@ def augment_businesses(businesses: List[Prospect]) -> List[Prospect]:
     if not websites:
         return high_score
 
-    scraped = scraper.scrape_many(websites)
+    scraped = await asyncio.to_thread(scraper.scrape_many, websites)
     if not scraped:
         return high_score
 
-    evaluated: WebsiteScrapingOutput = asyncio.run(
-        evaluate_scraped_website(scraped)
-    )
+    evaluated: WebsiteScrapingOutput = await evaluate_scraped_website(scraped)
 
     enriched = [
         info
@@ -58,7 +55,7 @@ def augment_businesses(businesses: List[Prospect]) -> List[Prospect]:
     return merge_prospects_info(high_score, enriched)
 
 
-def augment_from_articles(articles: List[Prospect]) -> List[Prospect]:
+async def augment_from_articles(articles: List[Prospect], searcher: WebSearcher) -> List[Prospect]:
     if not articles:
         return []
 
@@ -71,19 +68,15 @@ def augment_from_articles(articles: List[Prospect]) -> List[Prospect]:
     if not websites:
         return []
 
-    scraped = scraper.scrape_many(websites)
+    scraped = await asyncio.to_thread(scraper.scrape_many, websites)
     if not scraped:
         return []
 
-    extraction_output: ArticleExtractionOutput = asyncio.run(
-        extract_leads_from_articles(scraped)
-    )
+    extraction_output: ArticleExtractionOutput = await extract_leads_from_articles(scraped)
 
-    business_prospects: List[Prospect] = asyncio.run(
-        web_searcher.source_from_google_places(
-            len(extraction_output.businesses),
-            extraction_output.businesses
-        )
+    business_prospects: List[Prospect] = await searcher.source_from_google_places(
+        len(extraction_output.businesses),
+        extraction_output.businesses
     )
 
     business_prospects = flatten_list(business_prospects)
@@ -91,41 +84,36 @@ def augment_from_articles(articles: List[Prospect]) -> List[Prospect]:
     leads: List[Prospect] = []
 
     if extraction_output.businesses:
-        business_prospects = augment_businesses(business_prospects)
+        business_prospects = await augment_businesses(business_prospects)
         leads.extend(business_prospects)
 
     return leads
 
+async def augment_leads(
+    businesses: List[Prospect], articles: List[Prospect], searcher: WebSearcher
+) -> List[Prospect]:
+    """Augmented leads from preprocessed business and article leads (both augmented concurrently)"""
+    from_businesses, from_articles = await asyncio.gather(
+        augment_businesses(businesses),
+        augment_from_articles(articles, searcher),
+    )
+    return from_businesses + from_articles
+
+
+async def _augment_sourced_leads(prospects: Dict[str, List[Prospect]]) -> List[Prospect]:
+    return await augment_leads(
+        prospects.get("businesses", []),
+        prospects.get("articles", []),
+        WebSearcher(),
+    )
+
+
 def trigger_leads_information_augmentation(
     sourced_leads_path: str,
     output_path: str,
 ) -> None:
     prospects: Dict[str, List[Prospect]] = load_json(sourced_leads_path)
 
-    augmented: List[Prospect] = []
-
-    augmented.extend(
-        augment_businesses(prospects.get("businesses", []))
-    )
-    augmented.extend(
-        augment_from_articles(prospects.get("articles", []))
-    )
+    augmented = asyncio.run(_augment_sourced_leads(prospects))
 
     export_to_json(augmented, output_path)
-
-
-
-
-
-                
-
-                
-
-            
-    
-    
-    
-    
-    
-    
-    
\ No newline at end of file
@@ -1,42 +1,57 @@
 import asyncio
+from typing import List, Optional
 
+from internal.domain.common.dto import LeadsPreprocessingOutput, Prospect
 from internal.domain.scraper.searcher import WebSearcher
 from internal.utils.loader import export_to_json, load_yaml
+from internal.utils.logger import AppLogger
 from internal.domain.brainbox.engine import (
-    generate_keywords, 
-    preprocess_leads, 
+    generate_keywords,
+    preprocess_leads,
 )
 from internal.config.paths_config import (FUNNEL_CONFIG_PATH)
 
-
-web_searcher = WebSearcher()
-
-def trigger_leads_sourcing(query: str, output_path: str):
-
-    config_file = load_yaml(FUNNEL_CONFIG_PATH)
+logger = AppLogger("domain.pipeline.ingestion")()
+
+
+def flatten_search_results(results: list) -> List[Prospect]:
+    """
+    Flatten search_for_prospects output (per source, per keyword lists of prospects)
+    into one list; a source that raised is logged and skipped.
+    """
+    prospects: List[Prospect] = []
+    for source_results in results or []:
+        if isinstance(source_results, BaseException):
+            logger.error("Prospect source failed: %s", source_results)
+            continue
+        for keyword_results in source_results or []:
+            prospects.extend(keyword_results or [])
+    return prospects
+
+
+async def source_raw_prospects(
+    query: str, searcher: WebSearcher, config: Optional[dict] = None
+) -> List[Prospect]:
+    """Search every source for prospects matching `query` (before LLM preprocessing)."""
+    config_file = config if config is not None else load_yaml(FUNNEL_CONFIG_PATH)
     scrape_params = config_file.get("raw_prospect_ingestion").get("scrape")
     batch_size = scrape_params.get("batch_size", 50)
-    keywords = generate_keywords(query)
-    raw_prospects = asyncio.run(web_searcher.search_for_prospects(keywords, batch_size))
-    processed_leads = asyncio.run(preprocess_leads(raw_prospects))
-    export_to_json(processed_leads.model_dump(), output_path)
-    
-
+    keywords = await generate_keywords(query)
+    results = await searcher.search_for_prospects(keywords, batch_size)
+    return flatten_search_results(results)
 
 
+async def source_leads(query: str, config: Optional[dict] = None) -> LeadsPreprocessingOutput:
+    """Sourced and preprocessed leads for `query`, in one event loop."""
+    raw_prospects = await source_raw_prospects(query, WebSearcher(), config)
+    return await preprocess_leads(raw_prospects)
 
 
-
-
-                
-
-                
-
-            
-    
-    
-    
-    
-    
-    
-    
\ No newline at end of file
+def trigger_leads_sourcing(query: str, output_path: str, config: Optional[dict] = None):
+    """
+    Search for prospects matching `query` and write the preprocessed leads to output_path.
+    `config` is the funnel config to run with (a run workspace's snapshot); loaded
+    from FUNNEL_CONFIG_PATH when omitted.
+    """
+    processed_leads = asyncio.run(source_leads(query, config))
+    export_to_json(processed_leads.model_dump(), output_path)
@@ -4,7 +4,7 @@ Loader script to insert deduplication results into PostgreSQL database using SQL
 
 import json
 import uuid
-from typing import Dict, List, Optional, TypedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TypedDict, Union
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -23,14 +23,19 @@ from internal.utils.logger import AppLogger
 from internal.config.paths_config import (
     LEADS_AUGMENTED_PATH,
     DB_MODELS_TEMP_DIR,
+    FUNNEL_CONFIG_PATH,
 )
 
-from sqlalchemy import or_
+from sqlalchemy import or_, func
 from sqlalchemy.orm import Session
 
 from internal.utils.database.models import Prospect
 from internal.domain.pipeline.helper import filter_and_prepare_leads
-from internal.utils.database import get_session, init_db
+from internal.domain.deduplicator.engine import registrable_domain
+from internal.domain.deduplicator.fuzzy import FuzzyNameIndex
+from internal.utils.normalizer import normalize_email, normalize_phone
+from internal.utils.database import get_session, init_db, DatabaseManager
+from internal.utils.database.manager import prospect_country_key
 
 logger = AppLogger("domain.pipeline.loader")()
 
@@ -96,48 +101,31 @@ def export_enriched_leads_to_json(
                 )
                 continue
 
-            prospect_id = str(uuid.uuid4())
-            prepared_lead["prospect_id"] = prospect_id
-            contact = prepared_lead.get("contact", {})  
-            location = prepared_lead.get("location", {})
-            email = contact.get("email")
-            phone = contact.get("phone")
-            website = contact.get("website")
-            emails = email if email else None
-            phones = phone if phone else None
-            websites = website if website else None
-            
-            country = location.get("country", None)
-            country_acronym = location.get("country_acronym") or location.get("country_code")
-            address = location.get("address", None)
-
-            created_at = datetime.utcnow()
-
-            prospect = Prospect(
-                prospect_id=prospect_id,
-                name=prepared_lead.get("name", ""),
-                about=prepared_lead.get("about", None),
-                platforms=prepared_lead.get("source_platform"),
-                emails=emails,
-                phones=phones,
-                websites=websites,
-                country=country,
-                country_acronym=country_acronym,
-                address=address,
-                business_context=prepared_lead.get("business_context", None),
-                has_phone=prepared_lead.get("has_phone", False),
-                has_email=prepared_lead.get("has_email", False),
-                created_at=created_at,
-            )
+            row = build_prospect_row(prepared_lead)
+            prospect_id = row["prospect_id"]
+            prospect = Prospect(**row)
 
             write_model_to_json(prospect, "prospect", prospect_id, output_dir)
 
         except Exception as e:
             logger.error(f"Error processing prospect: {str(e)}")
 
+def _as_list(values: Union[str, Iterable[Optional[str]], None]) -> List[str]:
+    if not values:
+        return []
+    if isinstance(values, str):
+        return [values]
+    return [value for value in values if value]
+
+
+def _unique_values(values: Iterable[Optional[str]]) -> List[str]:
+    """Non-empty values in first-seen order."""
+    return list(dict.fromkeys(value for value in values if value))
+
+
 def find_existing_prospect(
-    phones: Optional[str] = None,
-    emails: Optional[str] = None,
+    phones: Union[str, List[str], None] = None,
+    emails: Union[str, List[str], None] = None,
     name: Optional[str] = None,
     session: Optional[Session] = None,
 ) -> Optional[Prospect]:
@@ -146,8 +134,8 @@ def find_existing_prospect(
     Returns the existing Prospect if found, else None.
 
     Args:
-        phones: Normalized phone string (e.g. +234...).
-        emails: Normalized email string.
+        phones: Normalized phone(s) (e.g. +234...); matches any stored phone of a prospect.
+        emails: Normalized email(s); matches any stored email of a prospect.
         name: Prospect name (trimmed).
         session: Optional DB session. If None, opens and closes one.
 
@@ -155,12 +143,15 @@ def find_existing_prospect(
         Existing Prospect instance or None.
     """
     conditions = []
+    phones, emails = _as_list(phones), _as_list(emails)
+    # Array overlap (&&) is served by the GIN contact indexes
     if phones:
-        conditions.append(Prospect.phones == phones)
+        conditions.append(Prospect.phones.overlap(phones))
     if emails:
-        conditions.append(Prospect.emails == emails)
+        conditions.append(Prospect.emails.overlap(emails))
     if name:
-        conditions.append(Prospect.name == name)
+        # Same expression as the idx_prospects_name_key index
+        conditions.append(func.lower(func.btrim(Prospect.name)) == name.strip().lower())
     if not conditions:
         return None
 
@@ -172,110 +163,360 @@ def find_existing_prospect(
     with get_session() as sess:
         return query(sess)
 
+def _identity_name(name: Optional[str]) -> Optional[str]:
+    """Name key matching the SQL expression lower(trim(name))."""
+    name = (name or "").strip().lower()
+    return name or None
+
+
+class ProspectIdentityIndex:
+    """
+    In-memory sets of the identity keys (phone, email, name) of stored prospects.
+
+    Loaded with a few overlap/IN queries for the candidate batch instead of one
+    find_existing_prospect query per lead; inserted leads are added so that
+    duplicates within the batch are caught as well. Every contact of a stored
+    prospect counts, not only the primary one.
+    """
+
+    QUERY_CHUNK_SIZE = 1000
+
+    def __init__(self):
+        self.phones: Set[str] = set()
+        self.emails: Set[str] = set()
+        self.names: Set[str] = set()
+
+    @classmethod
+    def load(
+        cls,
+        session: Session,
+        phones: Iterable[Optional[str]] = (),
+        emails: Iterable[Optional[str]] = (),
+        names: Iterable[Optional[str]] = (),
+    ) -> "ProspectIdentityIndex":
+        index = cls()
+        for column, candidates, bucket in (
+            (Prospect.phones, {p for p in phones if p}, index.phones),
+            (Prospect.emails, {e for e in emails if e}, index.emails),
+        ):
+            candidates = sorted(candidates)
+            for i in range(0, len(candidates), cls.QUERY_CHUNK_SIZE):
+                chunk = candidates[i:i + cls.QUERY_CHUNK_SIZE]
+                for (stored,) in session.query(column).filter(column.overlap(chunk)):
+                    bucket.update(value for value in stored if value)
+
+        name_column = func.lower(func.trim(Prospect.name))
+        candidates = sorted({n for n in map(_identity_name, names) if n})
+        for i in range(0, len(candidates), cls.QUERY_CHUNK_SIZE):
+            chunk = candidates[i:i + cls.QUERY_CHUNK_SIZE]
+            for (value,) in session.query(name_column).filter(name_column.in_(chunk)).distinct():
+                if value:
+                    index.names.add(_identity_name(value))
+        logger.info(
+            "Loaded identity index: %d phones, %d emails, %d names already stored",
+            len(index.phones),
+            len(index.emails),
+            len(index.names),
+        )
+        return index
+
+    def match(self, phones: Iterable[str], emails: Iterable[str], name: Optional[str]) -> Optional[str]:
+        """Return the identity key type that already exists ('phone', 'email' or 'name'), else None."""
+        if not self.phones.isdisjoint(_as_list(phones)):
+            return "phone"
+        if not self.emails.isdisjoint(_as_list(emails)):
+            return "email"
+        name = _identity_name(name)
+        if name and name in self.names:
+            return "name"
+        return None
+
+    def add(self, phones: Iterable[str], emails: Iterable[str], name: Optional[str]) -> None:
+        self.phones.update(_as_list(phones))
+        self.emails.update(_as_list(emails))
+        name = _identity_name(name)
+        if name:
+            self.names.add(name)
+
+
+def _contact_identity(phones: Iterable[str], emails: Iterable[str], websites: Iterable[str]) -> Dict[str, Set[str]]:
+    return {
+        "phones": {phone for phone in phones or [] if phone},
+        "emails": {email.lower() for email in emails or [] if email},
+        "domains": {domain for domain in map(registrable_domain, websites or []) if domain},
+    }
+
+
+def _conflicting_contacts(a: Dict[str, Set[str]], b: Dict[str, Set[str]]) -> bool:
+    """True when both prospects list phones, emails or website domains and none are shared"""
+    return any(a[kind] and b[kind] and not a[kind] & b[kind] for kind in ("phones", "emails", "domains"))
+
+
+class FuzzyDuplicateIndex:
+    """
+    Near-duplicate name lookup over stored and just-loaded prospects, scoped by
+    country. A country's stored names are indexed the first time a lead from that
+    country is checked, so a run only scans the countries it loads. A similar name
+    only makes a lead a duplicate when no phone, email or website domain conflicts
+    (e.g. two branches with the same name but different numbers are both kept).
+    """
+
+    def __init__(self, config_path=FUNNEL_CONFIG_PATH):
+        self.config_path = config_path
+        self._indexes: Dict[str, FuzzyNameIndex] = {}
+        self._identities: Dict[str, Dict[str, Set[str]]] = {}
+
+    @classmethod
+    def from_config(cls, config_path=FUNNEL_CONFIG_PATH) -> Optional["FuzzyDuplicateIndex"]:
+        """None when fuzzy name matching is disabled in the funnel config"""
+        if FuzzyNameIndex.from_config(config_path) is None:
+            return None
+        return cls(config_path)
+
+    def _index_for(self, session: Session, country: str) -> FuzzyNameIndex:
+        index = self._indexes.get(country)
+        if index is not None:
+            return index
+        index = FuzzyNameIndex.from_config(self.config_path)
+        stored = session.query(
+            Prospect.prospect_id, Prospect.name, Prospect.phones, Prospect.emails, Prospect.websites
+        ).filter(prospect_country_key() == country)
+        for prospect_id, name, phones, emails, websites in stored:
+            if index.add(prospect_id, name):
+                self._identities[prospect_id] = _contact_identity(phones, emails, websites)
+        logger.info("Indexed %d existing prospect names in country '%s' for fuzzy matching", len(index), country)
+        self._indexes[country] = index
+        return index
+
+    @staticmethod
+    def _country(row: Dict) -> str:
+        return (row.get("country_acronym") or "").strip().upper()
+
+    def find_duplicate(self, session: Session, row: Dict) -> Optional[Tuple[str, str, float]]:
+        """(prospect_id, name, similarity) of a stored prospect `row` duplicates, or None"""
+        index = self._index_for(session, self._country(row))
+        identity = _contact_identity(row["phones"], row["emails"], row["websites"])
+        for prospect_id, similarity in index.query(row["name"]):
+            if not _conflicting_contacts(identity, self._identities[prospect_id]):
+                return prospect_id, index.name_of(prospect_id), similarity
+        return None
+
+    def add(self, session: Session, row: Dict) -> None:
+        index = self._index_for(session, self._country(row))
+        if index.add(row["prospect_id"], row["name"]):
+            self._identities[row["prospect_id"]] = _contact_identity(row["phones"], row["emails"], row["websites"])
+
+
+def build_prospect_row(prepared_lead: Dict) -> Dict:
+    """
+    Map a prepared lead (see filter_and_prepare_leads) to Prospect column values.
+
+    The normalized primary contact comes first in each contact list, followed by
+    any extra contacts merged in by the deduplication engine (`contacts`).
+    """
+    contact = prepared_lead.get("contact", {})
+    contacts = prepared_lead.get("contacts") or {}
+    location = prepared_lead.get("location", {})
+    country_acronym = location.get("country_acronym") or location.get("country_code")
+    return {
+        "prospect_id": str(uuid.uuid4()),
+        "name": prepared_lead.get("name", ""),
+        "about": prepared_lead.get("about", None),
+        "platforms": _unique_values([
+            prepared_lead.get("source_platform"),
+            *(prepared_lead.get("source_platforms") or []),
+        ]),
+        "emails": _unique_values([
+            contact.get("email"),
+            *(normalize_email(email) for email in contacts.get("emails") or []),
+        ]),
+        "phones": _unique_values([
+            contact.get("phone"),
+            *(normalize_phone(phone, country_acronym) for phone in contacts.get("phones") or []),
+        ]),
+        "websites": _unique_values([contact.get("website"), *(contacts.get("websites") or [])]),
+        "country": location.get("country", None),
+        "country_acronym": country_acronym,
+        "address": location.get("address", None),
+        "business_context": prepared_lead.get("business_context", None),
+        "has_phone": prepared_lead.get("has_phone", False),
+        "has_email": prepared_lead.get("has_email", False),
+        "created_at": datetime.utcnow(),
+    }
+
+
 def persist_enriched_leads_to_database(
-leads_file_path: str 
+leads_file_path: str,
+bulk: bool = True,
+config_path=FUNNEL_CONFIG_PATH,
 ) -> Dict:
     """
     Load enriched leads from a results file and insert them into the database.
     Uses the same data preparation as export_enriched_leads_to_json.
+
+    Args:
+        leads_file_path: Path to the augmented leads JSON
+        bulk: Write with batched INSERT ... ON CONFLICT DO NOTHING (inserted/skipped
+            counts come from the database). When False, rows are added one by one
+            through the ORM. Either way, leads matching a stored or earlier lead on
+            any phone, email or name are skipped first (ProspectIdentityIndex); the
+            unique identity indexes, when present, only back that up against
+            concurrent loads.
+        config_path: Funnel config for fuzzy name matching (a run workspace's snapshot)
     """
     if leads_file_path is None:
         leads_file_path = str(LEADS_AUGMENTED_PATH)
 
-    logger.info("Initializing database tables...")
-    init_db(drop_existing=False)
-
     logger.info("Loading enrichment results from %s", leads_file_path)
     with open(leads_file_path, "r", encoding="utf-8") as f:
         prospects = json.load(f)
 
-    logger.info("Processing %d prospects for database insertion", len(prospects))
+    return persist_enriched_lead_batches([prospects], bulk, config_path)
 
-    stats: Dict = {
-        "prospects_inserted": 0,
-        "skipped_duplicates": 0,
-        "errors": [],
-    }
 
-    with get_session() as session:
-        for prospect in prospects:
-            try:
-                prepared_lead = filter_and_prepare_leads(prospect)
-                if not prepared_lead:
-                    continue
+def persist_enriched_lead_batches(
+    batches: Iterable[List[Dict]],
+    bulk: bool = True,
+    config_path=FUNNEL_CONFIG_PATH,
+) -> Dict:
+    """
+    Insert enriched leads batch by batch as they are produced (see EnrichedLeadWriter).
+    See persist_enriched_leads_to_database for `bulk` and `config_path`.
+    """
+    writer = EnrichedLeadWriter(bulk, config_path)
+    for prospects in batches:
+        writer.write(prospects)
+    return writer.finish()
 
-                contact = prepared_lead.get("contact", {})
-                location = prepared_lead.get("location", {})
 
-                email = contact.get("email")
-                phone = contact.get("phone")
-                website = contact.get("website")
+class EnrichedLeadWriter:
+    """
+    Writes enriched leads to the database one batch at a time (e.g. from the
+    streaming pipeline). Each batch is committed in its own session, so leads
+    reach the database while later batches are still being augmented; the fuzzy
+    duplicate index spans all of them. Blocking:
+    async callers run write/finish in a thread.
+    """
 
-                emails = email if email else None
-                phones = phone if phone else None
-                websites = website if website else None
+    def __init__(self, bulk: bool = True, config_path=FUNNEL_CONFIG_PATH):
+        logger.info("Initializing database tables...")
+        init_db(drop_existing=False)
+        self.bulk = bulk
+        self.config_path = config_path
+        self.stats: Dict = {
+            "prospects_inserted": 0,
+            "skipped_duplicates": 0,
+            "errors": [],
+        }
+        self._fuzzy_index = FuzzyDuplicateIndex.from_config(config_path)
+
+    def write(self, prospects: List[Dict]) -> None:
+        logger.info("Processing %d prospects for database insertion", len(prospects))
+        with get_session() as session:
+            _persist_batch(session, prospects, self.bulk, self._fuzzy_index, self.stats)
+
+    def finish(self) -> Dict:
+        """Rank the new prospects for dialing and return the load stats."""
+        stats = self.stats
+        if stats["prospects_inserted"]:
+            with get_session() as session:
+                DatabaseManager(session).refresh_priority_scores()
+
+        logger.info(
+            "Database save complete: %d inserted, %d duplicates skipped, %d errors",
+            stats["prospects_inserted"],
+            stats["skipped_duplicates"],
+            len(stats["errors"]),
+        )
+        if stats["errors"]:
+            logger.warning("Encountered %d errors during database save", len(stats["errors"]))
 
-                name = prepared_lead.get("name", "").strip()
+        return stats
 
-                existing = find_existing_prospect(
-                    phones=phones,
-                    emails=emails,
-                    name=name,
-                    session=session,
+
+def _persist_batch(
+    session: Session,
+    prospects: List[Dict],
+    bulk: bool,
+    fuzzy_index: Optional[FuzzyDuplicateIndex],
+    stats: Dict,
+) -> None:
+    """Prepare, deduplicate and insert one batch of enriched leads, adding to `stats`"""
+    rows = []
+    for prospect in prospects:
+        try:
+            prepared_lead = filter_and_prepare_leads(prospect)
+            if prepared_lead:
+                rows.append(build_prospect_row(prepared_lead))
+        except Exception as e:
+            error_msg = f"Error processing prospect: {str(e)}"
+            logger.error(error_msg)
+            stats["errors"].append(error_msg)
+
+    identity_index = ProspectIdentityIndex.load(
+        session,
+        phones=[phone for row in rows for phone in row["phones"]],
+        emails=[email for row in rows for email in row["emails"]],
+        names=[row["name"] for row in rows],
+    )
+
+    pending_rows = []
+    for row in rows:
+        try:
+            name = (row["name"] or "").strip()
+
+            matched_on = identity_index.match(row["phones"], row["emails"], name)
+            if matched_on:
+                stats["skipped_duplicates"] += 1
+                logger.debug(
+                    "Skipping duplicate: %s (matched existing prospect on %s)",
+                    name or ", ".join(row["phones"] + row["emails"]),
+                    matched_on,
                 )
-                if existing:
-                    stats["skipped_duplicates"] += 1
-                    logger.debug(
-                        "Skipping duplicate: %s (existing prospect_id=%s)",
-                        name or phones or emails,
-                        existing.prospect_id,
-                    )
-                    continue
-
-                prospect_id = str(uuid.uuid4())
-                prepared_lead["prospect_id"] = prospect_id
-
-                country = location.get("country", None)
-                country_acronym = location.get("country_acronym") or location.get("country_code")
-                address = location.get("address", None)
-
-                created_at = datetime.utcnow()
-
-                db_prospect = Prospect(
-                    prospect_id=prospect_id,
-                    name=prepared_lead.get("name", ""),
-                    about=prepared_lead.get("about", None),
-                    platforms=prepared_lead.get("source_platform"),
-                    emails=emails,
-                    phones=phones,
-                    websites=websites,
-                    country=country,
-                    country_acronym=country_acronym,
-                    address=address,
-                    business_context=prepared_lead.get("business_context", None),
-                    has_phone=prepared_lead.get("has_phone", False),
-                    has_email=prepared_lead.get("has_email", False),
-                    created_at=created_at,
+                continue
+
+            fuzzy_match = fuzzy_index.find_duplicate(session, row) if fuzzy_index is not None else None
+            if fuzzy_match:
+                stats["skipped_duplicates"] += 1
+                logger.debug(
+                    "Skipping near-duplicate name: %s ~ %s (existing prospect_id=%s, similarity=%.2f)",
+                    name,
+                    fuzzy_match[1],
+                    fuzzy_match[0],
+                    fuzzy_match[2],
                 )
-                session.add(db_prospect)
-                stats["prospects_inserted"] += 1
-                logger.debug("Created prospect %s", prospect_id)
-
-            except Exception as e:
-                error_msg = f"Error processing prospect: {str(e)}"
-                logger.error(error_msg)
-                stats["errors"].append(error_msg)
-
-    logger.info(
-        "Database save complete: %d inserted, %d duplicates skipped, %d errors",
-        stats["prospects_inserted"],
-        stats["skipped_duplicates"],
-        len(stats["errors"]),
-    )
-    if stats["errors"]:
-        logger.warning("Encountered %d errors during database save", len(stats["errors"]))
+                continue
+
+            if fuzzy_index is not None:
+                fuzzy_index.add(session, row)
+            # Later leads in this batch are checked against this one too,
+            # secondary contacts included
+            identity_index.add(row["phones"], row["emails"], name)
+
+            if bulk:
+                pending_rows.append(row)
+                continue
+
+            session.add(Prospect(**row))
+            stats["prospects_inserted"] += 1
+            logger.debug("Created prospect %s", row["prospect_id"])
+
+        except Exception as e:
+            error_msg = f"Error processing prospect: {str(e)}"
+            logger.error(error_msg)
+            stats["errors"].append(error_msg)
+
+    if pending_rows:
+        try:
+            result = DatabaseManager(session).bulk_insert_prospects(pending_rows)
+            stats["prospects_inserted"] += result["inserted"]
+            stats["skipped_duplicates"] += result["skipped"]
+        except Exception as e:
+            session.rollback()
+            error_msg = f"Error bulk inserting {len(pending_rows)} prospects: {str(e)}"
+            logger.error(error_msg)
+            stats["errors"].append(error_msg)
 
-    return stats
 
 def main():
     """Main entry point for loading deduplication results."""
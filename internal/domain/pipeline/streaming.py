@@ -0,0 +1,145 @@
+"""
+Streaming acquisition pipeline
+
+Stages are async generators over batches of leads and run in one event loop:
+sourced leads are cut into `pipeline.batch_size` batches, and each batch is
+preprocessed, augmented and loaded. Nothing is written to or re-read from JSON
+between stages. Stages are joined by one-batch buffers, so while one batch is
+augmented the next is preprocessed and the previous one is loaded, and memory
+stays bounded by a few batches. The first leads reach the database after one
+batch instead of after the whole run. Sourcing is the exception: the searches
+return all raw results at once (their volume is bounded by keywords x the
+per-keyword result limit).
+
+One WebSearcher is created per run, inside its loop, so sourcing and the
+Places lookups of article augmentation share its request semaphore; the LLM
+clients are cached per model in brainbox.engine, which picks the models from
+the run's config snapshot (use_brainbox_config).
+
+With `pipeline.artifact_taps` enabled, the records passing through are also
+appended to JSONL files in the run workspace for debugging; the stages never
+read them back.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, TypeVar
+
+from internal.domain.brainbox.engine import chunk_list, lead_sort_key, preprocess_leads
+from internal.domain.common.dto import LeadsPreprocessingOutput, Prospect
+from internal.domain.pipeline.augmentation import augment_leads
+from internal.domain.pipeline.ingestion import source_raw_prospects
+from internal.domain.pipeline.loader import EnrichedLeadWriter
+from internal.domain.pipeline.workspace import PipelineWorkspace
+from internal.domain.scraper.searcher import WebSearcher
+from internal.utils.logger import AppLogger
+
+logger = AppLogger("domain.pipeline.streaming")()
+
+DEFAULT_BATCH_SIZE = 50
+
+ProspectBatches = AsyncIterator[List[Prospect]]
+Batch = TypeVar("Batch")
+
+
+async def source_stage(
+    query: str, searcher: WebSearcher, config: Dict[str, Any], batch_size: int = DEFAULT_BATCH_SIZE
+) -> ProspectBatches:
+    """Raw prospects for `query` in batches, sorted so likely duplicates share a batch."""
+    raw_prospects = await source_raw_prospects(query, searcher, config)
+    logger.info("Sourced %d raw prospects", len(raw_prospects))
+    for batch in chunk_list(sorted(raw_prospects, key=lead_sort_key), batch_size):
+        yield batch
+
+
+async def preprocess_stage(batches: AsyncIterable[List[Prospect]]) -> AsyncIterator[LeadsPreprocessingOutput]:
+    """Classify each batch of raw prospects into individuals, businesses and articles."""
+    async for batch in batches:
+        yield await preprocess_leads(batch)
+
+
+async def augment_stage(
+    batches: AsyncIterable[LeadsPreprocessingOutput], searcher: WebSearcher
+) -> ProspectBatches:
+    """Augmented leads of each preprocessed batch (batches with none are dropped)."""
+    async for batch in batches:
+        augmented = await augment_leads(batch.businesses, batch.articles, searcher)
+        if augmented:
+            yield augmented
+
+
+async def buffered(batches: AsyncIterable[Batch], size: int = 1) -> AsyncIterator[Batch]:
+    """
+    Run `batches` ahead in its own task, up to `size` batches ahead of the consumer,
+    so consecutive stages overlap. An error in the producer is raised to the consumer.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+
+    async def produce() -> None:
+        async for batch in batches:
+            await queue.put(batch)
+
+    producer = asyncio.create_task(produce())
+    get = None
+    try:
+        while True:
+            get = asyncio.ensure_future(queue.get())
+            await asyncio.wait({get, producer}, return_when=asyncio.FIRST_COMPLETED)
+            if get.done():
+                yield get.result()
+                continue
+            # Producer finished: hand over what it queued, then surface its error
+            get.cancel()
+            while not queue.empty():
+                yield queue.get_nowait()
+            producer.result()
+            return
+    finally:
+        if get is not None:
+            get.cancel()
+        producer.cancel()
+
+
+def classified_leads(batch: LeadsPreprocessingOutput) -> List[Dict[str, Any]]:
+    """Preprocessed leads flattened to records tagged with their category (for taps)."""
+    return [
+        {"category": category, **lead}
+        for category, leads in batch.model_dump().items()
+        for lead in leads
+    ]
+
+
+async def tap(
+    batches: AsyncIterable[Batch],
+    path: Path,
+    records: Callable[[Batch], Iterable[Dict[str, Any]]] = list,
+) -> AsyncIterator[Batch]:
+    """Pass batches through unchanged, appending their records to `path` as JSON lines."""
+    with open(path, "a", encoding="utf-8") as f:
+        async for batch in batches:
+            for record in records(batch):
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            f.flush()
+            yield batch
+
+
+async def run_streaming_pipeline(query: str, workspace: PipelineWorkspace) -> Dict:
+    """Source, preprocess, augment and load leads for `query` batch by batch. Returns load stats."""
+    pipeline_config = workspace.config.get("pipeline") or {}
+    batch_size = int(pipeline_config.get("batch_size", DEFAULT_BATCH_SIZE))
+    taps = bool(pipeline_config.get("artifact_taps", False))
+    searcher = WebSearcher()
+
+    preprocessed = preprocess_stage(source_stage(query, searcher, workspace.config, batch_size))
+    if taps:
+        preprocessed = tap(preprocessed, workspace.tap_path("leads_sourced"), classified_leads)
+
+    augmented = augment_stage(buffered(preprocessed), searcher)
+    if taps:
+        augmented = tap(augmented, workspace.tap_path("leads_augmented"))
+
+    writer = await asyncio.to_thread(EnrichedLeadWriter, config_path=workspace.config_path)
+    async for batch in buffered(augmented):
+        await asyncio.to_thread(writer.write, batch)
+    return await asyncio.to_thread(writer.finish)
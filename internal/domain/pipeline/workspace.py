@@ -0,0 +1,136 @@
+"""
+Per-run pipeline workspaces
+
+Every acquisition pipeline run gets its own directory under
+artifacts/runs/<run_id> holding its intermediate files (sourced and augmented
+leads in files mode, optional JSONL taps in streaming mode), a snapshot of the
+funnel config it ran with and a run.json manifest,
+so overlapping runs never read or overwrite each other's artifacts. The
+stages take their paths and config from the workspace instead of the fixed
+paths in paths_config, and the LLM calls of the run use the snapshot's
+brainbox section.
+
+Finished workspaces beyond the newest `keep` are deleted when a new one is
+created; a run that has not finished is never pruned.
+"""
+
+import json
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import yaml
+
+from internal.config.paths_config import FUNNEL_CONFIG_PATH, PIPELINE_RUNS_DIR
+from internal.utils.loader import load_yaml
+from internal.utils.logger import AppLogger
+
+logger = AppLogger("domain.pipeline.workspace")()
+
+MANIFEST_FILE = "run.json"
+CONFIG_SNAPSHOT_FILE = "funnel_config.yaml"
+
+
+@dataclass
+class PipelineWorkspace:
+    """Isolated artifacts directory and config snapshot of one pipeline run"""
+
+    run_id: str
+    directory: Path
+    config: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def sourced_path(self) -> Path:
+        return self.directory / "leads_sourced.json"
+
+    @property
+    def augmented_path(self) -> Path:
+        return self.directory / "leads_augmented.json"
+
+    def tap_path(self, name: str) -> Path:
+        """JSONL file a streaming stage's records are tapped to"""
+        return self.directory / f"{name}.jsonl"
+
+    @property
+    def config_path(self) -> Path:
+        return self.directory / CONFIG_SNAPSHOT_FILE
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_FILE
+
+    @classmethod
+    def create(
+        cls,
+        query: str,
+        run_id: Optional[str] = None,
+        root: Path = PIPELINE_RUNS_DIR,
+        keep: Optional[int] = None,
+    ) -> "PipelineWorkspace":
+        """
+        Create the run directory, snapshot the funnel config into it and write the manifest.
+
+        Args:
+            query: Pipeline query (recorded in the manifest)
+            run_id: Run id (default a new uuid); also names the directory
+            root: Parent directory of all run workspaces
+            keep: Finished workspaces to keep; older ones are deleted (None keeps all)
+        """
+        run_id = run_id or str(uuid.uuid4())
+        directory = Path(root) / run_id
+        directory.mkdir(parents=True, exist_ok=False)
+
+        config = load_yaml(FUNNEL_CONFIG_PATH)
+        workspace = cls(run_id=run_id, directory=directory, config=config)
+        with open(workspace.config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f, sort_keys=False)
+        workspace._write_manifest({
+            "run_id": run_id,
+            "query": query,
+            "started_at": time.time(),
+            "finished_at": None,
+        })
+        logger.info("Created pipeline workspace %s", directory)
+
+        if keep is not None:
+            prune_workspaces(root, keep)
+        return workspace
+
+    def finish(self, **summary: Any) -> None:
+        """Mark the run finished (makes the workspace eligible for pruning) and record its summary."""
+        manifest = self.read_manifest()
+        manifest.update(summary, finished_at=time.time())
+        self._write_manifest(manifest)
+
+    def read_manifest(self) -> Dict[str, Any]:
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, default=str)
+
+
+def prune_workspaces(root: Path = PIPELINE_RUNS_DIR, keep: int = 50) -> int:
+    """Delete finished workspaces beyond the newest `keep`. Returns how many were deleted."""
+    finished = []
+    for directory in Path(root).iterdir() if Path(root).exists() else []:
+        try:
+            with open(directory / MANIFEST_FILE, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if manifest.get("finished_at"):
+            finished.append((manifest["finished_at"], directory))
+
+    finished.sort(reverse=True)
+    pruned = 0
+    for _, directory in finished[max(keep, 0):]:
+        shutil.rmtree(directory, ignore_errors=True)
+        pruned += 1
+    if pruned:
+        logger.info("Pruned %d old pipeline workspaces", pruned)
+    return pruned
@@ -2,7 +2,6 @@ from typing import List, Dict
 import asyncio
 
 
-from internal.domain.brainbox.engine import generate_keywords
 from internal.domain.scraper.sources.google import search_google_places, search_google_with_serper
 
 from internal.utils.loader import load_yaml, AppLogger, export_to_json
@@ -11,18 +10,18 @@ logger = AppLogger("internal.domain.scraper.crawler")()
 
 
 class WebSearcher:
+    """
+    Google Places and Serper searches with at most max_concurrent_requests in
+    flight. The semaphore binds to the event loop it is first used in, so create
+    one searcher per loop (e.g. per pipeline run) and share it between stages.
+    """
 
     def __init__(self, max_concurrent_requests: int = 5):
-        self._max_concurrent_requests = max_concurrent_requests
-        self._semaphore = None
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
 
-    async def search_for_prospects(self, query: str, batch_size: int):
-        # Create semaphore in the current event loop to avoid "bound to a different event loop"
-        self._semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+    async def search_for_prospects(self, keywords: List[str], batch_size: int):
         tasks: list[asyncio.Task] = []
 
-        keywords = generate_keywords(query)
-        
         google_places_task = self.source_from_google_places(batch_size, keywords)
         tasks.append(google_places_task)
         
@@ -33,19 +32,7 @@ class WebSearcher:
         return await asyncio.gather(*tasks, return_exceptions=True)
         
 
-    def _ensure_semaphore_for_loop(self) -> None:
-        """Create or refresh semaphore so it is bound to the current event loop."""
-        loop = asyncio.get_running_loop()
-        if self._semaphore is None:
-            self._semaphore = asyncio.Semaphore(self._max_concurrent_requests)
-            return
-        # Recreate if bound to a different loop (e.g. after asyncio.run() in another call)
-        old_loop = getattr(self._semaphore, "_loop", None)
-        if old_loop is not loop:
-            self._semaphore = asyncio.Semaphore(self._max_concurrent_requests)
-
     async def _safe_scrape(self, keyword: str, batch_size: int, func):
-        self._ensure_semaphore_for_loop()
         async with self._semaphore:
             return await func(keyword, batch_size)
 
@@ -1,35 +1,115 @@
+import asyncio
+import itertools
+import threading
+import time
+import uuid
 from typing import Dict, List, Optional
 from internal.domain.common.dto import CustomCallAnalysisData
 
 from internal.utils.database.manager import DatabaseManager
+from internal.utils.database.async_manager import AsyncDatabaseManager
 
 from internal.domain.pipeline.augmentation import trigger_leads_information_augmentation
 from internal.domain.pipeline.ingestion import trigger_leads_sourcing
 from internal.domain.pipeline.loader import persist_enriched_leads_to_database
+from internal.domain.pipeline.streaming import run_streaming_pipeline
+from internal.domain.pipeline.workspace import PipelineWorkspace
 from internal.domain.calling.retell_service import make_retell_call
+from internal.domain.calling.webhook_inbox import WebhookInboxConsumer
+from internal.domain.calling.dialer import CampaignDialer, MAX_TRACKED_CAMPAIGNS
+from internal.domain.calling.schedule import load_call_window_config, windows_by_country, windows_by_timezone
+from internal.domain.calling.scheduler import CallScheduler
+from internal.domain.brainbox.engine import chunk_list, use_brainbox_config
+from internal.domain.brainbox.usage import MAX_TRACKED_RUNS, summarize_runs, usage_collector
 from internal.utils.database import get_session
+from internal.utils.database.session import get_async_session
 
-from internal.config.paths_config import (LEADS_SOURCED_PATH, LEADS_AUGMENTED_PATH)
+from internal.config.secret import SecretManager
 
-CAMPAIGN_LIMIT = 10
+call_window_config = load_call_window_config()
 
-def run_leads_acquisition_pipeline(query: str):
+# time.monotonic() of the last call priority refresh in this process
+_last_priority_refresh: Optional[float] = None
 
+webhook_inbox_consumer = WebhookInboxConsumer(
+    batch_size=SecretManager.WEBHOOK_INBOX_BATCH_SIZE,
+    batch_window=SecretManager.WEBHOOK_INBOX_BATCH_MS / 1000,
+    poll_interval=SecretManager.WEBHOOK_INBOX_POLL_SECONDS,
+    retention_days=SecretManager.WEBHOOK_INBOX_RETENTION_DAYS,
+)
+
+def run_leads_acquisition_pipeline(query: str) -> Dict:
+    """Sync entrypoint (background jobs, scripts): runs the whole pipeline in one event loop."""
+    return asyncio.run(run_leads_acquisition_pipeline_async(query))
+
+
+async def run_leads_acquisition_pipeline_async(query: str) -> Dict:
+    """
+    Source, augment and load leads for `query`. The run's intermediate files and
+    config snapshot live in its own workspace (artifacts/runs/<run_id>), so runs
+    may overlap; the run id is shared with the LLM usage report. The run's LLM
+    models and cascade setting come from the snapshot's brainbox section. `pipeline.mode`
+    in the funnel config picks in-memory streaming (all stages in this loop) or
+    JSON file handoffs (stages run one after another in a worker thread).
+    """
+    with usage_collector.track_run() as run_id:
+        workspace = PipelineWorkspace.create(query, run_id, keep=SecretManager.PIPELINE_KEEP_RUNS)
+        mode = (workspace.config.get("pipeline") or {}).get("mode", "streaming")
+        try:
+            with use_brainbox_config(workspace.config.get("brainbox")):
+                if mode == "files":
+                    load_stats = await asyncio.to_thread(_run_pipeline_with_files, query, workspace)
+                else:
+                    load_stats = await run_streaming_pipeline(query, workspace)
+        except Exception as e:
+            workspace.finish(error=f"{type(e).__name__}: {e}")
+            raise
+
+    summary = {
+        "run_id": run_id,
+        "workspace": str(workspace.directory),
+        "mode": mode,
+        "prospects_inserted": load_stats["prospects_inserted"],
+        "skipped_duplicates": load_stats["skipped_duplicates"],
+        "errors": len(load_stats["errors"]),
+    }
+    workspace.finish(**summary)
+    return {**summary, "llm_usage": usage_collector.get_run(run_id)}
+
+
+def _run_pipeline_with_files(query: str, workspace: PipelineWorkspace) -> Dict:
     trigger_leads_sourcing(
-        query, 
-        LEADS_SOURCED_PATH
-    )    
+        query,
+        workspace.sourced_path,
+        workspace.config,
+    )
 
     trigger_leads_information_augmentation(
-        LEADS_SOURCED_PATH,
-        LEADS_AUGMENTED_PATH
-    )    
+        workspace.sourced_path,
+        workspace.augmented_path,
+    )
 
-    persist_enriched_leads_to_database(
-        LEADS_AUGMENTED_PATH
+    return persist_enriched_leads_to_database(
+        workspace.augmented_path,
+        config_path=workspace.config_path,
     )
 
 
+def retrieve_llm_usage(db_manager: DatabaseManager, run_id: Optional[str] = None) -> Optional[Dict]:
+    """
+    LLM usage for one pipeline run, or for all recent runs when run_id is None.
+    Runs execute in worker processes, so their usage is read from the pipeline
+    job results.
+    """
+    if run_id:
+        results = db_manager.get_job_results([PIPELINE_JOB], limit=1, run_id=run_id)
+        return results[0].get("llm_usage") if results else None
+    results = db_manager.get_job_results([PIPELINE_JOB], limit=MAX_TRACKED_RUNS)
+    if results is None:
+        return None
+    return summarize_runs([result["llm_usage"] for result in results if result.get("llm_usage")])
+
+
 
 def update_leads_with_feedback(db_manager: DatabaseManager, data: CustomCallAnalysisData):
     return db_manager.update_prospect_verification_call(
@@ -39,47 +119,322 @@ def update_leads_with_feedback(db_manager: DatabaseManager, data: CustomCallAnal
         data.get("is_qualified_lead"),
         data.get("is_relevant_industry"),
     )
-    
 
-def retrieve_qualified_leads(db_manager: DatabaseManager):
-    return db_manager.get_qualified_prospects()
 
+async def update_leads_with_feedback_async(data: CustomCallAnalysisData):
+    """Async variant of update_leads_with_feedback; opens its own session (safe for background tasks)."""
+    async with get_async_session() as session:
+        return await AsyncDatabaseManager(session).update_prospect_verification_call(
+            data.get("prospect_id"),
+            data.get("call_summary"),
+            data.get("call_recording_url"),
+            data.get("is_qualified_lead"),
+            data.get("is_relevant_industry"),
+        )
 
-def call_prospect(db_manager: DatabaseManager, prospect_id: str):
-    prospect_model = db_manager.get_prospect_by_id(prospect_id)
-    if not prospect_model:
-        raise ValueError(f"Prospect with ID {prospect_id} not found")
-    return make_retell_call(prospect_model.to_dict())
 
-def run_cold_call_campaign(limit: Optional[int] = None):
+async def ingest_call_event(
+    db_manager: AsyncDatabaseManager,
+    call_id: str,
+    event: str,
+    prospect_id: str,
+    call: Dict,
+) -> Optional[bool]:
     """
-    Trigger Retell calls for prospects that have a phone and are not yet called.
-    Uses its own DB session (safe for background tasks). Limited to CAMPAIGN_LIMIT (10) calls.
+    Store a webhook call event in the inbox and wake the inbox consumer.
+    Returns True if stored, False for a repeat delivery, None if it could not be stored.
     """
-    effective_limit = limit if limit is not None else CAMPAIGN_LIMIT
-    effective_limit = min(effective_limit, CAMPAIGN_LIMIT)
+    stored = await db_manager.add_webhook_event(call_id, event, prospect_id, call)
+    if stored:
+        webhook_inbox_consumer.notify()
+    return stored
+
+
+def start_webhook_consumer():
+    """Start the webhook inbox consumer on the running event loop (call on app startup)."""
+    webhook_inbox_consumer.start()
+
+
+async def stop_webhook_consumer():
+    """Stop the consumer and apply any pending webhook events (call on app shutdown)."""
+    await webhook_inbox_consumer.stop()
+
 
+def retrieve_qualified_leads(
+    db_manager: DatabaseManager,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    **filters,
+):
+    return db_manager.list_qualified_prospects(page_size=page_size, cursor=cursor, **filters)
+
+
+async def retrieve_qualified_leads_async(
+    db_manager: AsyncDatabaseManager,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    **filters,
+):
+    return await db_manager.list_qualified_prospects(page_size=page_size, cursor=cursor, **filters)
+
+
+def claim_prospect_for_call(db_manager: DatabaseManager, prospect_id: str) -> Optional[Dict]:
+    """
+    Lease a prospect for a direct call. Returns the claimed prospect (with its
+    claim token under "claimed_by"), or None if it does not exist or another
+    call or campaign is dialing it.
+    """
+    claimed_by = f"call:{uuid.uuid4()}"
+    prospect = db_manager.claim_prospect(prospect_id, claimed_by, SecretManager.CALL_CLAIM_LEASE_SECONDS)
+    if prospect is None:
+        return None
+    return {**prospect, "claimed_by": claimed_by}
+
+
+def call_prospect(prospect: Dict):
+    """Dial a prospect claimed by claim_prospect_for_call; the lease is released if the call fails."""
+    result = make_retell_call(prospect)
+    if not result.get("success"):
+        with get_session() as session:
+            DatabaseManager(session).release_prospect_claims([prospect["prospect_id"]], prospect["claimed_by"])
+    return result
+
+def start_bulk_call(db_manager: DatabaseManager, prospect_ids: List[str]) -> Dict:
+    """
+    Lease the selected prospects for a bulk call in one statement and register
+    the batch (bulk_calls row) for progress polling. Prospects already being
+    dialed are skipped.
+
+    Returns:
+        {"batch_id", "requested", "claimed", "skipped" (prospect ids), "prospects" (claimed dicts)}
+    """
+    batch_id = str(uuid.uuid4())
+    requested = list(dict.fromkeys(prospect_ids))
+    prospects = db_manager.claim_prospects(
+        requested, f"bulk:{batch_id}", SecretManager.CALL_CLAIM_LEASE_SECONDS
+    )
+    claimed_ids = {prospect["prospect_id"] for prospect in prospects}
+    dialer = CampaignDialer()
+    db_manager.create_bulk_call(batch_id, len(prospects), dialer.max_concurrent, dialer.calls_per_second)
+    return {
+        "batch_id": batch_id,
+        "requested": len(requested),
+        "claimed": len(prospects),
+        "skipped": [prospect_id for prospect_id in requested if prospect_id not in claimed_ids],
+        "prospects": prospects,
+    }
+
+
+def _record_bulk_call_results(batch_id: str, results: List[Dict]):
+    """Add one dialed chunk to the bulk call's progress and release the leases of failed dials."""
     with get_session() as session:
         db_manager = DatabaseManager(session)
-        prospects = db_manager.get_prospects_with_phones(limit=effective_limit)
-
-    if not prospects:
-        return {"total": 0, "initiated": 0, "failed": 0, "results": []}
-
-    results = []
-    initiated = 0
-    failed = 0
-    for p in prospects:
-        out = make_retell_call(p.to_dict())
-        results.append(out)
-        if out.get("success"):
-            initiated += 1
-        else:
-            failed += 1
+        db_manager.record_bulk_call_results(batch_id, results)
+        _release_failed_dials(db_manager, results, f"bulk:{batch_id}")
+
+
+async def run_bulk_call(batch_id: str, prospects: List[Dict]) -> Dict:
+    """
+    Dial the prospects claimed by start_bulk_call through the bounded dialer.
+    Progress is written to the bulk_calls row as each chunk of calls is dialed.
+    """
+    dialer = CampaignDialer()
+    try:
+        return await dialer.run(
+            iter(chunk_list(prospects, dialer.max_concurrent)),
+            batch_id,
+            len(prospects),
+            on_batch=lambda results: asyncio.to_thread(_record_bulk_call_results, batch_id, results),
+        )
+    finally:
+        with get_session() as session:
+            await asyncio.to_thread(DatabaseManager(session).finish_bulk_call, batch_id)
+
+
+def retrieve_bulk_call(db_manager: DatabaseManager, batch_id: str) -> Optional[Dict]:
+    """Progress of a bulk call batch (total, dialed, initiated, failed, status), from the database."""
+    return db_manager.get_bulk_call(batch_id)
+
+
+def enqueue_cold_call_campaign(limit: Optional[int] = None) -> Dict:
+    """
+    Queue prospects that have a phone and are not yet called (up to
+    CAMPAIGN_MAX_CALLS) in the call queue, each with the next business-hours
+    window of its country. The call scheduler dials them as windows open.
+    """
+    effective_limit = min(limit, SecretManager.CAMPAIGN_MAX_CALLS) if limit else SecretManager.CAMPAIGN_MAX_CALLS
+    campaign_id = str(uuid.uuid4())
+
+    with get_session() as session:
+        db_manager = DatabaseManager(session)
+        windows = windows_by_country(db_manager.callable_country_keys(), call_window_config)
+        queued = db_manager.enqueue_callable_prospects(campaign_id, windows, effective_limit)
+    return {"campaign_id": campaign_id, "queued": queued}
+
 
+def _priority_refresh_due() -> bool:
+    return (
+        _last_priority_refresh is None
+        or time.monotonic() - _last_priority_refresh >= SecretManager.CALL_PRIORITY_REFRESH_SECONDS
+    )
+
+
+def _prepare_call_queue():
+    global _last_priority_refresh
+    with get_session() as session:
+        db_manager = DatabaseManager(session)
+        if _priority_refresh_due() and db_manager.refresh_priority_scores() is not None:
+            _last_priority_refresh = time.monotonic()
+        db_manager.sweep_call_queue(SecretManager.CALL_DIALING_STALE_SECONDS)
+        expired = db_manager.expired_queue_timezones()
+        if expired:
+            db_manager.reschedule_queue_windows(windows_by_timezone(expired, call_window_config))
+
+
+def _release_failed_dials(db_manager: DatabaseManager, results: List[Dict], claimed_by: str):
+    failed_ids = [r["prospect_id"] for r in results if not r.get("success") and r.get("prospect_id")]
+    db_manager.release_prospect_claims(failed_ids, claimed_by)
+
+
+def _record_dial_results(results: List[Dict], claimed_by: str):
+    """Record one dialed batch on its queue entries and release the leases of failed dials."""
+    with get_session() as session:
+        db_manager = DatabaseManager(session)
+        db_manager.complete_queue_entries(
+            results,
+            call_window_config.max_attempts,
+            call_window_config.retry_delay_minutes * 60,
+        )
+        _release_failed_dials(db_manager, results, claimed_by)
+
+
+async def dispatch_due_calls() -> Optional[Dict]:
+    """
+    One call scheduler pass: refresh call priorities (every
+    CALL_PRIORITY_REFRESH_SECONDS), tidy the queue, move closed windows forward,
+    then dial every queued call whose window is open, highest priority first. Calls are claimed in small
+    batches (SKIP LOCKED, with a prospect lease) and dialed concurrently under
+    the CAMPAIGN_MAX_CONCURRENT_CALLS and CAMPAIGN_CALLS_PER_SECOND limits.
+    Each batch's results are recorded, and its failed leases released, as soon
+    as the batch has been dialed, so a long pass never holds them until the end.
+    Returns the dialer outcome, or None when nothing was due.
+    """
+    await asyncio.to_thread(_prepare_call_queue)
+
+    dispatch_id = str(uuid.uuid4())
+    dialer = CampaignDialer()
+    with get_session() as session:
+        db_manager = DatabaseManager(session)
+        batches = db_manager.iter_due_queue_entries(
+            dispatch_id,
+            batch_size=dialer.max_concurrent * 4,
+            lease_seconds=SecretManager.CALL_CLAIM_LEASE_SECONDS,
+        )
+        first = await asyncio.to_thread(next, batches, None)
+        if first is None:
+            return None
+        outcome = await dialer.run(
+            itertools.chain([first], batches),
+            dispatch_id,
+            on_batch=lambda results: asyncio.to_thread(_record_dial_results, results, dispatch_id),
+        )
+    return outcome
+
+
+async def dispatch_and_record_due_calls() -> Optional[Dict]:
+    """A call scheduler pass whose dialer metrics are stored as a call_dispatch job (see retrieve_campaign_metrics)."""
+    outcome = await dispatch_due_calls()
+    if outcome is not None:
+        with get_session() as session:
+            await asyncio.to_thread(
+                DatabaseManager(session).record_job,
+                CALL_DISPATCH_JOB,
+                {"dispatch_id": outcome["campaign_id"], "dialer_metrics": outcome["metrics"]},
+            )
+    return outcome
+
+
+call_scheduler = CallScheduler(dispatch_and_record_due_calls, SecretManager.CALL_SCHEDULER_INTERVAL_SECONDS)
+
+
+def run_call_scheduler(stopping: threading.Event) -> None:
+    """
+    Run the call scheduler loop in its own event loop until `stopping` is set
+    (worker.py runs it in a thread next to the job loop).
+    """
+    async def run():
+        call_scheduler.start()
+        await asyncio.to_thread(stopping.wait)
+        await call_scheduler.stop()
+
+    if SecretManager.CALL_SCHEDULER_INTERVAL_SECONDS > 0:
+        asyncio.run(run())
+
+
+def retrieve_call_queue_summary(db_manager: DatabaseManager) -> Optional[Dict]:
+    return db_manager.get_call_queue_summary()
+
+
+# Job kinds executed by worker processes (worker.py)
+PIPELINE_JOB = "leads_pipeline"
+CAMPAIGN_JOB = "cold_call_campaign"
+# Call scheduler passes that dialed, recorded as succeeded jobs for their metrics
+CALL_DISPATCH_JOB = "call_dispatch"
+
+
+def queue_leads_pipeline(db_manager: DatabaseManager, query: str) -> Optional[str]:
+    """Queue a pipeline run for the workers. Returns the job id."""
+    return db_manager.enqueue_job(PIPELINE_JOB, {"query": query}, SecretManager.JOB_MAX_ATTEMPTS)
+
+
+def queue_cold_call_campaign(db_manager: DatabaseManager, limit: Optional[int] = None) -> Optional[str]:
+    """Queue a cold call campaign for the workers. Returns the job id."""
+    return db_manager.enqueue_job(CAMPAIGN_JOB, {"limit": limit}, SecretManager.JOB_MAX_ATTEMPTS)
+
+
+def retrieve_job(db_manager: DatabaseManager, job_id: str) -> Optional[Dict]:
+    return db_manager.get_job(job_id)
+
+
+def run_leads_pipeline_job(payload: Dict) -> Dict:
+    return run_leads_acquisition_pipeline(payload["query"])
+
+
+async def run_cold_call_campaign_job(payload: Dict) -> Dict:
+    """Queue the campaign's prospects in the call queue, then dial whatever is already due."""
+    campaign = await asyncio.to_thread(enqueue_cold_call_campaign, payload.get("limit"))
+    outcome = await dispatch_due_calls()
+    return {
+        **campaign,
+        "dialed": outcome["total"] if outcome else 0,
+        "initiated": outcome["initiated"] if outcome else 0,
+        "dispatch_id": outcome["campaign_id"] if outcome else None,
+        "dialer_metrics": outcome["metrics"] if outcome else None,
+    }
+
+
+JOB_HANDLERS = {
+    PIPELINE_JOB: run_leads_pipeline_job,
+    CAMPAIGN_JOB: run_cold_call_campaign_job,
+}
+
+# Jobs of a kind running at once across all workers (kinds not listed are unlimited)
+JOB_CONCURRENCY_LIMITS = {
+    PIPELINE_JOB: SecretManager.PIPELINE_MAX_CONCURRENT_RUNS,
+}
+
+
+def retrieve_campaign_metrics(db_manager: DatabaseManager) -> Optional[Dict]:
+    """
+    Call latency and failure metrics of recent dialer runs (campaign jobs and
+    call scheduler passes, newest first), keyed by dispatch id. They run in
+    worker processes, so the metrics are read from the job results.
+    """
+    results = db_manager.get_job_results([CAMPAIGN_JOB, CALL_DISPATCH_JOB], limit=MAX_TRACKED_CAMPAIGNS)
+    if results is None:
+        return None
     return {
-        "total": len(prospects),
-        "initiated": initiated,
-        "failed": failed,
-        "results": results,
+        result["dispatch_id"]: {"campaign_id": result.get("campaign_id"), **result["dialer_metrics"]}
+        for result in results
+        if result.get("dialer_metrics")
     }
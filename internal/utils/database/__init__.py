@@ -6,6 +6,7 @@ Exports database models, manager, and session utilities.
 
 from internal.utils.database.models import (
     Prospect,
+    ProspectStats,
     Base
 )
 from internal.utils.database.manager import DatabaseManager
@@ -13,6 +14,7 @@ from internal.utils.database.session import get_session, init_db
 
 __all__ = [
     'Prospect',
+    'ProspectStats',
     'Base',
     'DatabaseManager',
     'get_session',
@@ -0,0 +1,386 @@
+"""
+Async database manager for prospect operations used by request handlers
+
+Mirrors the read/write methods of DatabaseManager that the API routes call,
+on an asyncpg-backed AsyncSession, so DB-bound requests wait on the event
+loop instead of holding a threadpool worker.
+"""
+
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from internal.utils.logger import AppLogger
+from internal.utils.database.models import Prospect, WebhookInboxEvent
+from internal.utils.database.manager import (
+    CALLABLE_PROSPECT,
+    apply_prospect_filters,
+    stats_totals_statement,
+    summarize_stats,
+    verification_call_update,
+    verification_calls_bulk_update,
+)
+from internal.utils.database.pagination import Page, build_page, clamp_page_size, keyset_statement
+from internal.utils.database.projections import DETAIL_COLUMNS, LIST_COLUMNS, serialize_row
+from internal.utils.database.search import build_prefix_tsquery, search_condition_and_rank
+
+logger = AppLogger("utils.database.async_manager")()
+
+# Longest error message stored on a webhook inbox event that failed to apply
+WEBHOOK_ERROR_MAX_LENGTH = 1000
+
+
+class AsyncDatabaseManager:
+    """Async counterpart of DatabaseManager for the API routes"""
+
+    def __init__(self, session: AsyncSession):
+        """
+        Args:
+            session: AsyncSession (e.g. from inject_async_session)
+        """
+        self._session = session
+
+    async def _paginate(
+        self,
+        statement,
+        sort_column,
+        page_size: Optional[int],
+        cursor: Optional[str],
+        descending: bool = False,
+    ) -> Page:
+        page_size = clamp_page_size(page_size)
+        statement = keyset_statement(
+            statement, sort_column, Prospect.prospect_id, page_size, cursor, descending
+        )
+        rows = (await self._session.execute(statement)).all()
+        return build_page(rows, page_size, sort_column.key, Prospect.prospect_id.key)
+
+    async def get_prospects_with_phones(self, limit: Optional[int] = None) -> List[Prospect]:
+        """
+        Get prospects with phone numbers and not called
+        """
+        try:
+            statement = (
+                select(Prospect)
+                .filter(*CALLABLE_PROSPECT)
+                .order_by(Prospect.created_at, Prospect.prospect_id)
+            )
+            if limit:
+                statement = statement.limit(limit)
+            return list((await self._session.scalars(statement)).all())
+        except Exception as e:
+            logger.error("Failed to get prospects with phones: %s", e)
+            return []
+
+    async def list_callable_prospects(
+        self,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> Page:
+        """
+        Page through prospects with phone numbers and not called, oldest first.
+        Raises ValueError for a malformed cursor.
+        """
+        statement = apply_prospect_filters(select(*LIST_COLUMNS).filter(*CALLABLE_PROSPECT), **filters)
+        return await self._paginate(statement, Prospect.created_at, page_size, cursor)
+
+    async def list_qualified_prospects(
+        self,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> Page:
+        """
+        Page through qualified prospects, oldest first.
+        Raises ValueError for a malformed cursor.
+        """
+        statement = apply_prospect_filters(
+            select(*LIST_COLUMNS).filter(Prospect.is_qualified == True), **filters
+        )
+        return await self._paginate(statement, Prospect.created_at, page_size, cursor)
+
+    async def list_called_prospects(
+        self,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> Page:
+        """
+        Page through called prospects, most recently updated first.
+        Raises ValueError for a malformed cursor.
+        """
+        statement = apply_prospect_filters(
+            select(*LIST_COLUMNS).filter(Prospect.is_called == True), **filters
+        )
+        return await self._paginate(statement, Prospect.updated_at, page_size, cursor, descending=True)
+
+    async def search_prospects(
+        self,
+        text: str,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> Page:
+        """
+        Full-text search over name, business context and about, best match first.
+        Raises ValueError for a malformed cursor.
+        """
+        tsquery = build_prefix_tsquery(text)
+        if tsquery is None:
+            return {"items": [], "next_cursor": None}
+        condition, rank = search_condition_and_rank(tsquery)
+        statement = apply_prospect_filters(select(*LIST_COLUMNS, rank).filter(condition), **filters)
+        return await self._paginate(statement, rank, page_size, cursor, descending=True)
+
+    async def get_prospect_by_id(self, prospect_id: str) -> Optional[Prospect]:
+        """
+        Get prospect by ID
+        """
+        try:
+            return await self._session.get(Prospect, prospect_id)
+        except Exception as e:
+            logger.error("Failed to get prospect by ID %s: %s", prospect_id, e)
+            return None
+
+    async def get_prospect_detail(self, prospect_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the detail view of a prospect (full about text and call summary) as a dict
+        """
+        try:
+            result = await self._session.execute(
+                select(*DETAIL_COLUMNS).filter(Prospect.prospect_id == prospect_id)
+            )
+            return serialize_row(result.first(), DETAIL_COLUMNS)
+        except Exception as e:
+            logger.error("Failed to get prospect detail %s: %s", prospect_id, e)
+            return None
+
+    async def get_prospect_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get dashboard counters from the prospect_stats table
+        """
+        try:
+            result = await self._session.execute(stats_totals_statement())
+            return summarize_stats(result.all())
+        except Exception as e:
+            logger.error("Failed to get prospect stats: %s", e)
+            return None
+
+    async def update_prospect_verification_call(
+        self,
+        prospect_id: str,
+        call_summary: Optional[str] = None,
+        recording_url: Optional[str] = None,
+        is_qualified: Optional[bool] = None,
+        is_relevant_industry: Optional[bool] = None,
+    ) -> Optional[Prospect]:
+        """
+        Update prospect verification call (one UPDATE ... RETURNING round trip)
+        """
+        try:
+            result = await self._session.scalars(
+                verification_call_update(
+                    prospect_id, call_summary, recording_url, is_qualified, is_relevant_industry
+                )
+            )
+            prospect = result.first()
+            await self._session.commit()
+            if prospect is None:
+                logger.error("Prospect %s not found", prospect_id)
+            return prospect
+        except Exception as e:
+            await self._session.rollback()
+            logger.error(
+                "Failed to update prospect verification call %s: %s", prospect_id, e
+            )
+            return None
+
+    async def update_verification_calls(self, outcomes: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """
+        Apply a batch of call outcomes in one statement.
+        Returns the updated prospect IDs, or None on error.
+        """
+        if not outcomes:
+            return []
+        try:
+            result = await self._session.scalars(verification_calls_bulk_update(outcomes))
+            updated = list(result.all())
+            await self._session.commit()
+            return updated
+        except Exception as e:
+            await self._session.rollback()
+            logger.error("Failed to update %d verification calls: %s", len(outcomes), e)
+            return None
+
+    async def add_webhook_event(
+        self,
+        call_id: str,
+        event: str,
+        prospect_id: Optional[str],
+        payload: Dict[str, Any],
+    ) -> Optional[bool]:
+        """
+        Append a webhook event to the inbox (one INSERT ... ON CONFLICT DO NOTHING).
+        Returns True if stored, False if the call's event was already in the inbox
+        (a retry), None on error.
+        """
+        try:
+            result = await self._session.execute(
+                pg_insert(WebhookInboxEvent)
+                .values(call_id=call_id, event=event, prospect_id=prospect_id, payload=payload)
+                .on_conflict_do_nothing(index_elements=[WebhookInboxEvent.call_id])
+                .returning(WebhookInboxEvent.call_id)
+            )
+            stored = result.first() is not None
+            await self._session.commit()
+            return stored
+        except Exception as e:
+            await self._session.rollback()
+            logger.error("Failed to store webhook event for call %s: %s", call_id, e)
+            return None
+
+    async def _apply_locked_webhook_events(
+        self,
+        events: List[WebhookInboxEvent],
+        to_outcome: Callable[[Dict[str, Any]], Dict[str, Any]],
+    ) -> int:
+        """Write the call outcomes of locked events and mark them processed (caller commits)"""
+        outcomes = [to_outcome(event.payload) for event in events]
+        updated = set((await self._session.scalars(verification_calls_bulk_update(outcomes))).all())
+        await self._session.execute(
+            update(WebhookInboxEvent)
+            .where(WebhookInboxEvent.call_id.in_([event.call_id for event in events]))
+            .values(
+                processed_at=func.now(),
+                error=case(
+                    (WebhookInboxEvent.prospect_id.in_(updated), None),
+                    else_="Prospect not found",
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return len(events) - sum(1 for event in events if event.prospect_id in updated)
+
+    def _pending_webhook_events(self, limit: int):
+        return (
+            select(WebhookInboxEvent)
+            .filter(WebhookInboxEvent.processed_at.is_(None))
+            .order_by(WebhookInboxEvent.received_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+    async def apply_webhook_events(
+        self,
+        to_outcome: Callable[[Dict[str, Any]], Dict[str, Any]],
+        limit: int = 100,
+    ) -> Optional[int]:
+        """
+        Apply up to `limit` pending inbox events, oldest first, in one transaction:
+        lock them (SKIP LOCKED, so concurrent consumers take different events),
+        write their call outcomes with one bulk UPDATE and mark them processed.
+        Events whose prospect no longer exists are marked processed with an error.
+
+        If the batch fails, its events are applied one by one instead; an event
+        that fails on its own is marked processed with the error, so one bad
+        payload cannot hold back the rest of the inbox.
+
+        Args:
+            to_outcome: Maps a stored payload to a call outcome (CustomCallAnalysisData)
+            limit: Events per batch
+
+        Returns:
+            Number of events processed, or None on error (the events stay pending)
+        """
+        events: List[WebhookInboxEvent] = []
+        try:
+            events = (await self._session.scalars(self._pending_webhook_events(limit))).all()
+            if not events:
+                await self._session.rollback()
+                return 0
+            call_ids = [event.call_id for event in events]
+            missing = await self._apply_locked_webhook_events(events, to_outcome)
+            await self._session.commit()
+        except Exception as e:
+            await self._session.rollback()
+            if not events:
+                logger.error("Failed to apply webhook events: %s", e)
+                return None
+            logger.warning("Failed to apply %d webhook events as a batch, retrying one by one: %s", len(call_ids), e)
+            return await self._apply_webhook_events_one_by_one(call_ids, to_outcome)
+
+        if missing:
+            logger.error("%d webhook events refer to prospects that no longer exist", missing)
+        return len(events)
+
+    async def _apply_webhook_events_one_by_one(
+        self,
+        call_ids: List[str],
+        to_outcome: Callable[[Dict[str, Any]], Dict[str, Any]],
+    ) -> Optional[int]:
+        processed = 0
+        for call_id in call_ids:
+            try:
+                events = (await self._session.scalars(
+                    self._pending_webhook_events(1).filter(WebhookInboxEvent.call_id == call_id)
+                )).all()
+                if not events:
+                    await self._session.rollback()
+                    continue
+                if await self._apply_locked_webhook_events(events, to_outcome):
+                    logger.error("Webhook event for call %s refers to a prospect that no longer exists", call_id)
+                await self._session.commit()
+                processed += 1
+            except Exception as e:
+                await self._session.rollback()
+                logger.error("Failed to apply webhook event for call %s: %s", call_id, e)
+                try:
+                    await self._session.execute(
+                        update(WebhookInboxEvent)
+                        .where(WebhookInboxEvent.call_id == call_id, WebhookInboxEvent.processed_at.is_(None))
+                        .values(processed_at=func.now(), error=f"Failed to apply: {e}"[:WEBHOOK_ERROR_MAX_LENGTH])
+                    )
+                    await self._session.commit()
+                    processed += 1
+                except Exception as mark_error:
+                    await self._session.rollback()
+                    logger.error("Failed to mark webhook event for call %s as failed: %s", call_id, mark_error)
+                    return None
+        return processed
+
+    async def prune_webhook_inbox(self, retention_days: int) -> int:
+        """Delete processed inbox events older than retention_days"""
+        try:
+            result = await self._session.execute(
+                delete(WebhookInboxEvent).where(
+                    WebhookInboxEvent.processed_at < func.now() - timedelta(days=retention_days)
+                )
+            )
+            await self._session.commit()
+            return result.rowcount
+        except Exception as e:
+            await self._session.rollback()
+            logger.error("Failed to prune webhook inbox: %s", e)
+            return 0
+
+    async def delete_prospect(self, prospect_id: str) -> bool:
+        """
+        Delete a prospect by ID. Returns True if deleted, False if not found or error.
+        """
+        try:
+            result = await self._session.execute(
+                delete(Prospect).where(Prospect.prospect_id == prospect_id)
+            )
+            await self._session.commit()
+            if result.rowcount:
+                logger.info("Deleted prospect %s", prospect_id)
+                return True
+            return False
+        except Exception as e:
+            await self._session.rollback()
+            logger.error("Failed to delete prospect %s: %s", prospect_id, e)
+            return False
@@ -0,0 +1,165 @@
+"""
+EXPLAIN-based verification of the prospect hot queries
+
+Checks that each hot query in DatabaseManager can be served by the index built
+for it. Sequential scans are disabled for the check so the result does not
+depend on table size (on a small table the planner rightly prefers a seq scan).
+
+Usage:
+    python -m internal.utils.database.explain
+"""
+
+import json
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from internal.utils.logger import AppLogger
+from internal.utils.database.models import CallQueueEntry, Prospect
+from internal.utils.database.manager import CALLABLE_PROSPECT
+
+logger = AppLogger("utils.database.explain")()
+
+
+def _callable_query(session: Session) -> Query:
+    return (
+        session.query(Prospect)
+        .filter(*CALLABLE_PROSPECT)
+        .order_by(Prospect.created_at, Prospect.prospect_id)
+        .limit(50)
+    )
+
+
+def _due_calls_query(session: Session) -> Query:
+    return (
+        session.query(CallQueueEntry.prospect_id)
+        .filter(
+            CallQueueEntry.status == "queued",
+            CallQueueEntry.window_start <= func.now(),
+            CallQueueEntry.window_end > func.now(),
+        )
+        .order_by(CallQueueEntry.priority.desc(), CallQueueEntry.window_start, CallQueueEntry.enqueued_at)
+        .limit(20)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def _enqueue_candidates_query(session: Session) -> Query:
+    return (
+        session.query(Prospect.prospect_id)
+        .filter(*CALLABLE_PROSPECT)
+        .order_by(Prospect.priority_score.desc(), Prospect.created_at, Prospect.prospect_id)
+        .limit(500)
+    )
+
+
+def _qualified_query(session: Session) -> Query:
+    return (
+        session.query(Prospect)
+        .filter(Prospect.is_qualified == True)
+        .order_by(Prospect.created_at, Prospect.prospect_id)
+        .limit(50)
+    )
+
+
+def _called_query(session: Session) -> Query:
+    return (
+        session.query(Prospect)
+        .filter(Prospect.is_called == True)
+        .order_by(Prospect.updated_at.desc(), Prospect.prospect_id.desc())
+        .limit(50)
+    )
+
+
+def _phone_lookup_query(session: Session) -> Query:
+    return session.query(Prospect.phones).filter(Prospect.phones.overlap(["+2348030000000"]))
+
+
+def _email_lookup_query(session: Session) -> Query:
+    return session.query(Prospect.emails).filter(Prospect.emails.overlap(["hello@example.com"]))
+
+
+def _name_lookup_query(session: Session) -> Query:
+    name_key = func.lower(func.btrim(Prospect.name))
+    return session.query(name_key).filter(name_key.in_(["example ltd"]))
+
+
+# name -> (query builder, index expected in the plan)
+HOT_QUERIES: Dict[str, tuple] = {
+    "get_prospects_with_phones": (_callable_query, "idx_prospects_callable"),
+    "enqueue_callable_prospects": (_enqueue_candidates_query, "idx_prospects_callable_priority"),
+    "claim_due_queue_entries": (_due_calls_query, "idx_call_queue_priority"),
+    "get_qualified_prospects": (_qualified_query, "idx_prospects_qualified"),
+    "get_called_prospects": (_called_query, "idx_prospects_called"),
+    "identity_lookup_phone": (_phone_lookup_query, "idx_prospects_phones_gin"),
+    "identity_lookup_email": (_email_lookup_query, "idx_prospects_emails_gin"),
+    "identity_lookup_name": (_name_lookup_query, "idx_prospects_name_key"),
+}
+
+
+def _indexes_in_plan(node: Dict[str, Any]) -> List[str]:
+    found = [node["Index Name"]] if "Index Name" in node else []
+    for child in node.get("Plans", []):
+        found.extend(_indexes_in_plan(child))
+    return found
+
+
+def explain(session: Session, query: Query) -> Dict[str, Any]:
+    """Return the JSON plan of a query (without executing it)."""
+    compiled = query.statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    row = session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    plan = row if isinstance(row, list) else json.loads(row)
+    return plan[0]["Plan"]
+
+
+def verify_hot_query_plans(
+    session: Session,
+    queries: Optional[Dict[str, tuple]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    EXPLAIN every hot query and report whether its expected index is used.
+
+    Returns:
+        {query_name: {"expected_index", "indexes_used", "ok"}}
+    """
+    queries = queries or HOT_QUERIES
+    results: Dict[str, Dict[str, Any]] = {}
+    session.execute(text("SET LOCAL enable_seqscan = off"))
+    try:
+        for name, (build_query, expected_index) in queries.items():
+            used = _indexes_in_plan(explain(session, build_query(session)))
+            results[name] = {
+                "expected_index": expected_index,
+                "indexes_used": used,
+                "ok": expected_index in used,
+            }
+    finally:
+        session.rollback()
+    return results
+
+
+def main() -> int:
+    from internal.utils.database.session import get_session, init_db
+
+    init_db(drop_existing=False)
+    with get_session() as session:
+        results = verify_hot_query_plans(session)
+
+    for name, result in results.items():
+        log = logger.info if result["ok"] else logger.error
+        log(
+            "%s: expected %s, plan uses %s",
+            name,
+            result["expected_index"],
+            ", ".join(result["indexes_used"]) or "no index",
+        )
+    return 0 if all(result["ok"] for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
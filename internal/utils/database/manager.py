@@ -3,13 +3,19 @@ Database manager for prospect operations
 """
 
 import uuid
-from typing import List, Dict, Optional, Any, TypedDict
-from datetime import datetime
+from typing import List, Dict, Iterator, Optional, Any, Tuple, TypedDict
+from datetime import datetime, timedelta
 
+from sqlalchemy import Boolean, DateTime, String, case, column, func, or_, select, text, update, values
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from internal.utils.logger import AppLogger
-from internal.utils.database.models import Prospect
+from internal.utils.database.models import BulkCall, CallQueueEntry, Job, Prospect, ProspectStats
+from internal.utils.database.pagination import Page, keyset_paginate
+from internal.utils.database.priority import refresh_priority_sql
+from internal.utils.database.projections import DETAIL_COLUMNS, LIST_COLUMNS, serialize_row
+from internal.utils.database.search import build_prefix_tsquery, search_condition_and_rank
 
 logger = AppLogger("utils.database.manager")()
 
@@ -22,6 +28,167 @@ class EnrichmentsQueue(TypedDict):
     discovery_confidence: float
 
 
+# Prospects the campaign may dial; mirrors the idx_prospects_callable predicate
+CALLABLE_PROSPECT = (
+    Prospect.has_phone == True,
+    func.cardinality(Prospect.phones) > 0,
+    Prospect.is_called == False,
+)
+
+
+def apply_prospect_filters(
+    query,
+    country: Optional[str] = None,
+    business_context: Optional[str] = None,
+    has_email: Optional[bool] = None,
+):
+    """
+    Narrow a prospect Query or select() by list filters
+
+    Args:
+        country: Country acronym (e.g. NG) or country name, case-insensitive
+        business_context: Case-insensitive substring of the business context
+        has_email: Only prospects with (True) or without (False) an email
+    """
+    if country:
+        country = country.strip()
+        query = query.filter(or_(
+            func.upper(Prospect.country_acronym) == country.upper(),
+            func.lower(Prospect.country) == country.lower(),
+        ))
+    if business_context:
+        query = query.filter(Prospect.business_context.ilike(f"%{business_context.strip()}%"))
+    if has_email is not None:
+        query = query.filter(Prospect.has_email == has_email)
+    return query
+
+
+# A claim older than this is considered abandoned (crashed worker) and may be taken over
+DEFAULT_CLAIM_LEASE_SECONDS = 900
+
+# A queue entry `dialing` longer than this is assumed abandoned by its dialer
+DEFAULT_DIALING_STALE_SECONDS = 300
+
+
+def lease_available(lease_seconds: int = DEFAULT_CLAIM_LEASE_SECONDS):
+    """Prospect is not under a live dialing lease"""
+    return or_(
+        Prospect.claimed_at.is_(None),
+        Prospect.claimed_at < func.now() - timedelta(seconds=lease_seconds),
+    )
+
+
+# Call queue statuses that hold a prospect in the queue
+CALL_QUEUE_ACTIVE = ("queued", "dialing")
+
+# pg_advisory_xact_lock key serializing job claims that check concurrency limits
+JOB_CLAIM_LOCK_KEY = 0x6A6F6273
+
+
+def prospect_country_key():
+    """Upper-cased country acronym, '' when unknown (keys the call window of a prospect)"""
+    return func.coalesce(func.upper(func.nullif(func.btrim(Prospect.country_acronym), "")), "")
+
+
+def verification_call_update(
+    prospect_id: str,
+    call_summary: Optional[str] = None,
+    recording_url: Optional[str] = None,
+    is_qualified: Optional[bool] = None,
+    is_relevant_industry: Optional[bool] = None,
+):
+    """Single-statement UPDATE ... RETURNING recording a call outcome on one prospect"""
+    return (
+        update(Prospect)
+        .where(Prospect.prospect_id == prospect_id)
+        .values(
+            verification_call_summary=call_summary,
+            verification_recording_url=recording_url,
+            is_qualified=is_qualified,
+            is_relevant_industry=is_relevant_industry,
+            is_called=True,
+            claimed_at=None,
+            claimed_by=None,
+        )
+        .returning(Prospect)
+    )
+
+
+def verification_calls_bulk_update(outcomes: List[Dict[str, Any]]):
+    """
+    One UPDATE ... FROM (VALUES ...) RETURNING prospect_id applying many call outcomes.
+    Each outcome carries prospect_id, call_summary, call_recording_url,
+    is_qualified_lead and is_relevant_industry (CustomCallAnalysisData); the last
+    outcome per prospect wins.
+    """
+    latest = {outcome["prospect_id"]: outcome for outcome in outcomes}
+    feedback = values(
+        column("prospect_id", String),
+        column("call_summary", String),
+        column("recording_url", String),
+        column("is_qualified", Boolean),
+        column("is_relevant_industry", Boolean),
+        name="feedback",
+    ).data([
+        (
+            prospect_id,
+            outcome.get("call_summary"),
+            outcome.get("call_recording_url"),
+            outcome.get("is_qualified_lead"),
+            outcome.get("is_relevant_industry"),
+        )
+        for prospect_id, outcome in latest.items()
+    ])
+    return (
+        update(Prospect)
+        .where(Prospect.prospect_id == feedback.c.prospect_id)
+        .values(
+            verification_call_summary=feedback.c.call_summary,
+            verification_recording_url=feedback.c.recording_url,
+            is_qualified=feedback.c.is_qualified,
+            is_relevant_industry=feedback.c.is_relevant_industry,
+            is_called=True,
+            claimed_at=None,
+            claimed_by=None,
+        )
+        .returning(Prospect.prospect_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+STATS_COUNTERS = ("total", "callable", "called", "qualified")
+
+
+def stats_totals_statement():
+    """prospect_stats counters summed over their shards, largest total first"""
+    return (
+        select(
+            ProspectStats.dimension,
+            ProspectStats.key,
+            *[func.sum(getattr(ProspectStats, counter)).label(counter) for counter in STATS_COUNTERS],
+        )
+        .group_by(ProspectStats.dimension, ProspectStats.key)
+        .order_by(func.sum(ProspectStats.total).desc(), ProspectStats.key)
+    )
+
+
+def summarize_stats(rows) -> Dict[str, Any]:
+    """
+    Shape stats_totals_statement rows into the /stats payload: overall counters
+    plus per-country and per-business-context breakdowns.
+    """
+    summary: Dict[str, Any] = {counter: 0 for counter in STATS_COUNTERS}
+    summary["by_country"] = []
+    summary["by_business_context"] = []
+    for row in rows:
+        counters = {counter: int(getattr(row, counter)) for counter in STATS_COUNTERS}
+        if row.dimension == "all":
+            summary.update(counters)
+        elif counters["total"] > 0:
+            summary[f"by_{row.dimension}"].append({"key": row.key, **counters})
+    return summary
+
+
 class DatabaseManager:
     """Manages database operations for prospects"""
 
@@ -139,6 +306,84 @@ class DatabaseManager:
             logger.error("Failed to create/update prospect %s: %s", prospect_id, e)
             return None
 
+    def find_stored_contacts(
+        self,
+        phones: List[str],
+        emails: List[str],
+        session: Optional[Session] = None,
+    ) -> Dict[str, set]:
+        """
+        Return which of the given phones/emails already belong to a stored prospect.
+
+        Membership checks use array overlap (&&) against the GIN contact indexes, so
+        secondary contacts are matched as well as primary ones.
+
+        Returns:
+            {"phones": {...}, "emails": {...}}
+        """
+        db_session = session or self._get_session()
+        found: Dict[str, set] = {"phones": set(), "emails": set()}
+        for key, column, values in (
+            ("phones", Prospect.phones, phones),
+            ("emails", Prospect.emails, emails),
+        ):
+            values = sorted({value for value in values if value})
+            if not values:
+                continue
+            requested = set(values)
+            for (stored,) in db_session.query(column).filter(column.overlap(values)):
+                found[key].update(requested.intersection(stored))
+        return found
+
+    def bulk_insert_prospects(self, rows: List[Dict[str, Any]], batch_size: int = 1000) -> Dict[str, int]:
+        """
+        Insert prospect rows with INSERT ... ON CONFLICT DO NOTHING.
+
+        Rows sharing any phone or email with a stored prospect (GIN-backed overlap
+        check) or with an earlier row are dropped first, so secondary contacts
+        count even where ensure_identity_indexes skipped a unique index; rows that
+        still collide on a unique identity index (e.g. a concurrent load) are
+        skipped by the database. Counts come from RETURNING, so they reflect what
+        was actually written.
+
+        Args:
+            rows: Column dicts for Prospect
+            batch_size: Rows per INSERT statement
+
+        Returns:
+            {"inserted": n, "skipped": m}
+        """
+        db_session = self._get_session()
+        inserted = 0
+        # Contacts of stored prospects and of rows already taken
+        taken: Dict[str, set] = {"phones": set(), "emails": set()}
+        for i in range(0, len(rows), batch_size):
+            stored = self.find_stored_contacts(
+                [phone for row in rows[i:i + batch_size] for phone in row.get("phones") or []],
+                [email for row in rows[i:i + batch_size] for email in row.get("emails") or []],
+            )
+            taken["phones"] |= stored["phones"]
+            taken["emails"] |= stored["emails"]
+            batch = []
+            for row in rows[i:i + batch_size]:
+                if any(not taken[key].isdisjoint(row.get(key) or []) for key in ("phones", "emails")):
+                    continue
+                for key in ("phones", "emails"):
+                    taken[key].update(row.get(key) or [])
+                batch.append(row)
+            if not batch:
+                continue
+            statement = (
+                pg_insert(Prospect)
+                .values(batch)
+                .on_conflict_do_nothing()
+                .returning(Prospect.prospect_id)
+            )
+            inserted += len(db_session.execute(statement).fetchall())
+        db_session.commit()
+        logger.debug("Bulk inserted %d of %d prospects", inserted, len(rows))
+        return {"inserted": inserted, "skipped": len(rows) - inserted}
+
     def get_prospects_with_phones(self, limit: Optional[int] = None) -> List[Prospect]:
         """
         Get prospects with phone numbers and not called
@@ -147,10 +392,8 @@ class DatabaseManager:
         try:
             query = (
                 db_session.query(Prospect)
-                .filter(Prospect.has_phone == True)
-                .filter(Prospect.phones.isnot(None))
-                .filter(Prospect.phones != "")
-                .filter(Prospect.is_called == False)
+                .filter(*CALLABLE_PROSPECT)
+                .order_by(Prospect.created_at, Prospect.prospect_id)
             )
             if limit:
                 query = query.limit(limit)
@@ -161,6 +404,81 @@ class DatabaseManager:
         finally:
             db_session.close()
 
+    def claim_prospect(
+        self,
+        prospect_id: str,
+        claimed_by: str,
+        lease_seconds: int = DEFAULT_CLAIM_LEASE_SECONDS,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Lease one prospect for a direct call (called prospects may be re-called).
+        Returns None if it does not exist or is being dialed under another lease.
+        """
+        claimed = self.claim_prospects([prospect_id], claimed_by, lease_seconds)
+        return claimed[0] if claimed else None
+
+    def claim_prospects(
+        self,
+        prospect_ids: List[str],
+        claimed_by: str,
+        lease_seconds: int = DEFAULT_CLAIM_LEASE_SECONDS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Lease the given prospects for direct calls in one statement. Prospects that
+        do not exist or are being dialed under another lease are left out of the
+        returned dicts.
+        """
+        if not prospect_ids:
+            return []
+        db_session = self._get_session()
+        try:
+            claimable = (
+                select(Prospect.prospect_id)
+                .filter(Prospect.prospect_id.in_(prospect_ids), lease_available(lease_seconds))
+                .order_by(Prospect.prospect_id)
+                .with_for_update(skip_locked=True)
+            )
+            prospects = db_session.scalars(
+                update(Prospect)
+                .where(Prospect.prospect_id.in_(claimable))
+                .values(claimed_at=func.now(), claimed_by=claimed_by)
+                .returning(Prospect)
+                .execution_options(synchronize_session=False)
+            ).all()
+            claimed = [prospect.to_dict() for prospect in prospects]
+            db_session.commit()
+            return claimed
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to claim %d prospects: %s", len(prospect_ids), e)
+            return []
+        finally:
+            db_session.close()
+
+    def release_prospect_claims(self, prospect_ids: List[str], claimed_by: str) -> int:
+        """
+        End the leases `claimed_by` holds on these prospects (e.g. after a failed
+        dial) so they can be claimed again. Leases since taken over are left alone.
+        """
+        if not prospect_ids:
+            return 0
+        db_session = self._get_session()
+        try:
+            result = db_session.execute(
+                update(Prospect)
+                .where(Prospect.prospect_id.in_(prospect_ids), Prospect.claimed_by == claimed_by)
+                .values(claimed_at=None, claimed_by=None)
+                .execution_options(synchronize_session=False)
+            )
+            db_session.commit()
+            return result.rowcount
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to release %d prospect claims: %s", len(prospect_ids), e)
+            return 0
+        finally:
+            db_session.close()
+
     def update_prospect_verification_call(
         self,
         prospect_id: str,
@@ -170,31 +488,49 @@ class DatabaseManager:
         is_relevant_industry: Optional[bool] = None,
     ) -> Optional[Prospect]:
         """
-        Update prospect verification call
+        Update prospect verification call (one UPDATE ... RETURNING round trip)
         """
         db_session = self._get_session()
         try:
-            prospect = (
-                db_session.query(Prospect)
-                .filter(Prospect.prospect_id == prospect_id)
-                .first()
-            )
-            if prospect:
-                prospect.verification_call_summary = call_summary
-                prospect.verification_recording_url = recording_url
-                prospect.is_qualified = is_qualified
-                prospect.is_relevant_industry = is_relevant_industry
-                prospect.is_called = True
-                db_session.commit()
-                return prospect
-            else:
+            prospect = db_session.scalars(
+                verification_call_update(
+                    prospect_id, call_summary, recording_url, is_qualified, is_relevant_industry
+                )
+            ).first()
+            if prospect is not None:
+                # Keep the RETURNING values readable after commit (no refresh SELECT)
+                db_session.expunge(prospect)
+            db_session.commit()
+            if prospect is None:
                 logger.error("Prospect %s not found", prospect_id)
-                return None
+            return prospect
         except Exception as e:
+            db_session.rollback()
             logger.error(
                 "Failed to update prospect verification call %s: %s", prospect_id, e
             )
             return None
+        finally:
+            db_session.close()
+
+    def update_verification_calls(self, outcomes: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """
+        Apply a batch of call outcomes in one statement.
+        Returns the updated prospect IDs, or None on error.
+        """
+        if not outcomes:
+            return []
+        db_session = self._get_session()
+        try:
+            updated = list(db_session.scalars(verification_calls_bulk_update(outcomes)).all())
+            db_session.commit()
+            return updated
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to update %d verification calls: %s", len(outcomes), e)
+            return None
+        finally:
+            db_session.close()
 
     def get_qualified_prospects(
         self, limit: Optional[int] = None, is_qualified: bool = True
@@ -204,8 +540,10 @@ class DatabaseManager:
         """
         db_session = self._get_session()
         try:
-            query = db_session.query(Prospect).filter(
-                Prospect.is_qualified == is_qualified
+            query = (
+                db_session.query(Prospect)
+                .filter(Prospect.is_qualified == is_qualified)
+                .order_by(Prospect.created_at, Prospect.prospect_id)
             )
             if limit:
                 query = query.limit(limit)
@@ -226,7 +564,7 @@ class DatabaseManager:
             query = (
                 db_session.query(Prospect)
                 .filter(Prospect.is_called == True)
-                .order_by(Prospect.updated_at.desc())
+                .order_by(Prospect.updated_at.desc(), Prospect.prospect_id.desc())
             )
             if limit:
                 query = query.limit(limit)
@@ -237,6 +575,94 @@ class DatabaseManager:
         finally:
             db_session.close()
 
+    def list_callable_prospects(
+        self,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> Page:
+        """
+        Page through prospects with phone numbers and not called, oldest first.
+        Keyset on (created_at, prospect_id); raises ValueError for a malformed cursor.
+        Items are LIST_COLUMNS rows (see projections.py), not ORM instances.
+        """
+        db_session = self._get_session()
+        try:
+            query = (
+                db_session.query(*LIST_COLUMNS)
+                .filter(*CALLABLE_PROSPECT)
+            )
+            query = apply_prospect_filters(query, **filters)
+            return keyset_paginate(query, Prospect.created_at, Prospect.prospect_id, page_size, cursor)
+        finally:
+            db_session.close()
+
+    def list_qualified_prospects(
+        self,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> Page:
+        """
+        Page through qualified prospects, oldest first.
+        Keyset on (created_at, prospect_id); raises ValueError for a malformed cursor.
+        Items are LIST_COLUMNS rows.
+        """
+        db_session = self._get_session()
+        try:
+            query = db_session.query(*LIST_COLUMNS).filter(Prospect.is_qualified == True)
+            query = apply_prospect_filters(query, **filters)
+            return keyset_paginate(query, Prospect.created_at, Prospect.prospect_id, page_size, cursor)
+        finally:
+            db_session.close()
+
+    def list_called_prospects(
+        self,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> Page:
+        """
+        Page through called prospects, most recently updated first.
+        Keyset on (updated_at, prospect_id); raises ValueError for a malformed cursor.
+        Items are LIST_COLUMNS rows.
+        """
+        db_session = self._get_session()
+        try:
+            query = db_session.query(*LIST_COLUMNS).filter(Prospect.is_called == True)
+            query = apply_prospect_filters(query, **filters)
+            return keyset_paginate(
+                query, Prospect.updated_at, Prospect.prospect_id, page_size, cursor, descending=True
+            )
+        finally:
+            db_session.close()
+
+    def search_prospects(
+        self,
+        text: str,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> Page:
+        """
+        Full-text search over name, business context and about, best match first.
+        Keyset on (rank, prospect_id); raises ValueError for a malformed cursor.
+        Items are LIST_COLUMNS rows plus `rank`.
+        """
+        tsquery = build_prefix_tsquery(text)
+        if tsquery is None:
+            return {"items": [], "next_cursor": None}
+        condition, rank = search_condition_and_rank(tsquery)
+        db_session = self._get_session()
+        try:
+            query = db_session.query(*LIST_COLUMNS, rank).filter(condition)
+            query = apply_prospect_filters(query, **filters)
+            return keyset_paginate(
+                query, rank, Prospect.prospect_id, page_size, cursor, descending=True
+            )
+        finally:
+            db_session.close()
+
     def get_prospect_by_id(self, prospect_id: str) -> Optional[Prospect]:
         """
         Get prospect by ID
@@ -250,6 +676,717 @@ class DatabaseManager:
         finally:
             db_session.close()
 
+    def get_prospect_detail(self, prospect_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the detail view of a prospect (full about text and call summary) as a dict
+        """
+        db_session = self._get_session()
+        try:
+            row = (
+                db_session.query(*DETAIL_COLUMNS)
+                .filter(Prospect.prospect_id == prospect_id)
+                .first()
+            )
+            return serialize_row(row, DETAIL_COLUMNS)
+        except Exception as e:
+            logger.error("Failed to get prospect detail %s: %s", prospect_id, e)
+            return None
+        finally:
+            db_session.close()
+
+    def callable_country_keys(self) -> List[str]:
+        """Distinct country keys ('' = unknown) among callable prospects"""
+        db_session = self._get_session()
+        try:
+            key = prospect_country_key()
+            return list(db_session.scalars(select(key).filter(*CALLABLE_PROSPECT).distinct()).all())
+        except Exception as e:
+            logger.error("Failed to read callable country keys: %s", e)
+            return []
+        finally:
+            db_session.close()
+
+    def enqueue_callable_prospects(
+        self,
+        campaign_id: str,
+        windows: Dict[str, Tuple[str, datetime, datetime]],
+        limit: Optional[int] = None,
+    ) -> int:
+        """
+        Queue callable prospects that are not already queued or being dialed,
+        highest priority_score first, each with the call window of its country.
+
+        Args:
+            campaign_id: Campaign the entries belong to
+            windows: country key -> (timezone, window_start, window_end); see callable_country_keys
+            limit: Most prospects to queue
+
+        Returns:
+            Number of prospects queued
+        """
+        if not windows:
+            return 0
+        db_session = self._get_session()
+        try:
+            window = values(
+                column("country_key", String),
+                column("timezone", String),
+                column("window_start", DateTime(timezone=True)),
+                column("window_end", DateTime(timezone=True)),
+                name="window",
+            ).data([(key, tz, start, end) for key, (tz, start, end) in windows.items()])
+            already_queued = (
+                select(CallQueueEntry.prospect_id)
+                .where(
+                    CallQueueEntry.prospect_id == Prospect.prospect_id,
+                    CallQueueEntry.status.in_(CALL_QUEUE_ACTIVE),
+                )
+                .exists()
+            )
+            candidates = (
+                select(
+                    Prospect.prospect_id,
+                    func.cast(campaign_id, String),
+                    window.c.timezone,
+                    window.c.window_start,
+                    window.c.window_end,
+                    Prospect.priority_score,
+                )
+                .join(window, window.c.country_key == prospect_country_key())
+                .filter(*CALLABLE_PROSPECT, ~already_queued)
+                .order_by(Prospect.priority_score.desc(), Prospect.created_at, Prospect.prospect_id)
+            )
+            if limit:
+                candidates = candidates.limit(limit)
+
+            statement = pg_insert(CallQueueEntry).from_select(
+                ["prospect_id", "campaign_id", "timezone", "window_start", "window_end", "priority"], candidates
+            )
+            # Re-queue prospects whose earlier entry finished without a call outcome
+            statement = statement.on_conflict_do_update(
+                index_elements=[CallQueueEntry.prospect_id],
+                set_={
+                    "campaign_id": statement.excluded.campaign_id,
+                    "status": "queued",
+                    "timezone": statement.excluded.timezone,
+                    "window_start": statement.excluded.window_start,
+                    "window_end": statement.excluded.window_end,
+                    "priority": statement.excluded.priority,
+                    "attempts": 0,
+                    "last_error": None,
+                    "enqueued_at": func.now(),
+                    "updated_at": func.now(),
+                },
+                where=CallQueueEntry.status.notin_(CALL_QUEUE_ACTIVE),
+            ).returning(CallQueueEntry.prospect_id)
+
+            queued = len(db_session.execute(statement).fetchall())
+            db_session.commit()
+            logger.info("Campaign %s: queued %d prospects", campaign_id, queued)
+            return queued
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to enqueue prospects for campaign %s: %s", campaign_id, e)
+            return 0
+        finally:
+            db_session.close()
+
+    def refresh_priority_scores(self) -> Optional[Dict[str, int]]:
+        """
+        Recompute priority_score for callable prospects from their lead points and
+        the current qualification rates of their country and business context, and
+        carry it onto their queued call_queue entries (see priority.py).
+
+        Returns:
+            {"prospects": n, "queued": m} rows whose score changed, or None on error
+        """
+        db_session = self._get_session()
+        try:
+            prospects, queued = db_session.execute(text(refresh_priority_sql())).one()
+            db_session.commit()
+            logger.info("Refreshed call priority: %d prospects, %d queued calls", prospects, queued)
+            return {"prospects": prospects, "queued": queued}
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to refresh call priority: %s", e)
+            return None
+        finally:
+            db_session.close()
+
+    def sweep_call_queue(self, stale_seconds: int = DEFAULT_DIALING_STALE_SECONDS) -> Dict[str, int]:
+        """
+        Housekeeping before each scheduler pass: skip queued entries whose prospect
+        was called some other way, and return entries stuck in `dialing` for more
+        than stale_seconds (dialer crashed before recording its batch) to the queue.
+        Their prospects stay leased until the claim lease runs out.
+        """
+        db_session = self._get_session()
+        try:
+            already_called = select(Prospect.prospect_id).filter(Prospect.is_called == True)
+            skipped = db_session.execute(
+                update(CallQueueEntry)
+                .where(CallQueueEntry.status == "queued", CallQueueEntry.prospect_id.in_(already_called))
+                .values(status="skipped")
+            ).rowcount
+            recovered = db_session.execute(
+                update(CallQueueEntry)
+                .where(
+                    CallQueueEntry.status == "dialing",
+                    CallQueueEntry.updated_at < func.now() - timedelta(seconds=stale_seconds),
+                )
+                .values(status="queued")
+            ).rowcount
+            db_session.commit()
+            return {"skipped": skipped, "recovered": recovered}
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to sweep call queue: %s", e)
+            return {"skipped": 0, "recovered": 0}
+        finally:
+            db_session.close()
+
+    def expired_queue_timezones(self) -> List[str]:
+        """Timezones of queued entries whose call window has closed"""
+        db_session = self._get_session()
+        try:
+            return list(db_session.scalars(
+                select(CallQueueEntry.timezone)
+                .filter(CallQueueEntry.status == "queued", CallQueueEntry.window_end <= func.now())
+                .distinct()
+            ).all())
+        except Exception as e:
+            logger.error("Failed to read expired call windows: %s", e)
+            return []
+        finally:
+            db_session.close()
+
+    def reschedule_queue_windows(self, windows: Dict[str, Tuple[datetime, datetime]]) -> int:
+        """Move queued entries whose window has closed to the next window of their timezone"""
+        if not windows:
+            return 0
+        db_session = self._get_session()
+        try:
+            window = values(
+                column("timezone", String),
+                column("window_start", DateTime(timezone=True)),
+                column("window_end", DateTime(timezone=True)),
+                name="window",
+            ).data([(tz, start, end) for tz, (start, end) in windows.items()])
+            rescheduled = db_session.execute(
+                update(CallQueueEntry)
+                .where(
+                    CallQueueEntry.timezone == window.c.timezone,
+                    CallQueueEntry.status == "queued",
+                    CallQueueEntry.window_end <= func.now(),
+                )
+                .values(window_start=window.c.window_start, window_end=window.c.window_end)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db_session.commit()
+            return rescheduled
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to reschedule call windows: %s", e)
+            return 0
+        finally:
+            db_session.close()
+
+    def claim_due_queue_entries(
+        self,
+        claimed_by: str,
+        limit: int,
+        lease_seconds: int = DEFAULT_CLAIM_LEASE_SECONDS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Release up to `limit` queued calls whose window is open to the dialer:
+        in one statement, lock them (SKIP LOCKED), mark the queue entries
+        `dialing` and lease their prospects to `claimed_by`. Returns the claimed
+        prospects as dicts; the highest priority due calls are claimed first.
+        """
+        db_session = self._get_session()
+        try:
+            due = (
+                select(CallQueueEntry.prospect_id)
+                .join(Prospect, Prospect.prospect_id == CallQueueEntry.prospect_id)
+                .filter(
+                    CallQueueEntry.status == "queued",
+                    CallQueueEntry.window_start <= func.now(),
+                    CallQueueEntry.window_end > func.now(),
+                    *CALLABLE_PROSPECT,
+                    lease_available(lease_seconds),
+                )
+                .order_by(CallQueueEntry.priority.desc(), CallQueueEntry.window_start, CallQueueEntry.enqueued_at)
+                .limit(limit)
+                .with_for_update(of=[CallQueueEntry, Prospect], skip_locked=True)
+                .cte("due")
+            )
+            dequeued = (
+                update(CallQueueEntry)
+                .where(CallQueueEntry.prospect_id.in_(select(due.c.prospect_id)))
+                .values(status="dialing", attempts=CallQueueEntry.attempts + 1)
+                .cte("dequeued")
+            )
+            prospects = db_session.scalars(
+                update(Prospect)
+                .where(Prospect.prospect_id.in_(select(due.c.prospect_id)))
+                .values(claimed_at=func.now(), claimed_by=claimed_by)
+                .returning(Prospect)
+                .add_cte(dequeued)
+                .execution_options(synchronize_session=False)
+            ).all()
+            claimed = sorted(
+                (prospect.to_dict() for prospect in prospects),
+                key=lambda prospect: prospect["priority_score"],
+                reverse=True,
+            )
+            db_session.commit()
+            return claimed
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to claim due calls: %s", e)
+            return []
+        finally:
+            db_session.close()
+
+    def iter_due_queue_entries(
+        self,
+        claimed_by: str,
+        batch_size: int,
+        lease_seconds: int = DEFAULT_CLAIM_LEASE_SECONDS,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Claim and yield due queued calls batch by batch until none are due.
+        Claiming lazily keeps each lease close to the moment its prospect is dialed.
+        """
+        while True:
+            batch = self.claim_due_queue_entries(claimed_by, batch_size, lease_seconds)
+            if not batch:
+                return
+            yield batch
+
+    def complete_queue_entries(
+        self,
+        results: List[Dict[str, Any]],
+        max_attempts: int,
+        retry_delay_seconds: int = 0,
+    ) -> None:
+        """
+        Record dial results on their `dialing` queue entries: `dialed` on success;
+        on failure back to `queued` (not before retry_delay_seconds from now) until
+        max_attempts, then `failed` with the error.
+        """
+        if not results:
+            return
+        db_session = self._get_session()
+        try:
+            outcome = values(
+                column("prospect_id", String),
+                column("success", Boolean),
+                column("error", String),
+                name="outcome",
+            ).data([
+                (result["prospect_id"], bool(result.get("success")), result.get("error"))
+                for result in results
+                if result.get("prospect_id")
+            ])
+            db_session.execute(
+                update(CallQueueEntry)
+                .where(
+                    CallQueueEntry.prospect_id == outcome.c.prospect_id,
+                    CallQueueEntry.status == "dialing",
+                )
+                .values(
+                    status=case(
+                        (outcome.c.success, "dialed"),
+                        (CallQueueEntry.attempts >= max_attempts, "failed"),
+                        else_="queued",
+                    ),
+                    last_error=outcome.c.error,
+                    window_start=case(
+                        (outcome.c.success, CallQueueEntry.window_start),
+                        else_=func.greatest(
+                            CallQueueEntry.window_start,
+                            func.now() + timedelta(seconds=retry_delay_seconds),
+                        ),
+                    ),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to record %d dial results on the call queue: %s", len(results), e)
+        finally:
+            db_session.close()
+
+    def get_call_queue_summary(self) -> Optional[Dict[str, Any]]:
+        """Entries per status and when the next queued window opens"""
+        db_session = self._get_session()
+        try:
+            counts = dict(
+                db_session.execute(
+                    select(CallQueueEntry.status, func.count()).group_by(CallQueueEntry.status)
+                ).all()
+            )
+            next_window = db_session.scalar(
+                select(func.min(CallQueueEntry.window_start)).filter(CallQueueEntry.status == "queued")
+            )
+            return {
+                "statuses": counts,
+                "next_window_start": next_window.isoformat() if next_window else None,
+            }
+        except Exception as e:
+            logger.error("Failed to summarize call queue: %s", e)
+            return None
+        finally:
+            db_session.close()
+
+    def create_bulk_call(
+        self,
+        batch_id: str,
+        total: int,
+        max_concurrent: Optional[int] = None,
+        calls_per_second: Optional[float] = None,
+    ) -> bool:
+        """Register a bulk call batch for progress polling (finished at once when total is 0)"""
+        db_session = self._get_session()
+        try:
+            db_session.add(BulkCall(
+                batch_id=batch_id,
+                total=total,
+                errors={},
+                max_concurrent=max_concurrent,
+                calls_per_second=calls_per_second,
+                finished_at=None if total else func.now(),
+            ))
+            db_session.commit()
+            return True
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to register bulk call %s: %s", batch_id, e)
+            return False
+        finally:
+            db_session.close()
+
+    def record_bulk_call_results(self, batch_id: str, results: List[Dict[str, Any]]) -> bool:
+        """Add dial results (success, error_type) to a bulk call's counters"""
+        if not results:
+            return True
+        db_session = self._get_session()
+        try:
+            batch = db_session.get(BulkCall, batch_id, with_for_update=True)
+            if batch is None:
+                db_session.rollback()
+                return False
+            failed = [result for result in results if not result.get("success")]
+            errors = dict(batch.errors or {})
+            for result in failed:
+                error_type = result.get("error_type") or "unknown"
+                errors[error_type] = errors.get(error_type, 0) + 1
+            batch.dialed += len(results)
+            batch.initiated += len(results) - len(failed)
+            batch.failed += len(failed)
+            batch.errors = errors
+            if batch.dialed >= batch.total:
+                batch.finished_at = func.now()
+            db_session.commit()
+            return True
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to record results of bulk call %s: %s", batch_id, e)
+            return False
+        finally:
+            db_session.close()
+
+    def finish_bulk_call(self, batch_id: str) -> None:
+        """Mark a bulk call finished (dialer done, even if some results were not recorded)"""
+        db_session = self._get_session()
+        try:
+            db_session.execute(
+                update(BulkCall)
+                .where(BulkCall.batch_id == batch_id, BulkCall.finished_at.is_(None))
+                .values(finished_at=func.now())
+            )
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to finish bulk call %s: %s", batch_id, e)
+        finally:
+            db_session.close()
+
+    def get_bulk_call(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        db_session = self._get_session()
+        try:
+            batch = db_session.get(BulkCall, batch_id)
+            return batch.to_dict() if batch is not None else None
+        except Exception as e:
+            logger.error("Failed to get bulk call %s: %s", batch_id, e)
+            return None
+        finally:
+            db_session.close()
+
+    def enqueue_job(self, kind: str, payload: Dict[str, Any], max_attempts: int = 3) -> Optional[str]:
+        """Queue a background job for the workers. Returns its job_id, or None on error."""
+        db_session = self._get_session()
+        try:
+            job = Job(job_id=str(uuid.uuid4()), kind=kind, payload=payload, max_attempts=max_attempts)
+            db_session.add(job)
+            db_session.commit()
+            logger.info("Queued %s job %s", kind, job.job_id)
+            return job.job_id
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to queue %s job: %s", kind, e)
+            return None
+        finally:
+            db_session.close()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        db_session = self._get_session()
+        try:
+            job = db_session.get(Job, job_id)
+            return job.to_dict() if job is not None else None
+        except Exception as e:
+            logger.error("Failed to get job %s: %s", job_id, e)
+            return None
+        finally:
+            db_session.close()
+
+    def record_job(self, kind: str, result: Dict[str, Any]) -> Optional[str]:
+        """Store work done outside the queue (e.g. a call scheduler pass) as a succeeded job."""
+        db_session = self._get_session()
+        try:
+            job = Job(
+                job_id=str(uuid.uuid4()),
+                kind=kind,
+                status="succeeded",
+                attempts=1,
+                max_attempts=1,
+                result=result,
+                finished_at=func.now(),
+            )
+            db_session.add(job)
+            db_session.commit()
+            return job.job_id
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to record %s job: %s", kind, e)
+            return None
+        finally:
+            db_session.close()
+
+    def get_job_results(
+        self, kinds: List[str], limit: int = 50, run_id: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Results of the most recent succeeded jobs of the given kinds, newest first;
+        with `run_id`, only the job whose result carries that run id.
+        """
+        db_session = self._get_session()
+        try:
+            query = db_session.query(Job.result).filter(
+                Job.status == "succeeded", Job.kind.in_(kinds), Job.result.isnot(None)
+            )
+            if run_id is not None:
+                query = query.filter(Job.result["run_id"].astext == run_id)
+            return [result for (result,) in query.order_by(Job.finished_at.desc()).limit(limit)]
+        except Exception as e:
+            logger.error("Failed to get %s job results: %s", ", ".join(kinds), e)
+            return None
+        finally:
+            db_session.close()
+
+    def requeue_expired_jobs(self, lease_seconds: int) -> int:
+        """
+        Return running jobs whose lease was not renewed (crashed worker) to the
+        queue. A job that has used all its attempts is marked failed instead, so a
+        job that kills its worker is not retried forever.
+        """
+        db_session = self._get_session()
+        try:
+            exhausted = Job.attempts >= Job.max_attempts
+            expired = db_session.execute(
+                update(Job)
+                .where(Job.status == "running", Job.locked_at < func.now() - timedelta(seconds=lease_seconds))
+                .values(
+                    status=case((exhausted, "failed"), else_="queued"),
+                    finished_at=case((exhausted, func.now()), else_=None),
+                    locked_by=None,
+                    locked_at=None,
+                    last_error="Worker lease expired",
+                )
+                .returning(Job.status)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            db_session.commit()
+            requeued = expired.count("queued")
+            if requeued:
+                logger.warning("Requeued %d jobs with expired leases", requeued)
+            if len(expired) > requeued:
+                logger.error("Failed %d jobs whose lease expired on their last attempt", len(expired) - requeued)
+            return requeued
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to requeue expired jobs: %s", e)
+            return 0
+        finally:
+            db_session.close()
+
+    def claim_job(
+        self, worker_id: str, kinds: List[str], limits: Optional[Dict[str, int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Take the oldest ready job of the given kinds (SKIP LOCKED, so workers never
+        take the same job), mark it running and lease it to `worker_id`.
+
+        `limits` caps how many jobs of a kind run at once across all workers; kinds
+        at their cap are skipped. Claims that check limits are serialized with an
+        advisory lock so two workers cannot both take the last slot.
+        """
+        db_session = self._get_session()
+        try:
+            # Queued jobs without attempts left (requeued after their last attempt) are failed, not run
+            db_session.execute(
+                update(Job)
+                .where(Job.status == "queued", Job.kind.in_(kinds), Job.attempts >= Job.max_attempts)
+                .values(
+                    status="failed",
+                    finished_at=func.now(),
+                    locked_by=None,
+                    locked_at=None,
+                    last_error=func.coalesce(Job.last_error, "No attempts left"),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            limited = {kind: cap for kind, cap in (limits or {}).items() if kind in kinds and cap > 0}
+            if limited:
+                db_session.execute(select(func.pg_advisory_xact_lock(JOB_CLAIM_LOCK_KEY)))
+                running = dict(
+                    db_session.execute(
+                        select(Job.kind, func.count())
+                        .filter(Job.status == "running", Job.kind.in_(list(limited)))
+                        .group_by(Job.kind)
+                    ).all()
+                )
+                kinds = [kind for kind in kinds if kind not in limited or running.get(kind, 0) < limited[kind]]
+                if not kinds:
+                    db_session.commit()
+                    return None
+
+            ready = (
+                select(Job.job_id)
+                .filter(
+                    Job.status == "queued",
+                    Job.run_after <= func.now(),
+                    Job.kind.in_(kinds),
+                    Job.attempts < Job.max_attempts,
+                )
+                .order_by(Job.run_after, Job.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = db_session.scalars(
+                update(Job)
+                .where(Job.job_id.in_(ready))
+                .values(
+                    status="running",
+                    attempts=Job.attempts + 1,
+                    locked_by=worker_id,
+                    locked_at=func.now(),
+                )
+                .returning(Job)
+                .execution_options(synchronize_session=False)
+            ).first()
+            claimed = job.to_dict() if job is not None else None
+            db_session.commit()
+            return claimed
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to claim a job: %s", e)
+            return None
+        finally:
+            db_session.close()
+
+    def renew_job_lease(self, job_id: str, worker_id: str) -> bool:
+        """Extend a running job's lease. False if the worker no longer holds it."""
+        db_session = self._get_session()
+        try:
+            renewed = db_session.execute(
+                update(Job)
+                .where(Job.job_id == job_id, Job.status == "running", Job.locked_by == worker_id)
+                .values(locked_at=func.now())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db_session.commit()
+            return bool(renewed)
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to renew lease on job %s: %s", job_id, e)
+            return False
+        finally:
+            db_session.close()
+
+    def finish_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        retry_delay_seconds: int = 60,
+    ) -> Optional[str]:
+        """
+        Record the outcome of a job attempt held by `worker_id`: `succeeded` with
+        its result, or on error back to `queued` (after retry_delay_seconds, doubled
+        per attempt) until max_attempts, then `failed`. Returns the new status, or
+        None if the worker no longer holds the job.
+        """
+        db_session = self._get_session()
+        try:
+            if error is None:
+                changes = {"status": "succeeded", "result": result, "last_error": None, "finished_at": func.now()}
+            else:
+                exhausted = Job.attempts >= Job.max_attempts
+                changes = {
+                    "status": case((exhausted, "failed"), else_="queued"),
+                    "last_error": error,
+                    "run_after": case(
+                        (exhausted, Job.run_after),
+                        else_=func.now() + func.make_interval(
+                            0, 0, 0, 0, 0, 0, retry_delay_seconds * func.power(2, Job.attempts - 1)
+                        ),
+                    ),
+                    "finished_at": case((exhausted, func.now()), else_=None),
+                }
+            status = db_session.scalar(
+                update(Job)
+                .where(Job.job_id == job_id, Job.status == "running", Job.locked_by == worker_id)
+                .values(locked_by=None, locked_at=None, **changes)
+                .returning(Job.status)
+                .execution_options(synchronize_session=False)
+            )
+            db_session.commit()
+            return status
+        except Exception as e:
+            db_session.rollback()
+            logger.error("Failed to record outcome of job %s: %s", job_id, e)
+            return None
+        finally:
+            db_session.close()
+
+    def get_prospect_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get dashboard counters from the prospect_stats table (one small read of
+        the counter shards, independent of the number of prospects)
+        """
+        db_session = self._get_session()
+        try:
+            return summarize_stats(db_session.execute(stats_totals_statement()).all())
+        except Exception as e:
+            logger.error("Failed to get prospect stats: %s", e)
+            return None
+        finally:
+            db_session.close()
+
     def delete_prospect(self, prospect_id: str) -> bool:
         """
         Delete a prospect by ID. Returns True if deleted, False if not found or error.
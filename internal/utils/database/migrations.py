@@ -0,0 +1,431 @@
+"""
+Lightweight schema migrations
+
+`Base.metadata.create_all` only creates missing tables, so changes to existing
+tables (indexes, constraints, columns) are applied here as ordered, idempotent
+SQL migrations. Applied versions are recorded in `schema_migrations`.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from internal.utils.logger import AppLogger
+from internal.utils.database.models import SEARCH_VECTOR_EXPRESSION
+from internal.utils.database.priority import refresh_priority_sql
+
+logger = AppLogger("utils.database.migrations")()
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    statements: List[str]
+    # False for objects create_all does not produce (functions, triggers, data);
+    # those migrations also run on databases created fresh from the models.
+    in_models: bool = True
+
+
+# Counter rows per (dimension, key) in prospect_stats. A writing session updates the
+# shard picked by its backend pid, so concurrent writers rarely wait on the same row
+# lock (every write touches the ('all', '') counters); readers sum the shards.
+STATS_SHARDS = 16
+
+# Counter rows a prospect contributes to in prospect_stats
+_STATS_DIMENSIONS = """
+    CROSS JOIN LATERAL (VALUES
+        ('all', ''),
+        ('country', coalesce(upper(nullif(btrim(r.country_acronym), '')), 'unknown')),
+        ('business_context', coalesce(lower(nullif(btrim(r.business_context), '')), 'unknown'))
+    ) AS d(dimension, key)
+"""
+
+
+# Columns the counters of a prospect are computed from
+_STATS_COLUMNS = ("has_phone", "phones", "is_called", "is_qualified", "country_acronym", "business_context")
+
+
+def _stats_columns(alias: str) -> str:
+    return ", ".join(f"{alias}.{column}" for column in _STATS_COLUMNS)
+
+
+# Updated rows whose counted columns changed. Updates of other columns (dialing
+# claims, priority refreshes) leave no rows, so they write no counters.
+_STATS_UPDATED_ROWS = f"""
+    WITH changed AS (
+        SELECT o.prospect_id FROM old_rows o JOIN new_rows n USING (prospect_id)
+        WHERE ({_stats_columns("o")}) IS DISTINCT FROM ({_stats_columns("n")})
+    )
+    SELECT n.*, 1 AS sign FROM new_rows n JOIN changed USING (prospect_id)
+    UNION ALL
+    SELECT o.*, -1 AS sign FROM old_rows o JOIN changed USING (prospect_id)
+"""
+
+
+def _stats_delta_sql(source: str) -> str:
+    """
+    Upsert counter deltas into prospect_stats. `source` yields prospect rows plus a
+    `sign` column (+1 for rows added, -1 for rows removed). Deltas go to the current
+    session's shard, in key order so concurrent writers lock counter rows in the
+    same order.
+    """
+    return f"""
+    INSERT INTO prospect_stats AS s (dimension, key, shard, total, callable, called, qualified)
+    SELECT * FROM (
+        SELECT
+            d.dimension,
+            d.key,
+            pg_backend_pid() % {STATS_SHARDS} AS shard,
+            sum(r.sign) AS total,
+            coalesce(sum(r.sign) FILTER (
+                WHERE r.has_phone AND cardinality(r.phones) > 0 AND r.is_called IS NOT TRUE
+            ), 0) AS callable,
+            coalesce(sum(r.sign) FILTER (WHERE r.is_called), 0) AS called,
+            coalesce(sum(r.sign) FILTER (WHERE r.is_qualified), 0) AS qualified
+        FROM ({source}) r
+        {_STATS_DIMENSIONS}
+        GROUP BY d.dimension, d.key
+    ) delta
+    WHERE (total, callable, called, qualified) <> (0, 0, 0, 0)
+    ORDER BY dimension, key
+    ON CONFLICT (dimension, key, shard) DO UPDATE SET
+        total = s.total + EXCLUDED.total,
+        callable = s.callable + EXCLUDED.callable,
+        called = s.called + EXCLUDED.called,
+        qualified = s.qualified + EXCLUDED.qualified
+    """
+
+
+def _stats_trigger_function(name: str, source: str) -> str:
+    return f"""
+    CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        {_stats_delta_sql(source)};
+        RETURN NULL;
+    END
+    $$
+    """
+
+
+def _stats_trigger_functions() -> List[str]:
+    return [
+        _stats_trigger_function(
+            "prospect_stats_after_insert", "SELECT n.*, 1 AS sign FROM new_rows n"
+        ),
+        _stats_trigger_function("prospect_stats_after_update", _STATS_UPDATED_ROWS),
+        _stats_trigger_function(
+            "prospect_stats_after_delete", "SELECT o.*, -1 AS sign FROM old_rows o"
+        ),
+    ]
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description="Name lookup index on prospects (unique contact indexes: ensure_identity_indexes)",
+        statements=[
+            # Not unique: different businesses can share a name
+            """
+            CREATE INDEX IF NOT EXISTS idx_prospects_name_key
+            ON prospects (lower(btrim(name)))
+            """,
+        ],
+    ),
+    Migration(
+        version=2,
+        description="Partial indexes for callable, qualified and called prospect lists",
+        statements=[
+            # Predicates mirror the filters in DatabaseManager so the planner can match them
+            """
+            CREATE INDEX IF NOT EXISTS idx_prospects_callable
+            ON prospects (created_at, prospect_id)
+            WHERE has_phone = true AND phones IS NOT NULL AND phones != '' AND is_called = false
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_prospects_qualified
+            ON prospects (created_at, prospect_id)
+            WHERE is_qualified = true
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_prospects_called
+            ON prospects (updated_at, prospect_id)
+            WHERE is_called = true
+            """,
+            "ANALYZE prospects",
+        ],
+    ),
+    Migration(
+        version=3,
+        description="Contact columns as arrays with GIN indexes",
+        statements=[
+            "DROP INDEX IF EXISTS uq_prospects_phones",
+            "DROP INDEX IF EXISTS uq_prospects_emails",
+            "DROP INDEX IF EXISTS idx_prospects_callable",
+            # Legacy values hold one contact, occasionally a comma/semicolon separated list
+            *[
+                f"""
+                ALTER TABLE prospects
+                ALTER COLUMN {column} TYPE text[] USING (
+                    CASE WHEN {column} IS NULL OR btrim({column}) = '' THEN '{{}}'::text[]
+                    ELSE array_remove(regexp_split_to_array(btrim({column}), '\\s*[,;]\\s*'), '')::text[]
+                    END
+                ),
+                ALTER COLUMN {column} SET DEFAULT '{{}}',
+                ALTER COLUMN {column} SET NOT NULL
+                """
+                for column in ("phones", "emails", "websites", "platforms")
+            ],
+            # Splitting can surface a repeated primary contact, so the unique primary
+            # contact indexes are left to ensure_identity_indexes, which reports collisions
+            "CREATE INDEX IF NOT EXISTS idx_prospects_phones_gin ON prospects USING gin (phones)",
+            "CREATE INDEX IF NOT EXISTS idx_prospects_emails_gin ON prospects USING gin (emails)",
+            "CREATE INDEX IF NOT EXISTS idx_prospects_websites_gin ON prospects USING gin (websites)",
+            """
+            CREATE INDEX IF NOT EXISTS idx_prospects_callable
+            ON prospects (created_at, prospect_id)
+            WHERE has_phone = true AND cardinality(phones) > 0 AND is_called = false
+            """,
+            "ANALYZE prospects",
+        ],
+    ),
+    Migration(
+        version=4,
+        description="Generated tsvector over name, business_context and about with a GIN index",
+        statements=[
+            f"""
+            ALTER TABLE prospects
+            ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_prospects_search_vector
+            ON prospects USING gin (search_vector)
+            """,
+            "ANALYZE prospects",
+        ],
+    ),
+    Migration(
+        version=5,
+        description="Incrementally maintained prospect_stats counters (statement-level triggers)",
+        in_models=False,
+        statements=[
+            # Block writers while the counters are rebuilt so none are missed
+            "LOCK TABLE prospects IN SHARE ROW EXCLUSIVE MODE",
+            *_stats_trigger_functions(),
+            """
+            CREATE OR REPLACE FUNCTION prospect_stats_after_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                DELETE FROM prospect_stats;
+                RETURN NULL;
+            END
+            $$
+            """,
+            "DROP TRIGGER IF EXISTS prospect_stats_insert ON prospects",
+            "DROP TRIGGER IF EXISTS prospect_stats_update ON prospects",
+            "DROP TRIGGER IF EXISTS prospect_stats_delete ON prospects",
+            "DROP TRIGGER IF EXISTS prospect_stats_truncate ON prospects",
+            """
+            CREATE TRIGGER prospect_stats_insert AFTER INSERT ON prospects
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION prospect_stats_after_insert()
+            """,
+            """
+            CREATE TRIGGER prospect_stats_update AFTER UPDATE ON prospects
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION prospect_stats_after_update()
+            """,
+            """
+            CREATE TRIGGER prospect_stats_delete AFTER DELETE ON prospects
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION prospect_stats_after_delete()
+            """,
+            """
+            CREATE TRIGGER prospect_stats_truncate AFTER TRUNCATE ON prospects
+            FOR EACH STATEMENT EXECUTE FUNCTION prospect_stats_after_truncate()
+            """,
+            # Backfill from the current rows (prospect_stats itself is created by create_all)
+            "DELETE FROM prospect_stats",
+            _stats_delta_sql("SELECT p.*, 1 AS sign FROM prospects p"),
+        ],
+    ),
+    Migration(
+        version=6,
+        description="Dialing lease columns (claimed_at, claimed_by) for SKIP LOCKED claiming",
+        statements=[
+            "ALTER TABLE prospects ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP WITHOUT TIME ZONE",
+            "ALTER TABLE prospects ADD COLUMN IF NOT EXISTS claimed_by VARCHAR",
+        ],
+    ),
+    Migration(
+        version=7,
+        description="Precomputed call priority on prospects and call_queue, indexed for priority-first dialing",
+        statements=[
+            "ALTER TABLE prospects ADD COLUMN IF NOT EXISTS priority_score DOUBLE PRECISION NOT NULL DEFAULT 0",
+            "ALTER TABLE call_queue ADD COLUMN IF NOT EXISTS priority DOUBLE PRECISION NOT NULL DEFAULT 0",
+            """
+            CREATE INDEX IF NOT EXISTS idx_prospects_callable_priority
+            ON prospects (priority_score DESC, created_at, prospect_id)
+            WHERE has_phone = true AND cardinality(phones) > 0 AND is_called = false
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_call_queue_priority
+            ON call_queue (priority DESC, window_start, enqueued_at)
+            WHERE status = 'queued'
+            """,
+            refresh_priority_sql(),
+            "ANALYZE prospects",
+        ],
+    ),
+]
+
+
+def _ensure_migrations_table(connection) -> None:
+    connection.execute(text(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT now()
+        )
+        """
+    ))
+
+
+def applied_versions(engine: Engine) -> List[int]:
+    with engine.begin() as connection:
+        _ensure_migrations_table(connection)
+        rows = connection.execute(text("SELECT version FROM schema_migrations ORDER BY version"))
+        return [row[0] for row in rows]
+
+
+def stamp_migrations(engine: Engine) -> None:
+    """
+    Record migrations as applied without running them. Used when the tables were
+    just created from the models, which already carry the final schema; migrations
+    with in_models=False are left for run_migrations.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as connection:
+        _ensure_migrations_table(connection)
+        for migration in MIGRATIONS:
+            if not migration.in_models:
+                continue
+            connection.execute(
+                text(
+                    "INSERT INTO schema_migrations (version, description) VALUES (:version, :description) "
+                    "ON CONFLICT (version) DO NOTHING"
+                ),
+                {"version": migration.version, "description": migration.description},
+            )
+
+
+def run_migrations(engine: Engine, target_version: Optional[int] = None) -> List[int]:
+    """
+    Apply pending migrations in order, each in its own transaction.
+
+    Args:
+        engine: SQLAlchemy engine (PostgreSQL only; other dialects are skipped)
+        target_version: Stop after this version (default: apply all)
+
+    Returns:
+        Versions applied by this call
+    """
+    if engine.dialect.name != "postgresql":
+        logger.warning("Skipping migrations for unsupported dialect %s", engine.dialect.name)
+        return []
+
+    done = set(applied_versions(engine))
+    applied: List[int] = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        if target_version is not None and migration.version > target_version:
+            break
+        logger.info("Applying migration %d: %s", migration.version, migration.description)
+        with engine.begin() as connection:
+            for statement in migration.statements:
+                connection.execute(text(statement))
+            connection.execute(
+                text("INSERT INTO schema_migrations (version, description) VALUES (:version, :description)"),
+                {"version": migration.version, "description": migration.description},
+            )
+        applied.append(migration.version)
+
+    if applied:
+        logger.info("Applied migrations: %s", applied)
+    return applied
+
+
+# Unique identity indexes: (name, key expression, predicate). The loader relies on them
+# for INSERT ... ON CONFLICT DO NOTHING; they are built only while no prospects collide.
+IDENTITY_INDEXES = [
+    ("uq_prospects_primary_phone", "(phones[1])", "cardinality(phones) > 0"),
+    ("uq_prospects_primary_email", "(emails[1])", "cardinality(emails) > 0"),
+]
+
+DUPLICATE_REPORT_LIMIT = 50
+
+
+def duplicate_identity_groups(
+    connection, expression: str, predicate: str, limit: int = DUPLICATE_REPORT_LIMIT
+) -> List[Tuple[str, List[str]]]:
+    """(key, prospect_ids oldest first) for identity keys shared by several prospects"""
+    rows = connection.execute(
+        text(
+            f"""
+            SELECT {expression} AS key, array_agg(prospect_id ORDER BY created_at, prospect_id) AS ids
+            FROM prospects
+            WHERE {predicate}
+            GROUP BY 1
+            HAVING count(*) > 1
+            ORDER BY count(*) DESC, 1
+            LIMIT :limit
+            """
+        ),
+        {"limit": limit},
+    )
+    return [(row.key, list(row.ids)) for row in rows]
+
+
+def ensure_identity_indexes(engine: Engine) -> List[str]:
+    """
+    Create the missing unique identity indexes. Prospects are never deleted here:
+    when stored prospects share a key, the groups are logged for someone to merge
+    or correct, and the index is left for a later call (init_db retries on startup).
+
+    Returns:
+        Names of the identity indexes still missing
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+
+    missing: List[str] = []
+    for name, expression, predicate in IDENTITY_INDEXES:
+        with engine.begin() as connection:
+            exists = connection.execute(
+                text("SELECT 1 FROM pg_indexes WHERE indexname = :name"), {"name": name}
+            ).first()
+            if exists:
+                continue
+            groups = duplicate_identity_groups(connection, expression, predicate)
+            if groups:
+                logger.warning(
+                    "Not creating unique index %s: stored prospects share %s. Merge or correct "
+                    "the groups below (at most %d listed); the index is created on a later startup.",
+                    name,
+                    expression,
+                    DUPLICATE_REPORT_LIMIT,
+                )
+                for key, prospect_ids in groups:
+                    logger.warning("  %s %s: %s", name, key, ", ".join(prospect_ids))
+                missing.append(name)
+                continue
+            connection.execute(text(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON prospects ({expression}) WHERE {predicate}"
+            ))
+            logger.info("Created unique index %s", name)
+    return missing
@@ -7,17 +7,31 @@ from typing import Dict, Any
 from datetime import datetime
 from sqlalchemy import (
     Column,
+    Computed,
+    Float,
+    Integer,
+    SmallInteger,
     String,
-    ARRAY,
+    Text,
     Boolean,
     DateTime,
+    ForeignKey,
     Index,
     func,
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
+
+# Text search configuration shared by the search_vector column and search queries
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(business_context, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(about, '')), 'C')"
+)
+
 class Prospect(Base):
     """
     Single source of truth for each unique prospect
@@ -28,10 +42,11 @@ class Prospect(Base):
     prospect_id = Column(String, primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
     about = Column(String, nullable=True)
-    platforms = Column(String, nullable=True)
-    emails = Column(String, nullable=True)
-    phones = Column(String, nullable=True)
-    websites = Column(String, nullable=True)
+    # Contact lists; the first element is the primary contact
+    platforms = Column(ARRAY(Text), nullable=False, default=list, server_default="{}")
+    emails = Column(ARRAY(Text), nullable=False, default=list, server_default="{}")
+    phones = Column(ARRAY(Text), nullable=False, default=list, server_default="{}")
+    websites = Column(ARRAY(Text), nullable=False, default=list, server_default="{}")
     country = Column(String, nullable=True)
     country_acronym = Column(String, nullable=True)
     address = Column(String, nullable=True)
@@ -43,6 +58,19 @@ class Prospect(Base):
     verification_recording_url = Column(String, nullable=True)
     is_qualified = Column(Boolean, default=False)
     is_relevant_industry = Column(Boolean, default=False)
+    # Dialing lease: set when a campaign or call claims the prospect, cleared by
+    # the call outcome; a claim older than the lease timeout may be taken over
+    claimed_at = Column(DateTime, nullable=True)
+    claimed_by = Column(String, nullable=True)
+    # Expected value of calling the prospect (lead points x historical qualification
+    # rate of its country and business context); refreshed in bulk, see priority.py
+    priority_score = Column(Float, nullable=False, default=0.0, server_default="0")
+    # Full-text search document: name (A), business context (B), about (C)
+    search_vector = Column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        nullable=True,
+    )
     created_at = Column(DateTime, nullable=False, server_default=func.now(), default=datetime.now())
     updated_at = Column(
         DateTime, nullable=False, server_default=func.now(), onupdate=func.now(), default=datetime.now()
@@ -51,6 +79,62 @@ class Prospect(Base):
     # Indexes
     __table_args__ = (
         Index("idx_prospects_created_at", "created_at"),
+        # Identity uniqueness on the primary contact; bulk loads rely on these for
+        # INSERT ... ON CONFLICT DO NOTHING (see migrations.ensure_identity_indexes)
+        Index(
+            "uq_prospects_primary_phone",
+            phones[1],
+            unique=True,
+            postgresql_where=(func.cardinality(phones) > 0),
+        ),
+        Index(
+            "uq_prospects_primary_email",
+            emails[1],
+            unique=True,
+            postgresql_where=(func.cardinality(emails) > 0),
+        ),
+        # Name lookups; not unique, different businesses can share a name
+        Index("idx_prospects_name_key", func.lower(func.btrim(name))),
+        # Membership lookups on any contact (phones && ARRAY[...], phones @> ARRAY[...])
+        Index("idx_prospects_phones_gin", "phones", postgresql_using="gin"),
+        Index("idx_prospects_emails_gin", "emails", postgresql_using="gin"),
+        Index("idx_prospects_websites_gin", "websites", postgresql_using="gin"),
+        Index("idx_prospects_search_vector", "search_vector", postgresql_using="gin"),
+        # Hot list queries (see DatabaseManager and migrations.py, version 2)
+        Index(
+            "idx_prospects_callable",
+            "created_at",
+            "prospect_id",
+            postgresql_where=(
+                (has_phone == True)
+                & (func.cardinality(phones) > 0)
+                & (is_called == False)
+            ),
+        ),
+        # Campaign enqueue: callable prospects, highest priority first (migrations.py, version 7)
+        Index(
+            "idx_prospects_callable_priority",
+            priority_score.desc(),
+            "created_at",
+            "prospect_id",
+            postgresql_where=(
+                (has_phone == True)
+                & (func.cardinality(phones) > 0)
+                & (is_called == False)
+            ),
+        ),
+        Index(
+            "idx_prospects_qualified",
+            "created_at",
+            "prospect_id",
+            postgresql_where=(is_qualified == True),
+        ),
+        Index(
+            "idx_prospects_called",
+            "updated_at",
+            "prospect_id",
+            postgresql_where=(is_called == True),
+        ),
     )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -59,10 +143,10 @@ class Prospect(Base):
             "prospect_id": str(self.prospect_id),
             "name": self.name,
             "about": self.about,
-            "platforms": self.platforms,
-            "emails": self.emails,
-            "phones": self.phones,
-            "websites": self.websites,
+            "platforms": list(self.platforms or []),
+            "emails": list(self.emails or []),
+            "phones": list(self.phones or []),
+            "websites": list(self.websites or []),
             "country": self.country,
             "country_acronym": self.country_acronym or None,
             "address": self.address,
@@ -74,6 +158,238 @@ class Prospect(Base):
             "verification_recording_url": self.verification_recording_url,
             "is_qualified": self.is_qualified,
             "is_relevant_industry": self.is_relevant_industry,
+            "priority_score": self.priority_score,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class ProspectStats(Base):
+    """
+    Pre-aggregated prospect counters for the dashboard
+
+    Counters per (dimension, key): ('all', ''), ('country', <acronym>) and
+    ('business_context', <label>), split over up to STATS_SHARDS `shard` rows
+    that are summed on read. Maintained by statement-level triggers on
+    prospects (see migrations.py, version 5), so every write path
+    updates them in the same transaction.
+    """
+
+    __tablename__ = "prospect_stats"
+
+    dimension = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, default=0, server_default="0")
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    callable = Column(Integer, nullable=False, default=0, server_default="0")
+    called = Column(Integer, nullable=False, default=0, server_default="0")
+    qualified = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert model to dictionary"""
+        return {
+            "key": self.key,
+            "total": self.total,
+            "callable": self.callable,
+            "called": self.called,
+            "qualified": self.qualified,
+        }
+
+
+class CallQueueEntry(Base):
+    """
+    Durable cold-call queue: one row per prospect waiting to be (or being) dialed
+
+    window_start/window_end bound the current business-hours window in the
+    prospect's timezone; the call scheduler releases an entry to the dialer only
+    inside it and moves it to the next window once it has passed.
+    Status: queued -> dialing -> dialed | failed (or skipped if the prospect was
+    called some other way first); failed dials go back to queued until
+    max_attempts.
+    """
+
+    __tablename__ = "call_queue"
+
+    prospect_id = Column(
+        String, ForeignKey("prospects.prospect_id", ondelete="CASCADE"), primary_key=True
+    )
+    campaign_id = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="queued", server_default="queued")
+    timezone = Column(String, nullable=False)
+    window_start = Column(DateTime(timezone=True), nullable=False)
+    window_end = Column(DateTime(timezone=True), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    # Copy of the prospect's priority_score; due entries are dialed highest first
+    priority = Column(Float, nullable=False, default=0.0, server_default="0")
+    last_error = Column(String, nullable=True)
+    enqueued_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        # Next window to open (queue summary)
+        Index(
+            "idx_call_queue_due",
+            "window_start",
+            "enqueued_at",
+            postgresql_where=(status == "queued"),
+        ),
+        # Scheduler claim: queued entries whose window has opened, highest priority first
+        Index(
+            "idx_call_queue_priority",
+            priority.desc(),
+            "window_start",
+            "enqueued_at",
+            postgresql_where=(status == "queued"),
+        ),
+    )
+
+
+class WebhookInboxEvent(Base):
+    """
+    Inbox of Retell call_analyzed webhooks, one row per call
+
+    The webhook handler only appends the raw call payload here (INSERT ... ON
+    CONFLICT DO NOTHING on call_id, so Retell retries are ignored) and acks;
+    the inbox consumer applies pending events to prospects in batches and
+    stamps processed_at. Events survive restarts until applied.
+    """
+
+    __tablename__ = "webhook_inbox"
+
+    call_id = Column(String, primary_key=True)
+    event = Column(String, nullable=False)
+    prospect_id = Column(String, nullable=True)
+    payload = Column(JSONB, nullable=False)
+    received_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    error = Column(String, nullable=True)
+
+    __table_args__ = (
+        # Consumer scan: pending events, oldest first
+        Index(
+            "idx_webhook_inbox_pending",
+            "received_at",
+            postgresql_where=(processed_at.is_(None)),
+        ),
+    )
+
+
+class BulkCall(Base):
+    """
+    Progress of a bulk call (/calls/bulk), one row per batch
+
+    Counters are incremented as each chunk of calls is dialed, so any API
+    process can report progress, and it survives restarts. finished_at is set
+    once every claimed prospect has been dialed.
+    """
+
+    __tablename__ = "bulk_calls"
+
+    batch_id = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    dialed = Column(Integer, nullable=False, default=0, server_default="0")
+    initiated = Column(Integer, nullable=False, default=0, server_default="0")
+    failed = Column(Integer, nullable=False, default=0, server_default="0")
+    # error type -> count
+    errors = Column(JSONB, nullable=False, default=dict, server_default="{}")
+    max_concurrent = Column(Integer, nullable=True)
+    calls_per_second = Column(Float, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert model to dictionary (the /calls/bulk/{batch_id} payload)"""
+        end = self.finished_at or self.updated_at
+        elapsed = (end - self.started_at).total_seconds() if end and self.started_at else 0.0
+        return {
+            "batch_id": self.batch_id,
+            "status": "finished" if self.finished_at else "running",
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "max_concurrent": self.max_concurrent,
+            "calls_per_second": self.calls_per_second,
+            "total": self.total,
+            "dialed": self.dialed,
+            "initiated": self.initiated,
+            "failed": self.failed,
+            "failure_rate": round(100.0 * self.failed / self.dialed, 2) if self.dialed else 0.0,
+            "errors": self.errors or {},
+            "throughput_per_second": round(self.dialed / elapsed, 3) if elapsed > 0 else 0.0,
+        }
+
+
+class Job(Base):
+    """
+    Durable background job (pipeline run, cold call campaign) executed by
+    worker processes (worker.py)
+
+    Status: queued -> running -> succeeded | failed. A worker claims a job with
+    SKIP LOCKED and holds a lease (locked_by/locked_at) that it renews while
+    the job runs; a job whose lease expired (crashed worker) is queued again.
+    Failed attempts are retried after run_after until max_attempts.
+    """
+
+    __tablename__ = "jobs"
+
+    job_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict, server_default="{}")
+    status = Column(String, nullable=False, default="queued", server_default="queued")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=3, server_default="3")
+    run_after = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    result = Column(JSONB, nullable=True)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Worker claim: queued jobs that are ready, oldest first
+        Index(
+            "idx_jobs_ready",
+            "run_after",
+            "created_at",
+            postgresql_where=(status == "queued"),
+        ),
+        # Lease sweep: running jobs by lease age
+        Index(
+            "idx_jobs_running",
+            "locked_at",
+            postgresql_where=(status == "running"),
+        ),
+        # Recent results per kind (LLM usage, campaign metrics)
+        Index(
+            "idx_jobs_succeeded",
+            "kind",
+            "finished_at",
+            postgresql_where=(status == "succeeded"),
+        ),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert model to dictionary"""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "payload": self.payload,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "run_after": self.run_after.isoformat() if self.run_after else None,
+            "locked_by": self.locked_by,
+            "result": self.result,
+            "last_error": self.last_error,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
         }
@@ -0,0 +1,122 @@
+"""
+Keyset (cursor) pagination helpers
+
+Pages are ordered by a timestamp column (or a search rank) plus prospect_id as
+a tiebreaker and continue from the last row seen, so every page is an index
+range scan no matter how deep the client pages (no OFFSET).
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, TypedDict, Union
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class Page(TypedDict):
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+def clamp_page_size(page_size: Optional[int]) -> int:
+    if not page_size or page_size < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(page_size, MAX_PAGE_SIZE)
+
+
+SortValue = Union[datetime, float]
+
+
+def encode_cursor(sort_value: SortValue, row_id: str) -> str:
+    """Timestamps are encoded as ISO strings, ranks as numbers."""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[SortValue, str]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if isinstance(sort_value, str):
+            sort_value = datetime.fromisoformat(sort_value)
+        elif not isinstance(sort_value, (int, float)) or isinstance(sort_value, bool):
+            raise TypeError(f"Unsupported sort value {sort_value!r}")
+        return sort_value, str(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_statement(
+    statement,
+    sort_column,
+    id_column,
+    page_size: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+):
+    """
+    Add the keyset bound, ordering and limit (page_size + 1, to detect a next
+    page) to a Query or a 2.0-style select().
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        position = tuple_(sort_column, id_column)
+        bound = tuple_(sort_value, row_id)
+        statement = statement.filter(position < bound if descending else position > bound)
+
+    if descending:
+        statement = statement.order_by(sort_column.desc(), id_column.desc())
+    else:
+        statement = statement.order_by(sort_column, id_column)
+    return statement.limit(page_size + 1)
+
+
+def build_page(rows: List[Any], page_size: int, sort_attr: str, id_attr: str) -> Page:
+    """Trim the look-ahead row fetched by keyset_statement and derive next_cursor."""
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_attr), getattr(last, id_attr))
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def keyset_paginate(
+    query: Query,
+    sort_column,
+    id_column,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    sort_attr: Optional[str] = None,
+    id_attr: Optional[str] = None,
+) -> Page:
+    """
+    Apply keyset ordering/filtering to `query` and fetch one page.
+
+    Args:
+        query: Filtered query (no ORDER BY / LIMIT)
+        sort_column: Column or labelled expression to order by (e.g. Prospect.created_at)
+        id_column: Unique tiebreaker column (e.g. Prospect.prospect_id)
+        page_size: Rows per page (clamped to MAX_PAGE_SIZE)
+        cursor: next_cursor from the previous page
+        descending: Newest first
+        sort_attr / id_attr: Attribute names to read from result rows
+            (default: the column keys)
+
+    Returns:
+        Page with the rows and the cursor for the next page (None on the last page)
+    """
+    page_size = clamp_page_size(page_size)
+    query = keyset_statement(query, sort_column, id_column, page_size, cursor, descending)
+    return build_page(
+        query.all(), page_size, sort_attr or sort_column.key, id_attr or id_column.key
+    )
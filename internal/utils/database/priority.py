@@ -0,0 +1,109 @@
+"""
+Call priority scoring
+
+A prospect's priority_score estimates how much a call to it is worth:
+
+    lead points (calculate_points, 0..1) x likelihood the call qualifies
+
+The likelihood is the mean of the historical outcome rates of the prospect's
+country and of its business context, taken over called prospects (qualified
+= 1, relevant industry only = RELEVANT_INDUSTRY_CREDIT, else 0). Each rate is
+smoothed towards the overall rate with PRIOR_CALLS pseudo-calls, so a segment
+with few calls scores close to average instead of 0 or 1; with no call history
+at all every segment sits at 0.5 and the ranking follows lead points.
+
+Scores are precomputed for callable prospects (and copied onto their queued
+call_queue entries) by one set-based UPDATE, so ranking costs nothing per
+request; rows whose score did not change are not written.
+"""
+
+from internal.domain.common.scoring import CONTACT_POINTS, PROFILE_POINTS
+
+# Pseudo-calls at the overall rate added to every segment
+PRIOR_CALLS = 10
+# Outcome credited to a call that was in a relevant industry but did not qualify
+RELEVANT_INDUSTRY_CREDIT = 0.5
+
+# Segment keys; same normalisation as the prospect_stats dimensions
+COUNTRY_KEY = "coalesce(upper(nullif(btrim({t}.country_acronym), '')), '')"
+CONTEXT_KEY = "coalesce(lower(nullif(btrim({t}.business_context), '')), '')"
+
+_CONTACT_COLUMNS = {"email": "emails", "phone": "phones", "website": "websites"}
+_PROFILE_COLUMNS = {"country": "country", "business_context": "business_context", "about": "about"}
+
+
+def lead_points_sql(t: str = "p") -> str:
+    """calculate_points over the stored columns of prospect alias `t`"""
+    has_contact = " OR ".join(
+        f"cardinality({t}.{_CONTACT_COLUMNS[field]}) > 0" for field in CONTACT_POINTS
+    )
+    points = [
+        f"CASE WHEN cardinality({t}.{_CONTACT_COLUMNS[field]}) > 0 THEN {value!r} ELSE 0 END"
+        for field, value in CONTACT_POINTS.items()
+    ] + [
+        f"CASE WHEN nullif(btrim({t}.{_PROFILE_COLUMNS[field]}), '') IS NOT NULL THEN {value!r} ELSE 0 END"
+        for field, value in PROFILE_POINTS.items()
+    ]
+    return f"CASE WHEN {has_contact} THEN {' + '.join(points)} ELSE 0 END"
+
+
+def _smoothed_rate(segment: str) -> str:
+    return (
+        f"(coalesce({segment}.hits, 0) + {PRIOR_CALLS} * overall.rate)"
+        f" / (coalesce({segment}.calls, 0) + {PRIOR_CALLS})"
+    )
+
+
+def refresh_priority_sql() -> str:
+    """
+    Recompute priority_score of callable prospects and the priority of their
+    queued call_queue entries. Returns one row: (prospects_updated, queue_updated).
+    """
+    return f"""
+    WITH called AS (
+        SELECT
+            {COUNTRY_KEY.format(t="c")} AS country_key,
+            {CONTEXT_KEY.format(t="c")} AS context_key,
+            CASE
+                WHEN c.is_qualified THEN 1.0
+                WHEN c.is_relevant_industry THEN {RELEVANT_INDUSTRY_CREDIT!r}
+                ELSE 0.0
+            END AS outcome
+        FROM prospects c
+        WHERE c.is_called = true
+    ),
+    overall AS (
+        SELECT (coalesce(sum(outcome), 0) + 1) / (count(*) + 2) AS rate FROM called
+    ),
+    by_country AS (
+        SELECT country_key, sum(outcome) AS hits, count(*) AS calls FROM called GROUP BY country_key
+    ),
+    by_context AS (
+        SELECT context_key, sum(outcome) AS hits, count(*) AS calls FROM called GROUP BY context_key
+    ),
+    scored AS (
+        SELECT
+            p.prospect_id,
+            (({lead_points_sql("p")}) * ({_smoothed_rate("bc")} + {_smoothed_rate("bx")}) / 2)::float8 AS score
+        FROM prospects p
+        CROSS JOIN overall
+        LEFT JOIN by_country bc ON bc.country_key = {COUNTRY_KEY.format(t="p")}
+        LEFT JOIN by_context bx ON bx.context_key = {CONTEXT_KEY.format(t="p")}
+        WHERE p.has_phone = true AND cardinality(p.phones) > 0 AND p.is_called = false
+    ),
+    prospects_updated AS (
+        UPDATE prospects p SET priority_score = s.score
+        FROM scored s
+        WHERE p.prospect_id = s.prospect_id AND p.priority_score IS DISTINCT FROM s.score
+        RETURNING p.prospect_id
+    ),
+    queue_updated AS (
+        UPDATE call_queue q SET priority = s.score
+        FROM scored s
+        WHERE q.prospect_id = s.prospect_id AND q.status = 'queued' AND q.priority IS DISTINCT FROM s.score
+        RETURNING q.prospect_id
+    )
+    SELECT
+        (SELECT count(*) FROM prospects_updated),
+        (SELECT count(*) FROM queue_updated)
+    """
@@ -0,0 +1,97 @@
+"""
+Column projections for prospect reads
+
+List endpoints select only the columns their view renders into plain rows (no
+ORM instances, no identity map) and serialize them with a precomputed plan.
+Long text is left to the detail projection: lists carry a short `about`
+preview and no call summary.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import DateTime, func
+
+from internal.utils.database.models import Prospect
+
+ABOUT_PREVIEW_CHARS = 160
+
+LIST_COLUMNS = (
+    Prospect.prospect_id,
+    Prospect.name,
+    func.left(Prospect.about, ABOUT_PREVIEW_CHARS).label("about"),
+    (func.length(Prospect.about) > ABOUT_PREVIEW_CHARS).label("about_truncated"),
+    Prospect.platforms,
+    Prospect.emails,
+    Prospect.phones,
+    Prospect.websites,
+    Prospect.country,
+    func.nullif(Prospect.country_acronym, "").label("country_acronym"),
+    Prospect.address,
+    Prospect.business_context,
+    Prospect.has_phone,
+    Prospect.has_email,
+    Prospect.is_called,
+    Prospect.verification_recording_url,
+    Prospect.is_qualified,
+    Prospect.is_relevant_industry,
+    Prospect.created_at,
+    Prospect.updated_at,
+)
+
+DETAIL_COLUMNS = (
+    Prospect.prospect_id,
+    Prospect.name,
+    Prospect.about,
+    Prospect.platforms,
+    Prospect.emails,
+    Prospect.phones,
+    Prospect.websites,
+    Prospect.country,
+    func.nullif(Prospect.country_acronym, "").label("country_acronym"),
+    Prospect.address,
+    Prospect.business_context,
+    Prospect.has_phone,
+    Prospect.has_email,
+    Prospect.is_called,
+    Prospect.verification_call_summary,
+    Prospect.verification_recording_url,
+    Prospect.is_qualified,
+    Prospect.is_relevant_industry,
+    Prospect.priority_score,
+    Prospect.created_at,
+    Prospect.updated_at,
+)
+
+
+def _column_keys(columns: Sequence[Any]) -> List[str]:
+    """Result keys of the projected columns; plain strings name extra result columns."""
+    return [column if isinstance(column, str) else column.key for column in columns]
+
+
+def serialize_rows(rows: Iterable[Sequence[Any]], columns: Sequence[Any] = LIST_COLUMNS) -> List[Dict[str, Any]]:
+    """
+    Serialize projected rows to JSON-ready dicts.
+
+    Keys and the positions needing conversion are worked out once per call, so
+    the per-row cost is a zip plus an isoformat for the timestamp columns.
+    """
+    keys = _column_keys(columns)
+    timestamp_positions = [
+        i for i, column in enumerate(columns)
+        if isinstance(getattr(column, "type", None), DateTime)
+    ]
+    serialized = []
+    for row in rows:
+        values = list(row)
+        for i in timestamp_positions:
+            value = values[i]
+            if value is not None:
+                values[i] = value.isoformat()
+        serialized.append(dict(zip(keys, values)))
+    return serialized
+
+
+def serialize_row(row: Optional[Sequence[Any]], columns: Sequence[Any] = DETAIL_COLUMNS) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    return serialize_rows([row], columns)[0]
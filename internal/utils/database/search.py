@@ -0,0 +1,40 @@
+"""
+Full-text prospect search helpers
+
+Queries run against the generated `search_vector` column (GIN indexed). Each
+search term is matched as a prefix so partially typed names still hit, and
+results are ranked with ts_rank using the A/B/C weights of name, business
+context and about.
+"""
+
+import re
+from typing import Optional
+
+from sqlalchemy import func
+
+from internal.utils.database.models import Prospect, SEARCH_CONFIG
+
+SEARCH_TERM_REGEX = re.compile(r"\w+", re.UNICODE)
+MAX_SEARCH_TERMS = 8
+
+
+def build_prefix_tsquery(text: Optional[str]) -> Optional[str]:
+    """
+    Turn free text into a to_tsquery expression matching every term as a prefix
+    (e.g. "zenith bdc lag" -> "zenith:* & bdc:* & lag:*"). None when there is
+    nothing to search for. Terms are reduced to word characters, so operators in
+    user input can't break the query.
+    """
+    terms = SEARCH_TERM_REGEX.findall((text or "").lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def search_condition_and_rank(tsquery: str):
+    """WHERE condition and rank expression (labelled "rank") for a prefix tsquery."""
+    query = func.to_tsquery(SEARCH_CONFIG, tsquery)
+    return (
+        Prospect.search_vector.op("@@")(query),
+        func.ts_rank(Prospect.search_vector, query).label("rank"),
+    )
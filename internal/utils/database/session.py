@@ -2,22 +2,28 @@
 Database session management
 """
 
+import ssl
 from contextlib import contextmanager, asynccontextmanager
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator, Tuple
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 
 from internal.utils.logger import AppLogger
 from internal.config.secret import SecretManager
 from internal.utils.database.models import Base
+from internal.utils.database.migrations import ensure_identity_indexes, run_migrations, stamp_migrations
 
 logger = AppLogger("utils.database.session")()
 
 # Global engine and session factory
 _engine = None
 _SessionLocal = None
+_async_engine = None
+_AsyncSessionLocal = None
 
 
 def get_engine():
@@ -91,6 +97,132 @@ def get_session() -> Generator[Session, None, None]:
         session.close()
 
 
+# libpq-only query parameters asyncpg does not accept as connect arguments
+_LIBPQ_ONLY_PARAMS = ("channel_binding", "gssencmode", "sslcompression")
+
+
+def asyncpg_connect_args(url: URL) -> Tuple[URL, Dict[str, Any]]:
+    """
+    Move libpq SSL settings of a PG_URI into asyncpg connect arguments.
+
+    asyncpg rejects `sslmode` and the other libpq query parameters, so they are
+    stripped from the URL: `sslmode` becomes asyncpg's `ssl` (it takes the same
+    mode names), or an SSLContext when `sslrootcert`/`sslcert` point at files.
+    `connect_timeout` becomes `timeout`.
+    """
+    query = dict(url.query)
+    sslmode = query.pop("sslmode", None)
+    rootcert = query.pop("sslrootcert", None)
+    cert = query.pop("sslcert", None)
+    key = query.pop("sslkey", None)
+    connect_timeout = query.pop("connect_timeout", None)
+    for param in _LIBPQ_ONLY_PARAMS:
+        query.pop(param, None)
+
+    connect_args: Dict[str, Any] = {}
+    if sslmode and sslmode != "disable" and (rootcert or cert):
+        context = ssl.create_default_context(cafile=rootcert)
+        if sslmode in ("verify-ca", "verify-full"):
+            context.check_hostname = sslmode == "verify-full"
+        else:
+            # require/prefer/allow encrypt without verifying the server
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        if cert:
+            context.load_cert_chain(cert, key)
+        connect_args["ssl"] = context
+    elif sslmode:
+        connect_args["ssl"] = sslmode
+    if connect_timeout:
+        connect_args["timeout"] = float(connect_timeout)
+    return url.set(query=query), connect_args
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get or create the asyncpg-backed engine used by async request handlers.
+
+    Built from the same PG_URI as the sync engine with the driver swapped, so
+    both point at the same database (libpq SSL parameters are translated by
+    asyncpg_connect_args). Its pool is separate from the sync one.
+    """
+    global _async_engine
+    if _async_engine is None:
+        connection_string = SecretManager.PG_URI
+        if not connection_string:
+            raise ValueError("PostgreSQL connection string (PG_URI) is required")
+
+        url, connect_args = asyncpg_connect_args(
+            make_url(connection_string).set(drivername="postgresql+asyncpg")
+        )
+        _async_engine = create_async_engine(
+            url,
+            connect_args=connect_args,
+            pool_size=10,
+            max_overflow=20,
+            pool_pre_ping=True,
+            echo=False
+        )
+        logger.info("Async database engine created")
+
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """Get or create async session factory"""
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        logger.info("Async session factory created")
+
+    return _AsyncSessionLocal
+
+
+async def inject_async_session() -> AsyncGenerator[AsyncSession, None]:
+    AsyncSessionLocal = get_async_session_factory()
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+@asynccontextmanager
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get an async database session context manager
+
+    Usage:
+        async with get_async_session() as session:
+            # Use session here
+            pass
+    """
+    AsyncSessionLocal = get_async_session_factory()
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def dispose_async_engine():
+    """Close the async engine's pooled connections (call on app shutdown)."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
+        logger.info("Async database engine disposed")
+
+
 def init_db(drop_existing: bool = False):
     """
     Initialize database tables
@@ -104,7 +236,15 @@ def init_db(drop_existing: bool = False):
         logger.warning("Dropping all existing tables...")
         Base.metadata.drop_all(engine)
     
+    # Tables created from scratch already match the models; only existing ones need migrating
+    fresh = not inspect(engine).has_table("prospects")
+
     logger.info("Creating database tables...")
     Base.metadata.create_all(engine)
     logger.info("Database tables created successfully")
 
+    if fresh:
+        stamp_migrations(engine)
+    run_migrations(engine)
+    ensure_identity_indexes(engine)
+
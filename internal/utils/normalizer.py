@@ -95,8 +95,30 @@ def urls_equal(url1: str, url2: str) -> bool:
     return normalize_url(url1) == normalize_url(url2)
 
 
+# Digits in a full international number (E.164 allows at most 15)
+E164_MIN_DIGITS = 8
+E164_MAX_DIGITS = 15
+
+
 def normalize_phone(phone: str, country_acronym: str) -> Optional[str]:
-    if not phone or not country_acronym:
+    """
+    E.164 form of a phone number. A number written internationally (+ or 00 prefix)
+    keeps its own country code whatever `country_acronym` says; a national number
+    needs the country to be normalized.
+    """
+    if not phone:
+        return None
+    phone = phone.strip()
+    if phone.startswith(("+", "00")):
+        # "+234 (0) 803 ..." carries an optional trunk 0 that is not dialed internationally
+        digits = DIGITS_ONLY.sub("", phone.replace("(0)", ""))
+        if phone.startswith("00"):
+            digits = digits[2:]
+        if E164_MIN_DIGITS <= len(digits) <= E164_MAX_DIGITS:
+            return f"+{digits}"
+        return None
+
+    if not country_acronym:
         return None
     digits = DIGITS_ONLY.sub("", phone)
 
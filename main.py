@@ -2,6 +2,11 @@ from internal.config.secret import validate_environment, SecretManager
 from internal.config.paths_config import CLIENT_DIR
 
 from server.controller import router
+from internal.utils.database.session import dispose_async_engine
+from internal.domain.service import (
+    start_webhook_consumer,
+    stop_webhook_consumer,
+)
 
   
 from contextlib import asynccontextmanager
@@ -17,9 +22,14 @@ validate_environment(
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-  
+    # The call scheduler runs in the workers (worker.py), not in every web process
+    start_webhook_consumer()
+
     yield
 
+    await stop_webhook_consumer()
+    await dispose_async_engine()
+
 
 app = FastAPI(title="Akwaya - Your Lead Generation Engine", lifespan=lifespan)
 
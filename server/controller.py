@@ -1,18 +1,31 @@
-from fastapi import (APIRouter, BackgroundTasks, Depends, Request)
+from typing import Annotated
+
+from fastapi import (APIRouter, BackgroundTasks, Depends, Query, Request)
 from fastapi.responses import JSONResponse
-from .dto import PipelineRequest, CallRequest, ColdCallCampaignRequest
+from .dto import PipelineRequest, CallRequest, BulkCallRequest, ColdCallCampaignRequest, ProspectListQuery, ProspectSearchQuery
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-from internal.utils.database.session import inject_session
+from internal.utils.database.session import inject_session, inject_async_session
 from internal.utils.database.manager import DatabaseManager
+from internal.utils.database.async_manager import AsyncDatabaseManager
+from internal.utils.database.projections import LIST_COLUMNS, serialize_rows
 
 from internal.domain.service import (
-    run_leads_acquisition_pipeline,
-    update_leads_with_feedback,
-    retrieve_qualified_leads,
+    queue_leads_pipeline,
+    queue_cold_call_campaign,
+    retrieve_job,
+    ingest_call_event,
+    retrieve_qualified_leads_async,
+    claim_prospect_for_call,
     call_prospect,
-    run_cold_call_campaign,
+    start_bulk_call,
+    run_bulk_call,
+    retrieve_bulk_call,
+    retrieve_call_queue_summary,
+    retrieve_campaign_metrics,
+    retrieve_llm_usage,
 )
 from internal.utils.logger import AppLogger
 
@@ -20,26 +33,113 @@ controller_logger = AppLogger("server.controller")()
 
 router = APIRouter(prefix="/api/v1")
 
+# Search rows are the list projection plus their rank
+SEARCH_RESULT_COLUMNS = (*LIST_COLUMNS, "rank")
+
 @router.post("/leads/pipeline")
-def acquisition_pipeline(request: PipelineRequest, background_tasks: BackgroundTasks):
-    background_tasks.add_task(run_leads_acquisition_pipeline, request.query)
-    return JSONResponse({"message": "Pipeline triggered successfully"})
+def acquisition_pipeline(request: PipelineRequest, db: Session = Depends(inject_session)):
+    """Queue a pipeline run; a worker process (worker.py) executes it. Poll /jobs/{job_id}."""
+    job_id = queue_leads_pipeline(DatabaseManager(db), request.query)
+    if job_id is None:
+        return JSONResponse({"message": "Error queueing pipeline"}, status_code=500)
+    return JSONResponse({"message": "Pipeline queued", "job_id": job_id})
+
+
+@router.get("/jobs/{job_id}")
+def fetch_job(job_id: str, db: Session = Depends(inject_session)):
+    """Background job status (queued/running/succeeded/failed), attempts, result and last error."""
+    job = retrieve_job(DatabaseManager(db), job_id)
+    if job is None:
+        return JSONResponse({"message": "Job not found"}, status_code=404)
+    return JSONResponse({"job": job})
+
+
+@router.get("/llm/usage")
+def fetch_llm_usage(db: Session = Depends(inject_session)):
+    """LLM calls, tokens, latency and estimated cost per stage for recent pipeline runs."""
+    usage = retrieve_llm_usage(DatabaseManager(db))
+    if usage is None:
+        return JSONResponse({"message": "Error fetching LLM usage"}, status_code=500)
+    return JSONResponse(usage)
+
+
+@router.get("/llm/usage/{run_id}")
+def fetch_llm_usage_for_run(run_id: str, db: Session = Depends(inject_session)):
+    usage = retrieve_llm_usage(DatabaseManager(db), run_id)
+    if usage is None:
+        return JSONResponse({"message": "Run not found"}, status_code=404)
+    return JSONResponse(usage)
+
+
+@router.get("/stats")
+async def fetch_stats(db: AsyncSession = Depends(inject_async_session)):
+    """Prospect counters (total, callable, called, qualified), overall and per country / business context."""
+    try:
+        stats = await AsyncDatabaseManager(db).get_prospect_stats()
+        if stats is None:
+            return JSONResponse({"message": "Error fetching stats"}, status_code=500)
+        return JSONResponse(stats)
+    except Exception as e:
+        controller_logger.error(f"Error fetching stats: {e}")
+        return JSONResponse({"message": "Error fetching stats"}, status_code=500)
 
 
 @router.get("/prospects")
-def fetch_prospects_with_phones(db: Session = Depends(inject_session)):
+async def fetch_prospects_with_phones(
+    params: Annotated[ProspectListQuery, Query()],
+    db: AsyncSession = Depends(inject_async_session),
+):
     try:
-        prospects = DatabaseManager(db).get_prospects_with_phones()
-        return JSONResponse({"prospects": [p.to_dict() for p in prospects]})
+        page = await AsyncDatabaseManager(db).list_callable_prospects(params.limit, params.cursor, **params.filters())
+        return JSONResponse({
+            "prospects": serialize_rows(page["items"]),
+            "next_cursor": page["next_cursor"],
+        })
+    except ValueError as e:
+        return JSONResponse({"message": str(e)}, status_code=400)
     except Exception as e:
         controller_logger.error(f"Error fetching qualified leads: {e}")
         return JSONResponse({"message": "Error fetching qualified leads"})
 
 
+@router.get("/prospects/search")
+async def search_prospects(
+    params: Annotated[ProspectSearchQuery, Query()],
+    db: AsyncSession = Depends(inject_async_session),
+):
+    """Ranked full-text search over prospect name, business context and about (all prospects)."""
+    try:
+        page = await AsyncDatabaseManager(db).search_prospects(
+            params.q, params.limit, params.cursor, **params.filters()
+        )
+        return JSONResponse({
+            "prospects": serialize_rows(page["items"], SEARCH_RESULT_COLUMNS),
+            "next_cursor": page["next_cursor"],
+        })
+    except ValueError as e:
+        return JSONResponse({"message": str(e)}, status_code=400)
+    except Exception as e:
+        controller_logger.error(f"Error searching prospects: {e}")
+        return JSONResponse({"message": "Error searching prospects"}, status_code=500)
+
+
+@router.get("/prospects/{prospect_id}")
+async def fetch_prospect(prospect_id: str, db: AsyncSession = Depends(inject_async_session)):
+    """Detail view of a prospect (full about text and call summary)."""
+    try:
+        prospect = await AsyncDatabaseManager(db).get_prospect_detail(prospect_id)
+        if prospect is None:
+            return JSONResponse({"message": "Prospect not found"}, status_code=404)
+        return JSONResponse({"prospect": prospect})
+    except Exception as e:
+        controller_logger.error(f"Error fetching prospect: {e}")
+        return JSONResponse({"message": "Error fetching prospect"}, status_code=500)
+
+
 @router.delete("/prospects/{prospect_id}")
-def delete_prospect(prospect_id: str, db: Session = Depends(inject_session)):
+async def delete_prospect(prospect_id: str, db: AsyncSession = Depends(inject_async_session)):
     try:
-        deleted = DatabaseManager(db).delete_prospect(prospect_id)
+        deleted = await AsyncDatabaseManager(db).delete_prospect(prospect_id)
         if deleted:
             return JSONResponse({"message": "Prospect deleted"})
         return JSONResponse({"message": "Prospect not found"}, status_code=404)
@@ -49,73 +149,142 @@ def delete_prospect(prospect_id: str, db: Session = Depends(inject_session)):
 
 
 @router.get("/leads")
-def fetch_qualified_leads(db: Session = Depends(inject_session)):
+async def fetch_qualified_leads(
+    params: Annotated[ProspectListQuery, Query()],
+    db: AsyncSession = Depends(inject_async_session),
+):
     try:
-        leads = retrieve_qualified_leads(DatabaseManager(db))
-        return JSONResponse({"leads": [p.to_dict() for p in leads]})
+        page = await retrieve_qualified_leads_async(AsyncDatabaseManager(db), params.limit, params.cursor, **params.filters())
+        return JSONResponse({
+            "leads": serialize_rows(page["items"]),
+            "next_cursor": page["next_cursor"],
+        })
+    except ValueError as e:
+        return JSONResponse({"message": str(e)}, status_code=400)
     except Exception as e:
         controller_logger.error(f"Error fetching qualified leads: {e}")
         return JSONResponse({"message": "Error fetching qualified leads"})
 
 
 @router.get("/leads/called")
-def fetch_called_leads(db: Session = Depends(inject_session)):
-    """All prospects that have been called (for tracking and re-calling, including incomplete calls)."""
+async def fetch_called_leads(
+    params: Annotated[ProspectListQuery, Query()],
+    db: AsyncSession = Depends(inject_async_session),
+):
+    """Prospects that have been called (for tracking and re-calling, including incomplete calls), newest first."""
     try:
-        prospects = DatabaseManager(db).get_called_prospects()
-        return JSONResponse({"leads": [p.to_dict() for p in prospects]})
+        page = await AsyncDatabaseManager(db).list_called_prospects(params.limit, params.cursor, **params.filters())
+        return JSONResponse({
+            "leads": serialize_rows(page["items"]),
+            "next_cursor": page["next_cursor"],
+        })
+    except ValueError as e:
+        return JSONResponse({"message": str(e)}, status_code=400)
     except Exception as e:
         controller_logger.error(f"Error fetching called leads: {e}")
         return JSONResponse({"message": "Error fetching called leads"}, status_code=500)
 
 
 @router.post("/webhook/retell_feedback")
-async def retell_cold_call_feedback(request: Request, background_tasks: BackgroundTasks, db: Session = Depends(inject_session)):
+async def retell_cold_call_feedback(request: Request, db: AsyncSession = Depends(inject_async_session)):
+    """
+    Store call_analyzed events in the webhook inbox (idempotent per call id) and
+    ack; the inbox consumer applies them to prospects in batches. A 500 makes
+    Retell retry, so an event is only acknowledged once it is stored.
+    """
     try:
         payload = await request.json()
-        controller_logger.info(f"Received feedback from cold call :: {payload.get('event')}")
-        if payload.get("event") == "call_analyzed":
-            prospect_id = payload.get("call", {}).get("metadata", {}).get("prospect_id")
+        event = payload.get("event")
+        controller_logger.info(f"Received feedback from cold call :: {event}")
+        if event == "call_analyzed":
+            call = payload.get("call") or {}
+            prospect_id = (call.get("metadata") or {}).get("prospect_id")
             if not prospect_id:
                 controller_logger.info("No prospect_id found in payload")
                 return JSONResponse({"message": "No prospect_id found in call metadata"})
+            call_id = call.get("call_id")
+            if not call_id:
+                return JSONResponse({"message": "No call_id found in payload"}, status_code=400)
 
-            call_summary = payload.get("call", {}).get("call_analysis", {}).get("call_summary", "")
-            call_recording_url = payload.get("call", {}).get("recording_url", "")
-            custom_analysis_data = payload.get("call", {}).get("call_analysis", {}).get("custom_analysis_data", {})
-            background_tasks.add_task(update_leads_with_feedback,
-            DatabaseManager(db),
-            {
-                "prospect_id": prospect_id,
-                "call_summary": call_summary,
-                "call_recording_url": call_recording_url,
-                "is_qualified_lead": custom_analysis_data.get("qualified_lead", False),
-                "is_relevant_industry": custom_analysis_data.get("relevant_industry", False),
-            })
+            stored = await ingest_call_event(AsyncDatabaseManager(db), call_id, event, prospect_id, call)
+            if stored is None:
+                return JSONResponse({"message": "Error storing feedback from cold call"}, status_code=500)
         return JSONResponse({"message": "Feedback Received"})
     except Exception as e:
         controller_logger.error(f"Error processing feedback from cold call: {e}")
-        return JSONResponse({"message": "Error processing feedback from cold call"})
+        return JSONResponse({"message": "Error processing feedback from cold call"}, status_code=500)
 
 
 @router.post("/call")
 def make_call(request: CallRequest, background_tasks: BackgroundTasks, db: Session = Depends(inject_session)):
     try:
-        background_tasks.add_task(call_prospect, DatabaseManager(db), request.prospect_id)
+        prospect = claim_prospect_for_call(DatabaseManager(db), request.prospect_id)
+        if prospect is None:
+            return JSONResponse(
+                {"message": "Prospect not found or already being dialed"}, status_code=409
+            )
+        background_tasks.add_task(call_prospect, prospect)
         return JSONResponse({"message": "Call triggered successfully"})
     except Exception as e:
         controller_logger.error(f"Error making call: {e}")
         return JSONResponse({"message": "Error making call"})
 
+@router.post("/calls/bulk")
+def make_bulk_call(request: BulkCallRequest, background_tasks: BackgroundTasks, db: Session = Depends(inject_session)):
+    """
+    Dial many prospects in one request: they are leased in one statement and
+    dialed by the bounded dialer in the background. Poll /calls/bulk/{batch_id}.
+    """
+    try:
+        batch = start_bulk_call(DatabaseManager(db), request.prospect_ids)
+        prospects = batch.pop("prospects")
+        if prospects:
+            background_tasks.add_task(run_bulk_call, batch["batch_id"], prospects)
+        return JSONResponse({"message": "Bulk call triggered", **batch})
+    except Exception as e:
+        controller_logger.error(f"Error starting bulk call: {e}")
+        return JSONResponse({"message": "Error starting bulk call"}, status_code=500)
+
+
+@router.get("/calls/bulk/{batch_id}")
+def fetch_bulk_call(batch_id: str, db: Session = Depends(inject_session)):
+    """Progress of a bulk call: total, dialed, initiated, failed and status (running/finished)."""
+    batch = retrieve_bulk_call(DatabaseManager(db), batch_id)
+    if batch is None:
+        return JSONResponse({"message": "Bulk call not found"}, status_code=404)
+    return JSONResponse(batch)
+
+
 @router.post("/cold_call/campaign")
-def start_cold_call_campaign(
-    request: ColdCallCampaignRequest,
-    background_tasks: BackgroundTasks,
-):
+def start_cold_call_campaign(request: ColdCallCampaignRequest, db: Session = Depends(inject_session)):
+    """
+    Queue a campaign job: a worker queues callable prospects in the call queue
+    and dials those whose business-hours window is open. Poll /jobs/{job_id}.
+    """
     try:
-        background_tasks.add_task(run_cold_call_campaign, request.limit)
-        return JSONResponse({"message": "Cold call campaign started successfully"})
+        job_id = queue_cold_call_campaign(DatabaseManager(db), request.limit)
+        if job_id is None:
+            return JSONResponse({"message": "Error starting cold call campaign"}, status_code=500)
+        return JSONResponse({"message": "Cold call campaign queued", "job_id": job_id})
     except Exception as e:
         controller_logger.error(f"Error starting cold call campaign: {e}")
         return JSONResponse({"message": "Error starting cold call campaign"})
 
+
+@router.get("/cold_call/queue")
+def fetch_call_queue(db: Session = Depends(inject_session)):
+    """Call queue entries per status and the next window to open."""
+    summary = retrieve_call_queue_summary(DatabaseManager(db))
+    if summary is None:
+        return JSONResponse({"message": "Error fetching call queue"}, status_code=500)
+    return JSONResponse(summary)
+
+
+@router.get("/cold_call/campaigns")
+def fetch_campaign_metrics(db: Session = Depends(inject_session)):
+    """Dialed/initiated/failed counts, error breakdown and call latency for recent campaigns."""
+    metrics = retrieve_campaign_metrics(DatabaseManager(db))
+    if metrics is None:
+        return JSONResponse({"message": "Error fetching campaign metrics"}, status_code=500)
+    return JSONResponse(metrics)
+
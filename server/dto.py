@@ -1,5 +1,7 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from internal.utils.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 
 class PipelineRequest(BaseModel):
@@ -10,6 +12,33 @@ class CallRequest(BaseModel):
     prospect_id: str
 
 
+# Prospects one bulk call request may dial
+MAX_BULK_CALL_PROSPECTS = 500
+
+
+class BulkCallRequest(BaseModel):
+    prospect_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_CALL_PROSPECTS)
+
+
 class ColdCallCampaignRequest(BaseModel):
-    """Optional limit (max 10). Omit = use default of 10."""
-    limit: Optional[int] = None
\ No newline at end of file
+    """Optional limit. Omit = all callable prospects, up to CAMPAIGN_MAX_CALLS."""
+    limit: Optional[int] = Field(None, ge=1)
+
+class ProspectListQuery(BaseModel):
+    """Keyset pagination and filters for prospect/lead lists."""
+    limit: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+    country: Optional[str] = None
+    business_context: Optional[str] = None
+    has_email: Optional[bool] = None
+
+    def filters(self) -> dict:
+        return {
+            "country": self.country,
+            "business_context": self.business_context,
+            "has_email": self.has_email,
+        }
+
+
+class ProspectSearchQuery(ProspectListQuery):
+    q: str = Field(..., min_length=1, max_length=200)
@@ -0,0 +1,64 @@
+"""
+Background job worker: runs queued pipeline and cold call campaign jobs. A
+worker that takes campaign jobs also runs the call scheduler, which dials
+queued calls as their windows open.
+
+Usage:
+    python worker.py                          # all job kinds
+    python worker.py leads_pipeline           # only the given kinds
+"""
+
+import signal
+import sys
+import threading
+
+from internal.config.secret import validate_environment, SecretManager
+
+from internal.utils.database import init_db
+from internal.domain.jobs.worker import JobWorker
+from internal.domain.service import CAMPAIGN_JOB, JOB_HANDLERS, JOB_CONCURRENCY_LIMITS, run_call_scheduler
+
+
+validate_environment(
+    ["SERPER_API_KEY", "GOOGLE_API_KEY", "OPENAI_KEY"]
+)
+
+
+def main(kinds=None) -> int:
+    unknown = set(kinds or []) - set(JOB_HANDLERS)
+    if unknown:
+        print(f"Unknown job kinds: {', '.join(sorted(unknown))} (known: {', '.join(JOB_HANDLERS)})")
+        return 2
+
+    init_db(drop_existing=False)
+    worker = JobWorker(
+        {kind: handler for kind, handler in JOB_HANDLERS.items() if not kinds or kind in kinds},
+        poll_interval=SecretManager.JOB_POLL_SECONDS,
+        lease_seconds=SecretManager.JOB_LEASE_SECONDS,
+        retry_delay_seconds=SecretManager.JOB_RETRY_DELAY_SECONDS,
+        concurrency_limits=JOB_CONCURRENCY_LIMITS,
+    )
+    stopping = threading.Event()
+    scheduler = None
+    if CAMPAIGN_JOB in worker.handlers:
+        scheduler = threading.Thread(target=run_call_scheduler, args=(stopping,), name="call-scheduler")
+        scheduler.start()
+
+    def stop(*_):
+        worker.stop()
+        stopping.set()
+
+    # Finish the current job, then exit (deploys send SIGTERM)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        worker.run()
+    finally:
+        stopping.set()
+        if scheduler is not None:
+            scheduler.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))